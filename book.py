@@ -0,0 +1,274 @@
+"""Build and read an opening book: the best first attack of a game (the
+attack of the first attacker after a deal) by attacker's hand.
+
+Positions are canonical: suits are relative to a trump suit (the trump
+suit first, other suits ordered by their ranks in a hand), thus hands,
+which differ only by a trump suit or by names of other suits, share an
+entry. A book is built offline from random deals: attacks of a position
+are compared by random playouts in the engine (see engine.State) with
+hidden cards dealt randomly consistently with what the first attacker
+knows (opponents have no lower trumps than the attacker).
+
+A book is a binary file: a header with rules of a game and records of
+positions sorted by keys (a key and a best attack). Lookup is a binary
+search in a memory-mapped file, thus a book is not loaded into memory.
+
+Usage example:
+    python book.py book.bin --players 2 --deals 10000 --simulations 200
+"""
+
+
+from __future__ import annotations
+import argparse
+import contextlib
+import mmap
+import os
+import random
+import struct
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+
+from card import Card
+from engine import OVER, State
+from game import FoolCardGame
+from hand import mask_of
+from mixins import CardGameMixin
+from player import Player
+
+
+_SUITS = CardGameMixin.SUITS
+_RANKS_NUM = len(CardGameMixin.RANKS)
+_RANKS_MASK = (1 << _RANKS_NUM) - 1
+_DECK_SIZE = len(_SUITS) * _RANKS_NUM
+
+# magic, version, deck size, players, cards to have, max attacks, transfer,
+# number of records
+_HEADER = struct.Struct('<8sBBBBBBI')
+_MAGIC = b'FOOLBOOK'
+_VERSION = 1
+# a canonical position and a canonical attack card
+_RECORD = struct.Struct('<QB')
+
+
+def canonical(hand: int, trump: str) -> tuple[int, tuple[str, ...]]:
+    """A key of a hand (a bitset of codes) and suits in a canonical order:
+    the key is ranks of suits (bitsets) in this order, 9 bits per suit."""
+    ranks = {suit: hand >> (i * _RANKS_NUM) & _RANKS_MASK for i, suit in enumerate(_SUITS)}
+    others = sorted((suit for suit in _SUITS if suit != trump), key=ranks.get, reverse=True)
+    suits = (trump, *others)
+
+    key = 0
+    for i, suit in enumerate(suits):
+        key |= ranks[suit] << (i * _RANKS_NUM)
+    return key, suits
+
+
+def _to_canonical(code: int, suits: tuple[str, ...]) -> int:
+    return suits.index(_SUITS[code // _RANKS_NUM]) * _RANKS_NUM + code % _RANKS_NUM
+
+
+def _from_canonical(move: int, suits: tuple[str, ...]) -> int:
+    return _SUITS.index(suits[move // _RANKS_NUM]) * _RANKS_NUM + move % _RANKS_NUM
+
+
+class OpeningBook:
+    """A memory-mapped book of first attacks (see write for a format)"""
+
+    __slots__ = ('path', 'players', 'cards_to_have', 'max_attacks', 'transfer', '_file', '_map',
+                 '_count')
+
+    def __init__(self, path: str | Path) -> None:
+        self.path = Path(path)
+        self._file = open(self.path, 'rb')
+        # an empty file cannot be memory-mapped
+        if os.fstat(self._file.fileno()).st_size < _HEADER.size:
+            self._file.close()
+            raise ValueError(f'{self.path} is not an opening book!')
+        self._map = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+
+        (magic, version, deck_size, self.players, self.cards_to_have, self.max_attacks,
+         transfer, self._count) = _HEADER.unpack_from(self._map)
+        if magic != _MAGIC or version != _VERSION:
+            self.close()
+            raise ValueError(f'{self.path} is not an opening book!')
+        if len(self._map) < _HEADER.size + self._count * _RECORD.size:
+            self.close()
+            raise ValueError(f'{self.path} is truncated!')
+        if deck_size != _DECK_SIZE:
+            self.close()
+            raise ValueError(f'The book is built for a deck of {deck_size} cards!')
+        self.transfer = bool(transfer)
+
+    @staticmethod
+    def write(path: str | Path, moves: dict[int, int], players: int, cards_to_have: int = 6,
+              max_attacks: int = 6, transfer: bool = False) -> None:
+        """Write a book of canonical attacks by canonical positions (see
+        canonical) for rules of a game"""
+        with open(path, 'wb') as file:
+            file.write(_HEADER.pack(_MAGIC, _VERSION, _DECK_SIZE, players, cards_to_have,
+                                    max_attacks, transfer, len(moves)))
+            for key in sorted(moves):
+                file.write(_RECORD.pack(key, moves[key]))
+
+    def __len__(self) -> int:
+        return self._count
+
+    def _find(self, key: int) -> int | None:
+        """A canonical attack of a position (a binary search by a key)"""
+        low, high = 0, self._count
+        while low < high:
+            middle = (low + high) // 2
+            record_key, move = _RECORD.unpack_from(self._map, _HEADER.size
+                                                   + middle * _RECORD.size)
+            if record_key == key:
+                return move
+            if record_key < key:
+                low = middle + 1
+            else:
+                high = middle
+        return None
+
+    def lookup(self, hand: int, trump: str) -> int | None:
+        """A code of the best first attack card of a hand, None if a hand is
+        not in a book"""
+        key, suits = canonical(hand, trump)
+        move = self._find(key)
+        return None if move is None else _from_canonical(move, suits)
+
+    def attack(self, game: FoolCardGame, player: Player) -> Card | None:
+        """The best first attack of a player in a game, None if it is not the
+        first attack of a game, rules differ or a hand is not in a book"""
+        if (game.round != 1 or game.table or game.players[0] is not player
+                or len(player) != game.CARDS_TO_HAVE
+                or (len(game.players), game.CARDS_TO_HAVE, game.MAX_ATTACKS, game.TRANSFER)
+                != (self.players, self.cards_to_have, self.max_attacks, self.transfer)):
+            return None
+        code = self.lookup(player.hand.mask, game.TRUMP)
+        if code is None:
+            return None
+        card, = player.hand.of_mask(1 << code)
+        return card
+
+    def close(self) -> None:
+        self._map.close()
+        self._file.close()
+
+    def __enter__(self) -> OpeningBook:
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+
+def _sample(hand: int, trump: str, opponents: int, cards_to_have: int,
+            rng: random.Random) -> tuple[list[int], bytes]:
+    """Random hands of opponents and a deck, which the first attacker does
+    not see: opponents have no trumps lower than attacker's lowest trump"""
+    trump_index = _SUITS.index(trump)
+    trumps = hand >> (trump_index * _RANKS_NUM) & _RANKS_MASK
+    lowest = (trumps & -trumps).bit_length() - 1 if trumps else _RANKS_NUM
+    lower = {trump_index * _RANKS_NUM + rank for rank in range(lowest)}
+
+    unseen = [code for code in range(_DECK_SIZE) if not hand >> code & 1]
+    allowed = [code for code in unseen if code not in lower]
+    if len(allowed) < opponents * cards_to_have:
+        allowed = unseen
+    dealt = rng.sample(allowed, opponents * cards_to_have)
+
+    hands = [hand]
+    for i in range(opponents):
+        hands.append(mask_of(dealt[i * cards_to_have:(i + 1) * cards_to_have]))
+
+    dealt = set(dealt)
+    deck = [code for code in unseen if code not in dealt]
+    rng.shuffle(deck)
+    return hands, bytes(deck)
+
+
+def evaluate_deal(seed: int, players: int, simulations: int, cards_to_have: int = 6,
+                  max_attacks: int = 6, transfer: bool = False) -> tuple[int, dict[int, list[int]]]:
+    """Play random playouts of every first attack of a random deal: a key of
+    a position and losses and playouts by canonical attacks"""
+    with open(os.devnull, 'w') as devnull, contextlib.redirect_stdout(devnull):
+        game = FoolCardGame(cards_to_have, max_attacks,
+                            players=[Player(f'player_{seat}') for seat in range(players)],
+                            seed=seed, transfer=transfer)
+    hand, trump = game.players[0].hand.mask, game.TRUMP
+    key, suits = canonical(hand, trump)
+
+    rng = random.Random(seed)
+    stats = {}
+    # any card can be the first attack
+    moves = [code for code in range(_DECK_SIZE) if hand >> code & 1]
+    for _ in range(simulations):
+        hands, deck = _sample(hand, trump, players - 1, cards_to_have, rng)
+        state = State(hands, deck, trump, cards_to_have, max_attacks, transfer=transfer)
+        for move in moves:
+            state.apply(move)
+            depth = 1
+            while state.phase != OVER:
+                state.apply(rng.choice(state.legal_moves()))
+                depth += 1
+            move_stats = stats.setdefault(_to_canonical(move, suits), [0, 0])
+            move_stats[0] += state.fool == 0
+            move_stats[1] += 1
+            for _ in range(depth):
+                state.undo()
+    return key, stats
+
+
+def build(path: str | Path, deals: int, players: int = 2, simulations: int = 100,
+          seed: int | None = None, workers: int | None = None, cards_to_have: int = 6,
+          max_attacks: int = 6, transfer: bool = False) -> int:
+    """Build a book from random deals and return a number of positions.
+    Playouts of positions, which occur in several deals, are summed up.
+
+    :param simulations: number of random deals of hidden cards for a deal,
+    every attack is played out once on every one of them.
+    :param workers: number of processes to evaluate deals in parallel.
+    """
+    rng = random.Random(seed)
+    seeds = [rng.getrandbits(32) for _ in range(deals)]
+    args = (seeds, [players] * deals, [simulations] * deals, [cards_to_have] * deals,
+            [max_attacks] * deals, [transfer] * deals)
+
+    positions: dict[int, dict[int, list[int]]] = {}
+    with contextlib.ExitStack() as stack:
+        if workers == 1:
+            results = map(evaluate_deal, *args)
+        else:
+            executor = stack.enter_context(ProcessPoolExecutor(workers))
+            results = executor.map(evaluate_deal, *args, chunksize=16)
+
+        for key, stats in results:
+            position = positions.setdefault(key, {})
+            for move, (losses, playouts) in stats.items():
+                total = position.setdefault(move, [0, 0])
+                total[0] += losses
+                total[1] += playouts
+
+    # the lowest fool rate
+    moves = {key: min(stats, key=lambda move: stats[move][0] / stats[move][1])
+             for key, stats in positions.items()}
+    OpeningBook.write(path, moves, players, cards_to_have, max_attacks, transfer)
+    return len(moves)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description='Build an opening book of first attacks.')
+    parser.add_argument('path', help='a file to write a book to')
+    parser.add_argument('--players', type=int, default=2)
+    parser.add_argument('--deals', type=int, default=1000)
+    parser.add_argument('--simulations', type=int, default=100)
+    parser.add_argument('--seed', type=int, default=None)
+    parser.add_argument('--workers', type=int, default=None)
+    parser.add_argument('--transfer', action='store_true', help='the transfer variant')
+    args = parser.parse_args()
+
+    positions = build(args.path, args.deals, args.players, args.simulations, args.seed,
+                      args.workers, transfer=args.transfer)
+    print(f'{positions} positions from {args.deals} deals are written to {args.path}.')
+
+
+if __name__ == '__main__':
+    main()
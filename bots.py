@@ -0,0 +1,180 @@
+"""Define non-interactive players (bots), which can be seated at a game
+instead of human players."""
+
+
+from __future__ import annotations
+import functools
+import itertools as it
+import random
+from typing import Callable, Iterable
+
+from card import Card
+from drawable import Table
+from hand import Hand
+from player import Player
+from search import SearchBot
+
+
+class RandomBot(Player):
+    """A bot, which chooses uniformly among all legal options (PASS included)."""
+
+    __slots__ = ('_rng',)
+
+    def __init__(self, name: str, seed: int | None = None) -> None:
+        super().__init__(name)
+        self._rng = random.Random(seed)
+
+    def attack(self, table: Table, defender: Player) -> Card | None:
+        # only the first attack in a round cannot be a 'PASS'
+        options = self.hand.of_ranks(table.card_ranks) if table else list(self.hand)
+        if table or not options:
+            options.append(None)
+
+        attack_card = self._rng.choice(options)
+        if attack_card is not None:
+            self.hand.remove(attack_card)
+        return attack_card
+
+    def defend(self, attack_card: Card) -> Card | None:
+        options = self.hand.beating(attack_card)
+        options.append(None)
+
+        defend_card = self._rng.choice(options)
+        if defend_card is not None:
+            self.hand.remove(defend_card)
+        return defend_card
+
+    def transfer(self, attack_card: Card, defender: Player) -> Card | None:
+        options = self.hand.of_ranks((attack_card.rank,))
+        options.append(None)
+
+        transfer_card = self._rng.choice(options)
+        if transfer_card is not None:
+            self.hand.remove(transfer_card)
+        return transfer_card
+
+    def throw_cards(self, table: Table, max_cards_num: int) -> list[Card]:
+        options = self.hand.of_ranks(table.card_ranks)
+        cards_num = self._rng.randint(0, min(max_cards_num, len(options)))
+
+        cards = self._rng.sample(options, cards_num)
+        for card in cards:
+            self.hand.remove(card)
+        return cards
+
+
+class HeuristicBot(Player):
+    """A cheap deterministic bot: it attacks with the lowest non-trump card,
+    defends with the lowest beating card (transfers an attack with the lowest
+    non-trump card, if possible) and throws matching cards according to a
+    throw policy. Decisions are answered with masks of codes in a hand
+    (see Hand), without building lists of options."""
+
+    # possible values of parameters (e.g. for a grid search)
+    PARAMS = {
+        'throw_policy': ('all', 'non_trump', 'none'),
+        'attack_trumps': (False, True),
+        'defend_trumps': (True, False),
+        'max_attack_rank': Card.RANKS,
+    }
+
+    __slots__ = ('throw_policy', 'attack_trumps', 'defend_trumps', 'max_attack_rank')
+
+    # cards allowed to continue an attack by max_attack_rank
+    _ATTACK_MASKS = {rank: Hand.ranks_mask(Card.RANKS[:i + 1]) for i, rank in enumerate(Card.RANKS)}
+
+    def __init__(self, name: str, throw_policy: str = 'non_trump', attack_trumps: bool = False,
+                 defend_trumps: bool = True, max_attack_rank: str = 'A') -> None:
+        """
+        :param throw_policy: which cards to throw to a defender who lost a round:
+        'all' - all cards of ranks on a table, 'non_trump' - only non-trump
+        cards, 'none' - do not throw cards.
+        :param attack_trumps: continue an attack with trump cards (the first
+        attack in a round is made with a trump card only if there is no other).
+        :param defend_trumps: beat non-trump cards with trump cards.
+        :param max_attack_rank: do not continue an attack with cards of higher
+        ranks (the first attack in a round is not limited).
+        """
+        super().__init__(name)
+        self.throw_policy = Card._validate_input(throw_policy, self.PARAMS['throw_policy'])
+        self.attack_trumps = attack_trumps
+        self.defend_trumps = defend_trumps
+        self.max_attack_rank = Card._validate_input(max_attack_rank, self.PARAMS['max_attack_rank'])
+
+    def attack(self, table: Table, defender: Player) -> Card | None:
+        hand = self.hand
+        # the first attack in a round (cannot 'PASS')
+        if not table:
+            attack_card = hand.lowest() or hand.lowest(trumps=True)
+        else:
+            mask = self._ATTACK_MASKS[self.max_attack_rank] & table.ranks_mask
+            attack_card = hand.lowest(mask=mask)
+            if attack_card is None and self.attack_trumps:
+                attack_card = hand.lowest(trumps=True, mask=mask)
+
+        if attack_card is not None:
+            hand.remove(attack_card)
+        return attack_card
+
+    def defend(self, attack_card: Card) -> Card | None:
+        defend_card = self.hand.lowest_beating(attack_card)
+        if defend_card is not None:
+            if defend_card.trump and not attack_card.trump and not self.defend_trumps:
+                return None
+            self.hand.remove(defend_card)
+        return defend_card
+
+    def transfer(self, attack_card: Card, defender: Player) -> Card | None:
+        # transfer with a non-trump card (trump cards are kept to defend)
+        transfer_card = self.hand.lowest(mask=Hand.RANK_MASKS[attack_card.rank])
+        if transfer_card is not None:
+            self.hand.remove(transfer_card)
+        return transfer_card
+
+    def throw_cards(self, table: Table, max_cards_num: int) -> list[Card]:
+        if self.throw_policy == 'none':
+            return []
+
+        hand = self.hand
+        mask = table.ranks_mask
+        cards = []
+        # the lowest cards go first
+        while len(cards) < max_cards_num:
+            card = hand.lowest(trumps=self.throw_policy == 'all', mask=mask)
+            if card is None:
+                break
+            hand.remove(card)
+            cards.append(card)
+        return cards
+
+    @classmethod
+    def grid(cls, **values) -> dict[str, functools.partial]:
+        """Factories of bots for all combinations of parameters' values by
+        their names, e.g. grid(throw_policy=('all', 'none'), attack_trumps=(True,)).
+        Default values are used for unspecified parameters."""
+        names = list(values)
+        return {
+            f'heuristic[{",".join(f"{k}={v}" for k, v in zip(names, combination))}]':
+                functools.partial(cls, **dict(zip(names, combination)))
+            for combination in it.product(*values.values())
+        }
+
+
+# policies available by name (e.g. for tournaments)
+POLICIES = {
+    'random': RandomBot,
+    'heuristic': HeuristicBot,
+    'search': SearchBot,
+}
+
+
+def parse_policies(specs: Iterable[str]) -> dict[str, Callable[[str], Player]]:
+    """Policies by names from '[ALIAS=]POLICY' specs of a command line, an
+    alias allows a policy to play against itself"""
+    policies = {}
+    for spec in specs:
+        alias, _, name = spec.rpartition('=')
+        if name not in POLICIES:
+            raise ValueError(f'unknown policy {name}')
+        policies[alias or name] = POLICIES[name]
+    return policies
@@ -1,4 +1,5 @@
 from __future__ import annotations
+import itertools as it
 from typing import TypeVar
 
 from mixins import CardGameMixin
@@ -6,10 +7,26 @@ from mixins import CardGameMixin
 
 # TODO: maybe it's better to set trump to None initially?
 class Card(CardGameMixin):
+    # codes of cards in 'RS' format (R - rank and S - suit): cards are ordered
+    # by suits, then by ranks, '6S' -> 0, '7S' -> 1, ..., 'AH' -> 35
+    CODES = {f'{rank}{suit[0]}': code
+             for code, (suit, rank) in enumerate(it.product(CardGameMixin.SUITS, CardGameMixin.RANKS))}
+    # offsets of codes of suits and ranks
+    SUIT_CODES = {suit: i * len(CardGameMixin.RANKS) for i, suit in enumerate(CardGameMixin.SUITS)}
+    RANK_CODES = {rank: i for i, rank in enumerate(CardGameMixin.RANKS)}
+    # precomputed Card objects in 'RS' format by trump suit
+    _LOOKUPS: dict[str, dict[str, Card]] = {}
+    # precomputed Card objects ordered by codes by trump suit
+    _DECKS: dict[str, tuple[Card, ...]] = {}
+
+    __slots__ = ('rank', 'suit', 'trump', 'code')
+
     def __init__(self, rank: str, suit: str, trump: bool) -> None:
         self.rank = self._validate_input(rank, self.RANKS)
         self.suit = self._validate_input(suit, self.SUITS)
         self.trump = trump
+        # see CODES
+        self.code = self.SUIT_CODES[suit] + self.RANK_CODES[rank]
 
     T = TypeVar('T')
 
@@ -20,14 +37,47 @@ class Card(CardGameMixin):
             return input_
         raise ValueError(f'{input_} not in {possible_values}')
 
+    @classmethod
+    def lookup(cls, trump: str) -> dict[str, Card]:
+        """Get Card objects of an entire deck by their string representations
+        for a specified trump suit. Cards are created once per trump suit."""
+        trump = trump.capitalize()
+        try:
+            return cls._LOOKUPS[trump]
+        except KeyError:
+            cls._LOOKUPS[trump] = {f'{rank}{suit[0]}': cls(rank, suit, suit == trump)
+                                   for suit, rank in it.product(cls.SUITS, cls.RANKS)}
+            return cls._LOOKUPS[trump]
+
+    @classmethod
+    def deck(cls, trump: str) -> tuple[Card, ...]:
+        """Get Card objects of an entire deck ordered by their codes for
+        a specified trump suit. Cards are created once per trump suit."""
+        trump = trump.capitalize()
+        try:
+            return cls._DECKS[trump]
+        except KeyError:
+            cls._DECKS[trump] = tuple(cls.lookup(trump).values())
+            return cls._DECKS[trump]
+
     @classmethod
     def convert(cls, card: str, trump: str) -> Card:
         """Convert string representation of a card into Card object.
         '10C' -> Card('10', 'Clubs'), 'AS' -> Card('A', 'Spades')."""
-        rank = card[:-1]
-        # TODO: optimize
-        suit,  = [suit for suit in cls.SUITS if card[-1] == suit[0]]
-        return cls(rank, suit, trump.capitalize() == suit)
+        try:
+            return cls.lookup(trump)[card]
+        except KeyError:
+            raise ValueError(f'{card} is not a card') from None
+
+    @classmethod
+    def convert_many(cls, cards: str, trump: str) -> list[Card]:
+        """Convert space-separated string representations of cards into Card
+        objects. '10C AS' -> [Card('10', 'Clubs'), Card('A', 'Spades')]."""
+        lookup = cls.lookup(trump)
+        try:
+            return [lookup[card] for card in cards.split()]
+        except KeyError as e:
+            raise ValueError(f'{e.args[0]} is not a card') from None
 
     def __repr__(self) -> str:
         return f'{self.__class__.__name__}{self.rank, self.suit, self.trump}'
@@ -47,10 +97,12 @@ class Card(CardGameMixin):
     # TODO: annotation str should be changed for something else
     def __eq__(self, card: Card | str) -> bool:
         """Check if the card is identical to another (specified) one"""
+        if isinstance(card, str):
+            return self.CODES.get(card) == self.code
         try:
             return self.rank == card.rank and self.suit == card.suit
         except AttributeError:
-            return f'{self.rank}{self.suit[0]}' == card
+            return NotImplemented
 
     def __hash__(self):
         return hash((self.rank, self.suit, self.trump))
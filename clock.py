@@ -0,0 +1,77 @@
+"""Define chess-like clocks of players and reading of player's input with
+a time limit."""
+
+
+from __future__ import annotations
+import queue
+import threading
+import time
+
+
+class Clock:
+    """Time left for all moves of a player in a game (in seconds), an
+    increment is added after each move. The clock runs only while a player
+    is thinking (between start and stop)."""
+
+    __slots__ = ('remaining', 'increment', '_started')
+
+    def __init__(self, limit: float, increment: float = 0.0) -> None:
+        if limit < 0 or increment < 0:
+            raise ValueError('Time limit and increment must not be negative!')
+        self.remaining = float(limit)
+        self.increment = float(increment)
+        self._started: float | None = None
+
+    def start(self) -> None:
+        self._started = time.monotonic()
+
+    def stop(self) -> float:
+        """Stop the clock after a move and return time spent on it"""
+        if self._started is None:
+            return 0.0
+        elapsed = time.monotonic() - self._started
+        self._started = None
+        self.remaining = max(self.remaining - elapsed, 0.0) + self.increment
+        return elapsed
+
+    def left(self) -> float:
+        """Time left (taking a running move into account)"""
+        if self._started is None:
+            return self.remaining
+        return max(self.remaining - (time.monotonic() - self._started), 0.0)
+
+    @property
+    def expired(self) -> bool:
+        return self.left() <= 0
+
+    def __repr__(self) -> str:
+        return f'{self.__class__.__name__}({self.left():.1f}, {self.increment})'
+
+
+# lines entered by a player, a prompt, which timed out, keeps waiting for a
+# line in the background, the line goes to the next prompt
+_lines: queue.Queue[str] = queue.Queue()
+_reader: threading.Thread | None = None
+
+
+def read_line(prompt: str, timeout: float, read=input) -> str | None:
+    """Read a line of player's input, None if it was not entered in time"""
+    global _reader
+
+    if _reader is None or not _reader.is_alive():
+        def target() -> None:
+            try:
+                _lines.put(read(prompt))
+            except EOFError:
+                _lines.put('')
+
+        _reader = threading.Thread(target=target, daemon=True)
+        _reader.start()
+    else:
+        # the previous prompt is still waiting for input
+        print(prompt, end='', flush=True)
+
+    try:
+        return _lines.get(timeout=max(timeout, 0))
+    except queue.Empty:
+        return None
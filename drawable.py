@@ -1,7 +1,9 @@
-import itertools as it
+from __future__ import annotations
 import random
+from typing import Sequence
 
 from card import Card
+from hand import Hand, mask_of
 from mixins import CardGameMixin
 
 
@@ -9,9 +11,47 @@ from mixins import CardGameMixin
 
 
 class Deck(CardGameMixin):
-    def __init__(self, trump: str):
-        self.cards = [Card(v, s, s == trump)
-                      for s, v in it.product(self.SUITS, self.RANKS)]
+    """Cards of a deck are stored as a byte string of their codes (see
+    Card.CODES) and a position of the top card, Card objects are shared among
+    all decks with the same trump suit."""
+
+    __slots__ = ('trump', '_codes', '_top')
+
+    def __init__(self, trump: str, order: Sequence[str] | None = None):
+        """
+        :param trump: a trump suit.
+        :param order: cards from the top to the bottom of a deck in 'RS' format
+        (R - rank and S - suit). Cards are sorted by suits and ranks by default.
+        """
+        self.reset(trump, order)
+
+    def reset(self, trump: str, order: Sequence[str] | None = None) -> None:
+        """Put all cards back into a deck (see __init__)"""
+        self.trump = trump
+        self._top = 0
+        deck_size = len(self.SUITS) * len(self.RANKS)
+
+        if order is None:
+            self._codes = bytes(range(deck_size))
+        else:
+            try:
+                self._codes = bytes(Card.CODES[card] for card in order)
+            except KeyError as e:
+                raise ValueError(f'{e.args[0]} is not a card') from None
+            # no missing or duplicate cards
+            if len(set(self._codes)) != len(self._codes) or len(self._codes) != deck_size:
+                raise ValueError(f'{order} is not a complete deck')
+
+    @property
+    def cards(self) -> list[Card]:
+        """Cards of a deck from the top to the bottom"""
+        cards = Card.deck(self.trump)
+        return [cards[code] for code in self._codes[self._top:]]
+
+    @property
+    def codes(self) -> bytes:
+        """Codes of cards of a deck from the top to the bottom"""
+        return self._codes[self._top:]
 
     def __repr__(self):
         cls_name = self.__class__.__name__
@@ -23,19 +63,23 @@ class Deck(CardGameMixin):
         cards = ', '.join(str(card) for card in self.cards)
         return f'{cls_name}[{cards_in_deck}]: {cards}'
 
-    def shuffle(self):
-        """Shuffle deck in-place"""
-        random.shuffle(self.cards)
+    def shuffle(self, rng: random.Random | None = None):
+        """Shuffle deck in-place (with a specified random generator if any)"""
+        codes = bytearray(self._codes[self._top:])
+        (rng or random).shuffle(codes)
+        self._codes, self._top = bytes(codes), 0
 
     def __len__(self) -> int:
         """Show number of cards left in a deck"""
-        return len(self.cards)
+        return len(self._codes) - self._top
 
     def draw(self, n: int) -> list[Card]:
         """Remove and return 'n' cards from the top of a deck"""
         if n < 0:
             raise ValueError('Number of cards must be positive!')
-        taken, self.cards = self.cards[:n], self.cards[n:]
+        cards = Card.deck(self.trump)
+        taken = [cards[code] for code in self._codes[self._top:self._top + n]]
+        self._top = min(self._top + n, len(self._codes))
         return taken
 
     def __getitem__(self, item):
@@ -46,17 +90,65 @@ class Deck(CardGameMixin):
 
 
 class Table:
-    def __init__(self):
-        self.cards: list[Card] = []
-        self.card_ranks: set[str] = set()
-        self.trash: list[Card] = []
+    """Cards on a table are stored as a byte string of their codes (in order
+    they were put), beaten cards (trash) and ranks of cards on a table - as bitsets
+    of codes (see Hand)."""
+
+    __slots__ = ('trump_suit', '_codes', '_ranks_mask', '_trash')
+
+    def __init__(self, trump: str | None = None):
+        """
+        :param trump: a trump suit, if not specified, it is known as soon as
+        a trump card is put on a table.
+        """
+        self.trump_suit = trump
+        self._codes = b''
+        self._ranks_mask = 0
+        self._trash = 0
+
+    @property
+    def _cards(self) -> tuple[Card, ...]:
+        """Card objects of a deck by codes (consistent with table's trump suit)"""
+        return Card.deck(self.trump_suit or '')
+
+    @property
+    def cards(self) -> list[Card]:
+        """Cards on a table in order they were put"""
+        cards = self._cards
+        return [cards[code] for code in self._codes]
+
+    @property
+    def card_ranks(self) -> set[str]:
+        """Ranks of cards on a table"""
+        return {rank for rank, mask in Hand.RANK_MASKS.items() if mask & self._ranks_mask}
+
+    @property
+    def ranks_mask(self) -> int:
+        """A mask of codes of all cards of ranks on a table (see Hand.ranks_mask)"""
+        return self._ranks_mask
+
+    @property
+    def mask(self) -> int:
+        """A bitset of codes of cards on a table"""
+        return mask_of(self._codes)
+
+    @property
+    def trash(self) -> list[Card]:
+        """Beaten cards sorted by codes"""
+        cards = self._cards
+        return [cards[code] for code in range(self._trash.bit_length()) if self._trash >> code & 1]
+
+    @property
+    def trash_mask(self) -> int:
+        """A bitset of codes of beaten cards"""
+        return self._trash
 
     def __len__(self):
         """Return number of cards on a table"""
-        return len(self.cards)
+        return len(self._codes)
 
     def __bool__(self):
-        return bool(self.cards)
+        return bool(self._codes)
 
     def __repr__(self):
         """Display cards on a table"""
@@ -69,21 +161,30 @@ class Table:
 
     def add_card(self, card: Card) -> None:
         """Put a card on a table"""
-        self.cards.append(card)
-        self.card_ranks.add(card.rank)
+        self._codes += bytes((card.code,))
+        self._ranks_mask |= Hand.RANK_MASKS[card.rank]
+        if card.trump:
+            self.trump_suit = card.suit
+
+    def reset(self, trump: str | None = None) -> None:
+        """Remove all cards from a table and trash (see __init__)"""
+        self.trump_suit = trump
+        self._cleanup()
+        self._trash = 0
 
     def _cleanup(self):
         """Clear cards from a table"""
-        self.cards.clear()
-        self.card_ranks.clear()
+        self._codes = b''
+        self._ranks_mask = 0
 
     def clear(self):
         """Transfer all cards from table to trash (beaten cards)"""
-        self.trash += self.cards
+        for code in self._codes:
+            self._trash |= 1 << code
         self._cleanup()
 
     def draw(self, *args) -> list[Card]:
         """Take all cards from table"""
-        cards = self.cards.copy()
+        cards = self.cards
         self._cleanup()
         return cards
@@ -0,0 +1,258 @@
+"""Duplicate deals: compare policies on the same cards from every seat.
+
+A deal (a trump suit and an order of cards in a deck) is generated once and
+played for every permutation of policies among seats. Luck of a deal mostly
+cancels out in paired comparisons, thus far fewer games are needed to tell
+policies apart.
+
+Usage example:
+    python duplicate.py a=random b=random --deals 1000 --workers 4
+"""
+
+
+from __future__ import annotations
+import argparse
+import contextlib
+import inspect
+import itertools as it
+import math
+import os
+import random
+import statistics
+from concurrent.futures import ProcessPoolExecutor
+from typing import Callable, Sequence
+
+from bots import POLICIES, parse_policies
+from export import FORMATS, ColumnarWriter
+from game import FoolCardGame
+from mixins import CardGameMixin
+from player import Player
+from records import ActionRecorder, RecordWriter
+from stats import GameRecorder, StatsAggregator
+
+
+class Deal(CardGameMixin):
+    def __init__(self, trump: str, order: Sequence[str], seed: int = 0) -> None:
+        """
+        :param trump: a trump suit.
+        :param order: cards from the top to the bottom of a deck in 'RS' format.
+        :param seed: a seed for the rest random decisions of a game (the first
+        attacker, if nobody has trump cards).
+        """
+        self.trump = trump
+        self.order = tuple(order)
+        self.seed = seed
+
+    @classmethod
+    def random(cls, rng: random.Random | None = None) -> Deal:
+        """Generate a random deal"""
+        rng = rng or random.Random()
+        order = [f'{rank}{suit[0]}' for suit, rank in it.product(cls.SUITS, cls.RANKS)]
+        rng.shuffle(order)
+        return cls(rng.choice(cls.SUITS), order, rng.getrandbits(32))
+
+    def __repr__(self) -> str:
+        return f'{self.__class__.__name__}{self.trump, self.order, self.seed}'
+
+
+def _accepts_seed(factory: Callable[..., Player]) -> bool:
+    """If a factory of players takes a seed (e.g. RandomBot)"""
+    try:
+        return 'seed' in inspect.signature(factory).parameters
+    except (TypeError, ValueError):
+        return False
+
+
+def play_game(factories: list[Callable[[str], Player]], names: list[str],
+              seed: int | None = None, actions: bool = False, **options) -> dict:
+    """Play a single game between policies seated in the given order and
+    return its result (see also GameRecorder.summary). Game output is
+    suppressed.
+
+    Bots, which take a seed, get a seed derived from the game seed and their
+    seat, thus a game with the same seed is reproduced exactly.
+
+    :param actions: include actions of players: rows of a round, a seat,
+    an action type and a card code (see records.ActionRecorder).
+    :param options: other arguments of FoolCardGame (deck_order, seats, etc.).
+    """
+    seats = options.get('seats') or range(len(names))
+    # seeds of bots by seats (a separate stream from the one of a game)
+    rng = random.Random(f'bots/{seed}')
+    seat_seeds = [rng.getrandbits(32) for _ in names]
+
+    players = []
+    for index, (factory, name) in enumerate(zip(factories, names)):
+        if seed is not None and _accepts_seed(factory):
+            players.append(factory(f'{name}_{index}', seed=seat_seeds[seats.index(index)]))
+        else:
+            players.append(factory(f'{name}_{index}'))
+
+    recorder = GameRecorder()
+    observers = [recorder.update]
+    if actions:
+        action_recorder = ActionRecorder()
+        observers.append(action_recorder.update)
+
+    with open(os.devnull, 'w') as devnull, contextlib.redirect_stdout(devnull):
+        game = FoolCardGame(players=players, seed=seed, observers=observers, **options)
+        # the attack limit is only needed when rounds are played
+        recorder.MAX_ATTACKS = game.MAX_ATTACKS
+        game.play()
+
+    names = [names[seat] for seat in seats]
+    # names of players by seats
+    seated = [players[seat].name for seat in seats]
+    summary = recorder.summary()
+    fool_seat = None if game.fool is None else seated.index(game.fool.name)
+    first_attacker = summary['first_attacker']
+    first_attacker_seat = None if first_attacker is None else seated.index(first_attacker)
+    result = {
+        'seed': seed,
+        'trump': game.TRUMP,
+        'seats': names,
+        'fool': None if fool_seat is None else names[fool_seat],
+        'fool_seat': fool_seat,
+        'first_attacker_seat': first_attacker_seat,
+        'rounds': game.round,
+        'pickups': summary['pickups'],
+        'throw_phases': summary['throw_phases'],
+        'full_throws': summary['full_throws'],
+    }
+    if actions:
+        result['actions'] = action_recorder.actions(seated)
+    return result
+
+
+def play_deal(factories: list[Callable[[str], Player]], names: list[str],
+              deal: Deal, permutations: bool = True, actions: bool = False) -> list[dict]:
+    """Play a deal for every permutation (or every rotation) of policies
+    among seats (see play_game for actions)."""
+    n = len(names)
+    if permutations:
+        seatings = it.permutations(range(n))
+    else:
+        seatings = (tuple(range(shift, n)) + tuple(range(shift)) for shift in range(n))
+
+    return [play_game(factories, names, deal.seed, actions, trump=deal.trump,
+                      deck_order=deal.order, seats=seats)
+            for seats in seatings]
+
+
+def confidence_interval(samples: Sequence[float],
+                        confidence: float = 0.95) -> tuple[float, float, float]:
+    """Mean of samples and bounds of its (normal) confidence interval"""
+    mean = statistics.fmean(samples)
+    if len(samples) < 2:
+        return mean, -float('inf'), float('inf')
+
+    z = statistics.NormalDist().inv_cdf((1 + confidence) / 2)
+    margin = z * statistics.stdev(samples) / len(samples) ** 0.5
+    return mean, mean - margin, mean + margin
+
+
+def compare(policies: dict[str, Callable[[str], Player]], deals: int | Sequence[Deal],
+            seed: int | None = None, confidence: float = 0.95, workers: int | None = 1,
+            on_result: Callable[[dict], None] | None = None, actions: bool = False) -> dict:
+    """Compare policies (each takes a seat) on duplicate deals.
+
+    For each deal fool rate of a policy is its share of games lost among all
+    permutations of seats, differences of fool rates of two policies are
+    paired by deals.
+
+    :param deals: deals or a number of random deals to play.
+    :param workers: number of processes to play deals in parallel.
+    :param on_result: a function called with a result of every game (e.g.
+    StatsAggregator.add or RecordWriter.write).
+    :param actions: include actions of players in results (see play_game).
+    :return: number of deals and games, fool rates of policies and their
+    pairwise differences, each is (mean, lower bound, upper bound).
+    """
+    if isinstance(deals, int):
+        rng = random.Random(seed)
+        deals = [Deal.random(rng) for _ in range(deals)]
+
+    names = list(policies)
+    factories = [policies[name] for name in names]
+    args = ([factories] * len(deals), [names] * len(deals), deals, [True] * len(deals),
+            [actions] * len(deals))
+
+    rates = []
+
+    with contextlib.ExitStack() as stack:
+        if workers == 1:
+            deals_results = map(play_deal, *args)
+        else:
+            executor = stack.enter_context(ProcessPoolExecutor(workers))
+            deals_results = executor.map(play_deal, *args, chunksize=16)
+
+        for results in deals_results:
+            # fool rates of policies on a deal
+            rates.append([sum(result['fool'] == name for result in results) / len(results)
+                          for name in names])
+            if on_result is not None:
+                for result in results:
+                    on_result(result)
+
+    fool_rates = {name: confidence_interval([r[i] for r in rates], confidence)
+                  for i, name in enumerate(names)}
+    differences = {(a, b): confidence_interval([r[i] - r[j] for r in rates], confidence)
+                   for (i, a), (j, b) in it.combinations(enumerate(names), 2)}
+
+    return {
+        'deals': len(deals),
+        'games': len(deals) * math.factorial(len(names)),
+        'fool_rates': fool_rates,
+        'differences': differences,
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description='Compare bots on duplicate deals.')
+    parser.add_argument('policies', nargs='+', metavar='[ALIAS=]POLICY',
+                        help=f'policies to compare, one of: {", ".join(sorted(POLICIES))}')
+    parser.add_argument('--deals', type=int, default=100)
+    parser.add_argument('--seed', type=int, default=None)
+    parser.add_argument('--confidence', type=float, default=0.95)
+    parser.add_argument('--workers', type=int, default=None)
+    parser.add_argument('--records', default=None, help='a file to append results of games to')
+    parser.add_argument('--stats', action='store_true', help='report statistics of games')
+    parser.add_argument('--actions', action='store_true',
+                        help='include actions of players in records')
+    parser.add_argument('--export', default=None, metavar='DIRECTORY',
+                        help='a directory to export games and actions to (see export.py)')
+    parser.add_argument('--format', choices=FORMATS, default='npy', help='a format of an export')
+    args = parser.parse_args()
+
+    try:
+        policies = parse_policies(args.policies)
+    except ValueError as error:
+        parser.error(str(error))
+
+    aggregator = StatsAggregator()
+    with contextlib.ExitStack() as stack:
+        writer = None if args.records is None else stack.enter_context(RecordWriter(args.records))
+        exporter = None if args.export is None else \
+            stack.enter_context(ColumnarWriter(args.export, args.format))
+
+        def on_result(result: dict) -> None:
+            aggregator.add(result)
+            if writer is not None:
+                writer.write(result)
+            if exporter is not None:
+                exporter.write(result)
+
+        report = compare(policies, args.deals, args.seed, args.confidence,
+                         args.workers, on_result, args.actions or exporter is not None)
+    print(f'{report["games"]} games on {report["deals"]} deals, '
+          f'{args.confidence:.0%} confidence intervals.')
+    for name, (mean, low, high) in report['fool_rates'].items():
+        print(f'fool rate of {name}: {mean:.3f} [{low:.3f}, {high:.3f}]')
+    for (a, b), (mean, low, high) in report['differences'].items():
+        print(f'{a} - {b}: {mean:+.3f} [{low:+.3f}, {high:+.3f}]')
+    if args.stats:
+        print(aggregator.report())
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,331 @@
+"""A fast game engine for search and testing: a game state with legal moves
+generation and apply/undo of moves.
+
+The engine follows the rules of FoolCardGame._play_round exactly, but makes
+no calls to players: every decision (a question to a player) is a node with
+a list of legal moves, decisions which a game makes for a player (e.g. a
+player with no cards passes) are skipped. Cards are codes (see Card.CODES),
+sets of cards are bitsets of codes (see Hand).
+
+perft (a number of move sequences of a given depth) validates the engine
+against known counts and measures speed of moves generation and apply/undo.
+
+The engine supports the transfer variant of a game (see FoolCardGame):
+a defender's decision includes transfers of an attack (moves TRANSFER + code),
+which a game asks separately (see Player.transfer).
+
+Usage example:
+    python engine.py --players 2 --seed 1 --depth 8 --rules transfer
+"""
+
+
+from __future__ import annotations
+import argparse
+import contextlib
+import os
+import time
+
+from card import Card
+from hand import Hand, codes_of, mask_of
+from game import FoolCardGame
+from player import Player
+
+
+# phases of a round (who is asked)
+ATTACK, DEFEND, THROW, OVER = range(4)
+
+# a move to send 'PASS' in the attack and defend phases, in the throw phase
+# a move is a bitset of thrown cards (0 - 'PASS')
+PASS = -1
+# a move to transfer an attack with a card is TRANSFER + a code of the card
+TRANSFER = 64
+
+# masks of all cards of the same suit and of the same rank as a card by its code
+_SUIT_MASKS = tuple(Hand.SUIT_MASKS[card.suit] for card in Card.deck(''))
+_RANK_MASKS = tuple(Hand.RANK_MASKS[card.rank] for card in Card.deck(''))
+
+
+class State:
+    """A state of a game between rounds or in the middle of a round.
+
+    Players are identified by seats (indices of hands), order is a list of
+    seats of players still in a game: order[0] is the first attacker of a
+    round, order[1] is a defender (as FoolCardGame.players)."""
+
+    __slots__ = ('hands', 'order', 'deck', 'top', 'trump_mask', 'trash', 'table', 'table_ranks',
+                 'unbeaten', 'round', 'phase', 'attacker', 'attack_num', 'max_attacks', 'skip',
+                 'fool', 'CARDS_TO_HAVE', 'MAX_ATTACKS', 'TRANSFER', '_history')
+
+    def __init__(self, hands: list[int], deck: bytes, trump: str, cards_to_have: int = 6,
+                 max_attacks: int = 6, order: list[int] | None = None, trash: int = 0,
+                 round_: int = 0, transfer: bool = False) -> None:
+        """
+        :param hands: bitsets of cards of players by seats.
+        :param deck: codes of cards in a deck from the top to the bottom.
+        :param trump: a trump suit.
+        :param order: seats of players in order (the first attacker, the
+        defender, etc.), all seats in order by default.
+        :param trash: a bitset of beaten cards.
+        :param round_: number of rounds played.
+        :param transfer: the transfer variant of a game.
+        """
+        self.hands = list(hands)
+        self.order = list(range(len(hands)) if order is None else order)
+        self.deck = bytes(deck)
+        self.top = 0
+        self.trump_mask = Hand.SUIT_MASKS[trump]
+        self.trash = trash
+        self.CARDS_TO_HAVE = cards_to_have
+        self.MAX_ATTACKS = max_attacks
+        self.TRANSFER = transfer
+        self.round = round_
+        self.fool: int | None = None
+        self._history: list[tuple] = []
+
+        self.table = 0
+        self.table_ranks = 0
+        # codes of attack cards, which the defender has to beat in order
+        self.unbeaten: tuple[int, ...] = ()
+        self.attacker = self.attack_num = self.max_attacks = 0
+        self.skip = False
+        self.phase = OVER
+
+        self._start_round()
+
+    @classmethod
+    def from_game(cls, game: FoolCardGame) -> State:
+        """A state of a game between rounds. Seats are indices of players in
+        game.players."""
+        return cls([player.hand.mask for player in game.players], game.deck.codes, game.TRUMP,
+                   game.CARDS_TO_HAVE, game.MAX_ATTACKS, trash=game.table.trash_mask,
+                   round_=game.round, transfer=game.TRANSFER)
+
+    # helpers
+
+    @property
+    def attackers(self) -> list[int]:
+        """Seats of attackers of a round in order"""
+        return self.order[:1] + self.order[2:]
+
+    @property
+    def defender(self) -> int:
+        return self.order[1]
+
+    @property
+    def to_move(self) -> int | None:
+        """A seat of a player who is asked to move"""
+        if self.phase == OVER:
+            return None
+        if self.phase == DEFEND:
+            return self.order[1]
+        return self.order[0] if self.attacker == 0 else self.order[self.attacker + 1]
+
+    # round flow (see FoolCardGame._play_round)
+
+    def _start_round(self) -> None:
+        self.round += 1
+        self.skip = False
+        self.attacker = self.attack_num = 0
+        self.max_attacks = min(self.MAX_ATTACKS, self.hands[self.order[1]].bit_count())
+        self.phase = ATTACK
+        self._next_attacker()
+
+    def _next_attacker(self) -> None:
+        """Skip attackers with no cards (they pass without being asked)"""
+        attackers_num = len(self.order) - 1
+        while self.attacker < attackers_num and not self.hands[self.to_move]:
+            self.attacker += 1
+        if self.attacker >= attackers_num:
+            self._end_round()
+
+    def _next_thrower(self) -> None:
+        """Skip throwers with no cards, finish the throw phase if there are no
+        throwers left or the attack limit is reached"""
+        attackers_num = len(self.order) - 1
+        while self.attacker < attackers_num and self.attack_num < self.max_attacks \
+                and not self.hands[self.to_move]:
+            self.attacker += 1
+        if self.attacker >= attackers_num or self.attack_num >= self.max_attacks:
+            self._end_round()
+
+    def _end_round(self) -> None:
+        order = self.order
+        if self.skip:
+            self.hands[order[1]] |= self.table
+        else:
+            self.trash |= self.table
+        self.table = self.table_ranks = 0
+        self.unbeaten = ()
+
+        # players take cards from a deck: the first attacker first, the defender last
+        for seat in (order[0], *order[2:], order[1]):
+            missing = self.CARDS_TO_HAVE - self.hands[seat].bit_count()
+            if missing > 0 and self.top < len(self.deck):
+                self.hands[seat] |= mask_of(self.deck[self.top:self.top + missing])
+                self.top = min(self.top + missing, len(self.deck))
+
+        # reassign roles, a defender who lost a round does not attack
+        shift = 2 if self.skip else 1
+        order = order[shift:] + order[:shift]
+        self.order = [seat for seat in order if self.hands[seat]]
+
+        if len(self.order) < 2:
+            self.fool = self.order[0] if self.order else None
+            self.phase = OVER
+        else:
+            self._start_round()
+
+    # moves
+
+    def legal_moves(self) -> list[int]:
+        """Moves of a player who is asked to move"""
+        phase = self.phase
+        if phase == ATTACK:
+            hand = self.hands[self.to_move]
+            # the first attack in a round cannot be a 'PASS'
+            if not self.table:
+                return codes_of(hand)
+            return codes_of(hand & self.table_ranks) + [PASS]
+
+        if phase == DEFEND:
+            hand = self.hands[self.order[1]]
+            unbeaten = self.unbeaten
+            attack_card = unbeaten[0]
+            # higher cards of the same suit (see Card.__gt__) or any trump card
+            beating = hand & _SUIT_MASKS[attack_card] & ~((2 << attack_card) - 1)
+            if not self.trump_mask >> attack_card & 1:
+                beating |= hand & self.trump_mask
+            moves = codes_of(beating) + [PASS]
+
+            if self.TRANSFER:
+                next_defender = self.order[FoolCardGame.next_defender_index(len(self.order))]
+                if FoolCardGame.transfer_allowed(self.table.bit_count(), len(unbeaten),
+                                                 self.MAX_ATTACKS,
+                                                 self.hands[next_defender].bit_count()):
+                    moves += [TRANSFER + code
+                              for code in codes_of(hand & _RANK_MASKS[attack_card])]
+            return moves
+
+        if phase == THROW:
+            # all subsets of matching cards up to the limit, 0 is a 'PASS'
+            matching = self.hands[self.to_move] & self.table_ranks
+            limit = self.max_attacks - self.attack_num
+            moves = [0]
+            subset = matching
+            while subset:
+                if subset.bit_count() <= limit:
+                    moves.append(subset)
+                subset = (subset - 1) & matching
+            return moves
+
+        return []
+
+    def apply(self, move: int) -> None:
+        """Make a move of a player who is asked to move (the move is not validated)"""
+        self._history.append((self.hands.copy(), self.order, self.top, self.trash, self.table,
+                              self.table_ranks, self.unbeaten, self.round, self.phase,
+                              self.attacker, self.attack_num, self.max_attacks, self.skip,
+                              self.fool))
+        phase = self.phase
+
+        if phase == ATTACK:
+            if move == PASS:
+                self.attacker += 1
+                self._next_attacker()
+            else:
+                self._put(self.to_move, 1 << move)
+                self.attack_num += 1
+                self.unbeaten = (move,)
+                self.phase = DEFEND
+
+        elif phase == DEFEND:
+            if move == PASS:
+                self.skip = True
+                self.attacker = 0
+                self.phase = THROW
+                self._next_thrower()
+            elif move >= TRANSFER:
+                code = move - TRANSFER
+                self._put(self.order[1], 1 << code)
+                self.unbeaten += (code,)
+                # the defender becomes the first attacker, the next player defends
+                self.order = self.order[1:] + self.order[:1]
+                self.attacker = 0
+                self.attack_num = len(self.unbeaten)
+                self.max_attacks = min(self.MAX_ATTACKS, self.hands[self.order[1]].bit_count())
+            else:
+                self._put(self.order[1], 1 << move)
+                self.unbeaten = self.unbeaten[1:]
+                if not self.unbeaten:
+                    self.phase = ATTACK
+                    if self.attack_num >= self.max_attacks:
+                        self._end_round()
+                    else:
+                        self._next_attacker()
+
+        elif phase == THROW:
+            if move:
+                self._put(self.to_move, move)
+                self.attack_num += move.bit_count()
+            self.attacker += 1
+            self._next_thrower()
+
+    def _put(self, seat: int, cards: int) -> None:
+        """Move cards from a hand to a table"""
+        self.hands[seat] &= ~cards
+        self.table |= cards
+        for code in codes_of(cards):
+            self.table_ranks |= _RANK_MASKS[code]
+
+    def undo(self) -> None:
+        """Take back the last move"""
+        (self.hands, self.order, self.top, self.trash, self.table, self.table_ranks,
+         self.unbeaten, self.round, self.phase, self.attacker, self.attack_num,
+         self.max_attacks, self.skip, self.fool) = self._history.pop()
+
+
+def perft(state: State, depth: int) -> int:
+    """Number of move sequences of a given depth (leaf nodes of a game tree),
+    a game over node is a leaf of any depth"""
+    if depth == 0 or state.phase == OVER:
+        return 1
+
+    moves = state.legal_moves()
+    if depth == 1:
+        return len(moves)
+
+    nodes = 0
+    for move in moves:
+        state.apply(move)
+        nodes += perft(state, depth - 1)
+        state.undo()
+    return nodes
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description='Count move sequences from a dealt position.')
+    parser.add_argument('--players', type=int, default=2)
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--depth', type=int, default=8)
+    parser.add_argument('--rules', choices=('classic', 'transfer', 'both'), default='both')
+    args = parser.parse_args()
+
+    rules = ('classic', 'transfer') if args.rules == 'both' else (args.rules,)
+    for rule in rules:
+        with open(os.devnull, 'w') as devnull, contextlib.redirect_stdout(devnull):
+            game = FoolCardGame(players=[Player(f'player_{seat}')
+                                         for seat in range(args.players)],
+                                seed=args.seed, transfer=rule == 'transfer')
+        state = State.from_game(game)
+
+        print(f'{rule} rules:')
+        for depth in range(1, args.depth + 1):
+            start = time.perf_counter()
+            nodes = perft(state, depth)
+            elapsed = time.perf_counter() - start
+            print(f'depth {depth}: {nodes} nodes, {elapsed:.3f} s, '
+                  f'{nodes / elapsed if elapsed else 0:.0f} nodes/s')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,83 @@
+"""Define game events and a stream, which delivers them to observers
+(loggers, metrics, card trackers, etc.)."""
+
+
+from __future__ import annotations
+from enum import Enum
+from typing import TYPE_CHECKING, Callable, NamedTuple
+
+from card import Card
+
+if TYPE_CHECKING:
+    from player import Player
+
+
+class EventType(Enum):
+    DEAL = 'deal'  # a player took cards from a deck
+    ATTACK = 'attack'
+    DEFEND = 'defend'
+    PASS = 'pass'  # an attacker or a defender sent 'PASS'
+    TRANSFER = 'transfer'  # a defender transferred an attack to the next player
+    THROW = 'throw'  # a player threw cards to a defender who lost a round
+    PICKUP = 'pickup'  # a defender took all cards from a table
+    CLEAR = 'clear'  # beaten cards were moved from a table to trash
+    ELIMINATE = 'eliminate'  # a player finished a game (has no cards)
+    GAME_OVER = 'game over'  # a player is a fool (None if nobody)
+
+
+class Event(NamedTuple):
+    type: EventType
+    round: int
+    player: Player | None = None
+    cards: tuple[Card, ...] = ()
+
+
+# an observer gets a batch of events
+Observer = Callable[[list[Event]], None]
+
+
+class EventStream:
+    """Deliver events to subscribed observers in batches.
+
+    A stream is falsy when nobody is subscribed, thus a game checks it before
+    creating an event, and events cost nothing if nobody listens. Note, that
+    observers get private information as well (cards taken from a deck)."""
+
+    __slots__ = ('_observers',)
+
+    def __init__(self) -> None:
+        # observers, their batch sizes and not delivered events (a tuple is
+        # shared by all streams while it is empty)
+        self._observers: tuple[tuple[Observer, int, list[Event]], ...] = ()
+
+    def __bool__(self) -> bool:
+        return bool(self._observers)
+
+    def subscribe(self, observer: Observer, batch_size: int = 1) -> None:
+        """Deliver events to an observer as soon as batch_size events occur
+        (or a game is over)"""
+        if batch_size < 1:
+            raise ValueError('Batch size must be positive!')
+        self._observers += ((observer, batch_size, []),)
+
+    def unsubscribe(self, observer: Observer) -> None:
+        """Stop delivering events to an observer (not delivered events are lost)"""
+        self._observers = tuple(o for o in self._observers if o[0] != observer)
+
+    def emit(self, event: Event) -> None:
+        """Send an event to all observers"""
+        for observer, batch_size, batch in self._observers:
+            batch.append(event)
+            if len(batch) >= batch_size:
+                observer(batch.copy())
+                batch.clear()
+
+        if event.type is EventType.GAME_OVER:
+            self.flush()
+
+    def flush(self) -> None:
+        """Deliver all pending events"""
+        for observer, _, batch in self._observers:
+            if batch:
+                observer(batch.copy())
+                batch.clear()
@@ -0,0 +1,272 @@
+"""Export results of games (see duplicate.play_game) into columnar shards
+for offline analysis, and load them back without replaying games.
+
+Two tables are exported: games (a row per game) and actions (a row per
+action of a player, see records.ActionRecorder, if results include them).
+Rows are buffered and written in chunks (shards) of a fixed number of rows:
+    npy - a directory per shard with a NumPy .npy file per column,
+    csv - a gzip-compressed CSV file per shard.
+Both formats are written without NumPy. Loaded .npy columns are memory
+mapped: NumPy arrays if NumPy is installed, memoryviews otherwise. CSV
+shards are read into memory.
+
+Policies and trump suits are stored as indices: suits in
+CardGameMixin.SUITS, policies in 'policies' of metadata.json (the list
+grows as new policies appear). Missing values (e.g. no fool) are -1.
+
+Usage example:
+    python export.py records.jsonl analysis/ --format npy --chunk-rows 100000
+"""
+
+
+from __future__ import annotations
+import argparse
+import array
+import ast
+import csv
+import gzip
+import json
+import mmap
+import struct
+import sys
+from pathlib import Path
+from typing import Iterator, Sequence
+
+from mixins import CardGameMixin
+from records import read_records
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+
+FORMATS = ('npy', 'csv')
+
+# columns of tables and their types (see array typecodes)
+TABLES = {
+    'games': (('game', 'q'), ('seed', 'q'), ('trump', 'b'), ('players', 'b'), ('rounds', 'h'),
+              ('fool_seat', 'b'), ('fool_policy', 'h'), ('first_attacker_seat', 'b'),
+              ('pickups', 'h'), ('throw_phases', 'h'), ('full_throws', 'h')),
+    'actions': (('game', 'q'), ('seed', 'q'), ('seat', 'b'), ('policy', 'h'), ('trump', 'b'),
+                ('round', 'h'), ('action', 'b'), ('card', 'b'), ('outcome', 'b')),
+}
+# .npy types of array typecodes (little-endian)
+_DESCRS = {'q': '<i8', 'h': '<i2', 'b': '|i1'}
+_TYPECODES = {descr: typecode for typecode, descr in _DESCRS.items()}
+_NPY_MAGIC = b'\x93NUMPY'
+
+
+def _write_npy(path: Path, values: array.array) -> None:
+    """Write a 1-d array in .npy format (version 1.0)"""
+    header = (f"{{'descr': '{_DESCRS[values.typecode]}', 'fortran_order': False, "
+              f"'shape': ({len(values)},), }}")
+    # data is aligned to 64 bytes
+    header += ' ' * (-(len(_NPY_MAGIC) + 4 + len(header) + 1) % 64) + '\n'
+    if sys.byteorder == 'big':
+        values = array.array(values.typecode, values)
+        values.byteswap()
+
+    with open(path, 'wb') as file:
+        file.write(_NPY_MAGIC + b'\x01\x00' + struct.pack('<H', len(header)))
+        file.write(header.encode('latin1'))
+        file.write(values.tobytes())
+
+
+def _read_npy(path: Path) -> Sequence[int]:
+    """A memory-mapped 1-d array of .npy file written by _write_npy"""
+    if np is not None:
+        return np.load(path, mmap_mode='r')
+
+    with open(path, 'rb') as file:
+        data = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+    if data[:len(_NPY_MAGIC)] != _NPY_MAGIC or data[6] != 1:
+        raise ValueError(f'{path} is not a .npy file of version 1.0!')
+    header_size, = struct.unpack_from('<H', data, 8)
+    header = ast.literal_eval(data[10:10 + header_size].decode('latin1'))
+    if header['descr'] not in _TYPECODES or header['fortran_order'] or sys.byteorder == 'big':
+        raise ValueError(f'{path} cannot be read without NumPy!')
+    return memoryview(data)[10 + header_size:].cast(_TYPECODES[header['descr']])
+
+
+class ColumnarWriter:
+    """Append results of games to shards of a directory (see the module)"""
+
+    def __init__(self, directory: str | Path, format: str = 'npy',
+                 chunk_rows: int = 100_000) -> None:
+        """
+        :param format: 'npy' or 'csv'.
+        :param chunk_rows: number of rows in a shard (the last shard of an
+        export can be smaller).
+        """
+        if format not in FORMATS:
+            raise ValueError(f'Unknown format {format}, expected one of: {", ".join(FORMATS)}!')
+        if chunk_rows < 1:
+            raise ValueError('Number of rows in a shard must be positive!')
+        self.directory = Path(directory)
+        self.directory.mkdir(parents=True, exist_ok=True)
+        self.format = format
+        self.chunk_rows = chunk_rows
+
+        # an export is continued, if a directory has one already
+        metadata = load_metadata(self.directory)
+        if metadata['games'] and metadata['format'] != format:
+            raise ValueError(f'{self.directory} has an export in {metadata["format"]} format!')
+        self.games = metadata['games']
+        self.policies: list[str] = metadata['policies']
+        self._shards = metadata['shards']
+        self._buffers = {table: {column: array.array(typecode) for column, typecode in columns}
+                         for table, columns in TABLES.items()}
+
+    def _policy(self, name: str) -> int:
+        if name not in self.policies:
+            self.policies.append(name)
+        return self.policies.index(name)
+
+    def write(self, result: dict) -> None:
+        """Add rows of a result of a game"""
+        game = self.games
+        self.games += 1
+        seed = -1 if result['seed'] is None else result['seed']
+        trump = CardGameMixin.SUITS.index(result['trump']) if 'trump' in result else -1
+        fool_seat = -1 if result['fool_seat'] is None else result['fool_seat']
+        first_attacker_seat = result['first_attacker_seat']
+        policies = [self._policy(name) for name in result['seats']]
+
+        self._append('games', game, seed, trump, len(policies), result['rounds'], fool_seat,
+                     -1 if fool_seat == -1 else policies[fool_seat],
+                     -1 if first_attacker_seat is None else first_attacker_seat,
+                     len(result['pickups']), result['throw_phases'], result['full_throws'])
+        for round_, seat, action, code in result.get('actions', ()):
+            self._append('actions', game, seed, seat, policies[seat], trump, round_, action,
+                         code, seat == fool_seat)
+
+    def _append(self, table: str, *row: int) -> None:
+        buffers = self._buffers[table]
+        for values, value in zip(buffers.values(), row):
+            values.append(value)
+        if len(buffers['game']) >= self.chunk_rows:
+            self._flush_table(table)
+
+    def _flush_table(self, table: str) -> None:
+        buffers = self._buffers[table]
+        if not buffers['game']:
+            return
+
+        name = f'{table}-{self._shards[table]:05d}'
+        if self.format == 'npy':
+            shard = self.directory / name
+            shard.mkdir(exist_ok=True)
+            for column, values in buffers.items():
+                _write_npy(shard / f'{column}.npy', values)
+        else:
+            with gzip.open(self.directory / f'{name}.csv.gz', 'wt', newline='') as file:
+                writer = csv.writer(file)
+                writer.writerow(buffers)
+                writer.writerows(zip(*buffers.values()))
+
+        self._shards[table] += 1
+        for column, values in buffers.items():
+            buffers[column] = array.array(values.typecode)
+
+    def flush(self) -> None:
+        """Write buffered rows (as smaller shards) and metadata"""
+        for table in TABLES:
+            self._flush_table(table)
+        metadata = {'format': self.format, 'games': self.games, 'policies': self.policies,
+                    'shards': self._shards}
+        (self.directory / 'metadata.json').write_text(json.dumps(metadata))
+
+    def close(self) -> None:
+        self.flush()
+
+    def __enter__(self) -> ColumnarWriter:
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+
+def load_metadata(directory: str | Path) -> dict:
+    """A format, numbers of games and shards by tables and policies of an
+    export (of an empty one if a directory has no export)"""
+    path = Path(directory) / 'metadata.json'
+    if not path.exists():
+        return {'format': None, 'games': 0, 'policies': [], 'shards': dict.fromkeys(TABLES, 0)}
+    return json.loads(path.read_text())
+
+
+def iter_shards(directory: str | Path, table: str) -> Iterator[dict[str, Sequence[int]]]:
+    """Columns of shards of a table one by one (see the module for types)"""
+    if table not in TABLES:
+        raise ValueError(f'Unknown table {table}!')
+    directory = Path(directory)
+    metadata = load_metadata(directory)
+
+    for index in range(metadata['shards'][table]):
+        name = f'{table}-{index:05d}'
+        if metadata['format'] == 'npy':
+            yield {column: _read_npy(directory / name / f'{column}.npy')
+                   for column, _ in TABLES[table]}
+            continue
+
+        columns = {column: array.array(typecode) for column, typecode in TABLES[table]}
+        with gzip.open(directory / f'{name}.csv.gz', 'rt', newline='') as file:
+            reader = csv.reader(file)
+            header = next(reader)
+            values = [columns[column] for column in header]
+            for row in reader:
+                for column_values, value in zip(values, row):
+                    column_values.append(int(value))
+        yield columns if np is None else {column: np.asarray(values)
+                                          for column, values in columns.items()}
+
+
+def load(directory: str | Path, table: str) -> dict[str, Sequence[int]]:
+    """All columns of a table. Columns of a single .npy shard stay memory
+    mapped, columns of several shards are concatenated in memory (use
+    iter_shards to process large exports shard by shard)."""
+    shards = list(iter_shards(directory, table))
+    if len(shards) == 1:
+        return shards[0]
+
+    columns = {}
+    for column, typecode in TABLES[table]:
+        parts = [shard[column] for shard in shards]
+        if np is not None:
+            columns[column] = np.concatenate(parts) if parts else np.array([], _DESCRS[typecode])
+        else:
+            columns[column] = array.array(typecode)
+            for part in parts:
+                columns[column].extend(part)
+    return columns
+
+
+def export_records(records: str | Path, directory: str | Path, format: str = 'npy',
+                   chunk_rows: int = 100_000) -> int:
+    """Export a records file (see records.RecordWriter) and return number of
+    games exported"""
+    games = 0
+    with ColumnarWriter(directory, format, chunk_rows) as writer:
+        for result in read_records(records):
+            writer.write(result)
+            games += 1
+    return games
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description='Export records of games to columnar shards.')
+    parser.add_argument('records', help='a records file (see duplicate.py --records --actions)')
+    parser.add_argument('directory', help='a directory of an export (an export is continued)')
+    parser.add_argument('--format', choices=FORMATS, default='npy')
+    parser.add_argument('--chunk-rows', type=int, default=100_000)
+    args = parser.parse_args()
+
+    games = export_records(args.records, args.directory, args.format, args.chunk_rows)
+    metadata = load_metadata(args.directory)
+    print(f'{games} games are exported to {args.directory} '
+          f'({metadata["games"]} games, shards: {metadata["shards"]}).')
+
+
+if __name__ == '__main__':
+    main()
@@ -1,58 +1,142 @@
-import math
+from __future__ import annotations
 import random
+from typing import Iterable, Sequence
 
 from card import Card
+from clock import Clock
 from config import CONFIG
 from drawable import Deck, Table
+from events import Event, EventStream, EventType, Observer
 from mixins import CardGameMixin
 from player import Player
 
 
 class FoolCardGame:
-    def __init__(self, cards_to_have: int = 6, max_attacks: int = 6) -> None:
+    __slots__ = ('_events', 'round', 'PLAYERS_NUM', '_seated', 'players', 'watchers', 'TRUMP',
+                 'deck', 'CARDS_TO_HAVE', '_first_attacker', 'MAX_ATTACKS', 'table', '_skip_turn',
+                 '__fool', '_time_control', 'TRANSFER')
+
+    def __init__(self, cards_to_have: int = 6, max_attacks: int = 6,
+                 players: list[Player] | None = None, seed: int | None = None,
+                 trump: str | None = None, deck_order: Sequence[str] | None = None,
+                 seats: Sequence[int] | None = None, observers: Iterable[Observer] = (),
+                 time_control: tuple[float, float] | None = None, transfer: bool = False) -> None:
         """
         :param cards_to_have: minimum number of cards players need to have in
         the beginning of each round (if there are cards in a deck still).
         :param max_attacks: max number of attack that defender need to endure.
+        :param players: players seated in the given order. If not specified,
+        PLAYERS_NUM players are asked to join and seated in a random order.
+        :param seed: a seed for all random decisions of a game (trump suit,
+        deck order, etc.). Games with the same seed are dealt identically.
+        :param trump: a trump suit, chosen randomly if not specified.
+        :param deck_order: cards of a deck from the top to the bottom in 'RS'
+        format (R - rank and S - suit), the deck is shuffled if not specified.
+        :param seats: a permutation of players: seats[i] is an index of the
+        player who takes i-th seat. Players take seats in order by default.
+        :param observers: observers subscribed to game events from the deal.
+        :param time_control: a time limit for all moves of a player and an
+        increment per move in seconds (see Clock). A player who is out of
+        time makes a default move ('PASS' or the lowest card). Players' own
+        clocks are kept if not specified.
+        :param transfer: the transfer variant of a game: a defender, who has
+        not beaten any card yet, can transfer an attack to the next player
+        with a card of the same rank (see Player.transfer).
         """
+        # game events are created as soon as somebody subscribes to them
+        self._events: EventStream | None = None
+        for observer in observers:
+            self.events.subscribe(observer)
+
         # player-related block
-        self.PLAYERS_NUM = CONFIG['PLAYERS_NUM']
-        self.players = [Player() for _ in range(self.PLAYERS_NUM)]
-        # randomize an order of players
-        random.shuffle(self.players)
+        if players is None:
+            self.PLAYERS_NUM = CONFIG['PLAYERS_NUM']
+            players = [Player() for _ in range(self.PLAYERS_NUM)]
+            shuffle = True
+        else:
+            self.PLAYERS_NUM = len(players)
+            shuffle = False
+        # players in the given order (players are reseated for each game)
+        self._seated = tuple(players)
+        self._time_control = time_control
+
+        # other settings
+        self.CARDS_TO_HAVE = cards_to_have
+        self.MAX_ATTACKS = max_attacks
+        self.TRANSFER = transfer
+        # a deck and a table are reused by next games (see reset)
+        self.deck: Deck | None = None
+        self.table = Table()
+
+        self.reset(seed, trump, deck_order, seats, shuffle)
+
+        # start game
+        # TODO: think about -- self._greet_players()
+        self._send_instructions()
+
+    def reset(self, seed: int | None = None, trump: str | None = None,
+              deck_order: Sequence[str] | None = None, seats: Sequence[int] | None = None,
+              shuffle: bool = False) -> None:
+        """Prepare a new game of the same players: players are seated, cards
+        are dealt, nobody is asked for a name and instructions are not printed.
+        A deck, a table and players are reused.
+
+        :param shuffle: seat players in a random order (instead of seats).
+        See __init__ for other parameters.
+        """
+        # random generator is only needed to prepare a game
+        rng = random.Random(seed)
+        self.round = 0
+
+        self.players = list(self._seated)
+        if shuffle:
+            # randomize an order of players
+            rng.shuffle(self.players)
+        if seats is not None:
+            if sorted(seats) != list(range(self.PLAYERS_NUM)):
+                raise ValueError(f'{seats} is not a permutation of {self.PLAYERS_NUM} seats')
+            self.players = [self.players[seat] for seat in seats]
         # players who finished the game and waiting it finishes
         self.watchers = []
+        for player in self.players:
+            player.hand.clear()
+            if self._time_control is not None:
+                player.clock = Clock(*self._time_control)
+            player.join(self)
 
         # deck-related part
         # choose a trump suit
-        self.TRUMP = random.choice(CardGameMixin.SUITS)
+        self.TRUMP = trump if trump is not None else rng.choice(CardGameMixin.SUITS)
         # prepare deck
-        self.deck = Deck(self.TRUMP)
-        self.deck.shuffle()
+        if self.deck is None:
+            self.deck = Deck(self.TRUMP, deck_order)
+        else:
+            self.deck.reset(self.TRUMP, deck_order)
+        if deck_order is None:
+            self.deck.shuffle(rng)
+        self.table.reset(self.TRUMP)
 
         # players take cards
-        self.CARDS_TO_HAVE = cards_to_have
         self._take_cards()
 
         # TODO: remove rearrangement -> change roles with index
-        self._first_attacker = self._find_first_attacker()
+        self._first_attacker = self._find_first_attacker(rng)
         # a player with index 0 is the first attacker in a round
         first_attacker_index = self.players.index(self._first_attacker)
         self.players = (self.players[first_attacker_index:] +
                         self.players[:first_attacker_index])
 
-        # other settings
-        self.MAX_ATTACKS = max_attacks
-        self.table = Table()
-        self.round = 0
         # if current defender will not be an attacker in the next round
         self._skip_turn = False
         # a player who lost game
         self.__fool = None
 
-        # start game
-        # TODO: think about -- self._greet_players()
-        self._send_instructions()
+    @property
+    def events(self) -> EventStream:
+        """Game events, observers (and players, see Player.join) subscribe to"""
+        if self._events is None:
+            self._events = EventStream()
+        return self._events
 
     def _take_cards(self) -> None:
         """
@@ -70,11 +154,14 @@ class FoolCardGame:
         # respectively
         for player_index in (0, *range(2, players_num), 1):
             player = self.players[player_index]
-            if len(player) < self.CARDS_TO_HAVE:
+            if len(player) < self.CARDS_TO_HAVE and self.deck:
                 cards_num = self.CARDS_TO_HAVE - len(player)
+                if self._events:
+                    self._events.emit(Event(EventType.DEAL, self.round, player,
+                                           tuple(self.deck[:cards_num])))
                 player.take_cards(self.deck, cards_num)
 
-    def _find_first_attacker(self) -> Player:
+    def _find_first_attacker(self, rng: random.Random) -> Player:
         """The first attacker is a player who will start the first attack
         in an entire game. Will be determined based on the smallest trump
         card among all players. if None of players have trump cards, then
@@ -84,15 +171,15 @@ class FoolCardGame:
         smallest_trump: Card | None = None
 
         for player in self.players:
-            for card in player.hand:
-                if card.trump and ((smallest_trump is None)
-                                   or (card < smallest_trump)):
-                    smallest_trump = card
-                    first_attacker = player
+            card = player.hand.lowest_trump()
+            if card is not None and ((smallest_trump is None)
+                                     or (card < smallest_trump)):
+                smallest_trump = card
+                first_attacker = player
 
         # None of players have trump cards
         if first_attacker is None:
-            first_attacker = random.choice(self.players)
+            first_attacker = rng.choice(self.players)
 
         return first_attacker
 
@@ -112,7 +199,32 @@ class FoolCardGame:
 """
         print(instructions)
 
-    def _throw_cards(self, attackers: list[Player], defender: Player, max_attacks: int) -> None:
+    @staticmethod
+    def next_defender_index(players_num: int) -> int:
+        """An index (in players of a round) of a defender after a transfer"""
+        return 2 % players_num
+
+    @staticmethod
+    def transfer_allowed(table_cards: int, unbeaten: int, max_attacks: int,
+                         next_defender_cards: int) -> bool:
+        """If an attack can be transferred by numbers of cards (TRANSFER
+        rules): no cards on a table are beaten yet and the next defender has
+        enough cards to beat all attack cards and a transfer card. Shared
+        with the engine (see engine.State.legal_moves)."""
+        return table_cards == unbeaten < min(max_attacks, next_defender_cards)
+
+    def _can_transfer(self, defender: Player, unbeaten: list[Card]) -> bool:
+        """If a defender can transfer an attack to the next player (TRANSFER
+        rules, see transfer_allowed) with a card of the same rank."""
+        if not self.TRANSFER:
+            return False
+        next_defender = self.players[self.next_defender_index(len(self.players))]
+        return (self.transfer_allowed(len(self.table), len(unbeaten), self.MAX_ATTACKS,
+                                      len(next_defender))
+                and bool(defender.hand.of_ranks((unbeaten[0].rank,))))
+
+    def _throw_cards(self, attackers: list[Player], defender: Player, max_attacks: int,
+                     attack_num: int) -> None:
         """If defender lost a round, all other players can give (throw) him
         cards, with ranks same as ranks of cards on the table (THROW PHASE).
 
@@ -121,16 +233,20 @@ class FoolCardGame:
         cards to the defender.
 
         THROW PHASE is finished when either: 1) a set limit is reached or 2)
-        attackers do not want to or 3) have no cards to continue."""
+        attackers do not want to or 3) have no cards to continue.
+
+        attack_num is a number of attack (not defend) cards on a table."""
 
         print(f'THROW PHASE: players can give cards to the defender {defender.name}.')
-        attack_num = math.ceil(len(self.table) / 2)
 
         for attacker in attackers:
             if attack_num < max_attacks:
                 # max cards number to throw
                 max_cards_num = max_attacks - attack_num
                 thrown_cards = attacker.throw_cards(self.table, max_cards_num)
+                if self._events and thrown_cards:
+                    self._events.emit(Event(EventType.THROW, self.round, attacker,
+                                           tuple(thrown_cards)))
                 [self.table.add_card(card) for card in thrown_cards]
                 attack_num += len(thrown_cards)
             else:
@@ -142,10 +258,18 @@ class FoolCardGame:
         Add these excluded players to the list of watchers. The method removes
         players who have no cards after an attempt to replenish hand (deck is
         empty)."""
+        if all(self.players):
+            return
+
         players = []
 
         for player in self.players:
-            players.append(player) if player else self.watchers.append(player)
+            if player:
+                players.append(player)
+            else:
+                self.watchers.append(player)
+                if self._events:
+                    self._events.emit(Event(EventType.ELIMINATE, self.round, player))
 
         self.players = players
 
@@ -198,36 +322,74 @@ class FoolCardGame:
         max_attacks = min(self.MAX_ATTACKS, len(defender))
         continue_round: bool = True
 
-        for attacker in attackers:
-            while continue_round and attack_num < max_attacks:
-                attack_card = attacker.attack(self.table, defender)
-
-                if attack_card:
-                    self.table.add_card(attack_card)
-                    attack_num += 1
-                    defend_card = defender.defend(attack_card)
-
-                    if defend_card:
-                        self.table.add_card(defend_card)
-                    # defender cannot defend
-                    else:
-                        # other players can give cards to the defender
-                        self._throw_cards(attackers, defender, max_attacks)
-                        defender.take_cards(self.table, len(self.table))
-                        self._skip_turn = True
-                        continue_round = False
-                # attacker cannot attack
+        # attackers take turns in order (the order changes after a transfer)
+        attacker_index = 0
+        while continue_round and attacker_index < len(attackers) and attack_num < max_attacks:
+            attacker = attackers[attacker_index]
+            attack_card = attacker.attack(self.table, defender)
+
+            # attacker cannot attack (an attacker with no cards is not asked)
+            if not attack_card:
+                if self._events and attacker:
+                    self._events.emit(Event(EventType.PASS, self.round, attacker))
+                attacker_index += 1
+                continue
+
+            if self._events:
+                self._events.emit(Event(EventType.ATTACK, self.round, attacker, (attack_card,)))
+            self.table.add_card(attack_card)
+            attack_num += 1
+            # cards, which the defender has to beat in order
+            unbeaten = [attack_card]
+
+            while unbeaten:
+                if self._can_transfer(defender, unbeaten):
+                    next_defender = self.players[self.next_defender_index(len(self.players))]
+                    transfer_card = defender.transfer(unbeaten[0], next_defender)
+                    if transfer_card:
+                        if self._events:
+                            self._events.emit(Event(EventType.TRANSFER, self.round, defender,
+                                                   (transfer_card,)))
+                        self.table.add_card(transfer_card)
+                        unbeaten.append(transfer_card)
+                        # the defender becomes the first attacker, the next player defends
+                        self.players = self.players[1:] + self.players[:1]
+                        attackers = [p for p in self.players if self.players.index(p) != 1]
+                        defender = self.players[1]
+                        attack_num = len(unbeaten)
+                        max_attacks = min(self.MAX_ATTACKS, len(defender))
+                        attacker_index = 0
+                        continue
+
+                defend_card = defender.defend(unbeaten[0])
+
+                if defend_card:
+                    if self._events:
+                        self._events.emit(Event(EventType.DEFEND, self.round, defender,
+                                               (defend_card,)))
+                    self.table.add_card(defend_card)
+                    unbeaten.pop(0)
+                # defender cannot defend
                 else:
+                    if self._events:
+                        self._events.emit(Event(EventType.PASS, self.round, defender))
+                    # other players can give cards to the defender
+                    self._throw_cards(attackers, defender, max_attacks, attack_num)
+                    if self._events:
+                        self._events.emit(Event(EventType.PICKUP, self.round, defender,
+                                               tuple(self.table.cards)))
+                    defender.take_cards(self.table, len(self.table))
+                    self._skip_turn = True
+                    continue_round = False
                     break
 
-            else:
-                break
-
         print(f'{defender.name} lost the round and won\'t attack in the next one.'
               if self._skip_turn else
               f'{defender.name} has repelled an attack, and will attack in the next round.')
 
         # move beaten cards from the table to the trash
+        if self._events and self.table:
+            self._events.emit(Event(EventType.CLEAR, self.round, None, tuple(self.table.cards)))
         self.table.clear()
         # players take cards from the deck to have required number of cards
         self._take_cards()
@@ -254,4 +416,6 @@ class FoolCardGame:
                     self.__fool = self.players[0]
                 break
 
+        if self._events:
+            self._events.emit(Event(EventType.GAME_OVER, self.round, self.fool))
         print(f'Game is over, {"Nobody" if self.fool is None else self.fool.name} is a fool!')
@@ -0,0 +1,176 @@
+"""Define a container of player's cards, which keeps cards sorted and
+answers typical game queries (suitable cards to attack, defend, etc.) fast."""
+
+
+from __future__ import annotations
+from typing import Iterable, Iterator
+
+from card import Card
+from mixins import CardGameMixin
+
+
+def codes_of(mask: int) -> list[int]:
+    """Codes of cards of a mask in ascending order"""
+    codes = []
+    while mask:
+        lowest = mask & -mask
+        codes.append(lowest.bit_length() - 1)
+        mask ^= lowest
+    return codes
+
+
+def mask_of(codes: Iterable[int]) -> int:
+    """A bitset of codes of cards (see Card.code)"""
+    mask = 0
+    for code in codes:
+        mask |= 1 << code
+    return mask
+
+
+class Hand(CardGameMixin):
+    """Player's cards stored as a bitmask of card codes (see Card.CODES).
+
+    Codes are grouped by suits and sorted by ranks, thus cards of a suit or
+    a rank are selected with a single mask, and the lowest card of a selection
+    is its lowest bit. Cards are iterated grouped by suits (trump suit is the
+    last one) and sorted by ranks."""
+
+    # masks of codes of all cards of a suit or a rank
+    SUIT_MASKS = {suit: ((1 << len(CardGameMixin.RANKS)) - 1) << offset
+                  for suit, offset in Card.SUIT_CODES.items()}
+    RANK_MASKS = {rank: sum(1 << (offset + code) for offset in Card.SUIT_CODES.values())
+                  for rank, code in Card.RANK_CODES.items()}
+
+    __slots__ = ('mask', 'trump_suit')
+
+    def __init__(self, cards: Iterable[Card] = ()) -> None:
+        self.mask = 0
+        # a trump suit is known as soon as a hand gets a trump card
+        self.trump_suit: str | None = None
+        self.extend(cards)
+
+    @property
+    def _cards(self) -> tuple[Card, ...]:
+        """Card objects of a deck by codes (consistent with hand's trump suit)"""
+        return Card.deck(self.trump_suit or '')
+
+    def _card(self, mask: int) -> Card | None:
+        """The lowest card of a mask"""
+        if not mask:
+            return None
+        return self._cards[(mask & -mask).bit_length() - 1]
+
+    def _select(self, mask: int) -> list[Card]:
+        """Cards of a mask sorted by codes"""
+        cards = self._cards
+        return [cards[code] for code in codes_of(mask)]
+
+    def __len__(self) -> int:
+        return self.mask.bit_count()
+
+    def __bool__(self) -> bool:
+        return bool(self.mask)
+
+    def __iter__(self) -> Iterator[Card]:
+        trump_mask = self.SUIT_MASKS.get(self.trump_suit, 0)
+        yield from self._select(self.mask & ~trump_mask)
+        yield from self._select(self.mask & trump_mask)
+
+    def __contains__(self, card: Card | str) -> bool:
+        return self.find(card) is not None
+
+    def __repr__(self) -> str:
+        return repr(list(self))
+
+    def add(self, card: Card) -> None:
+        """Put a card into a hand"""
+        self.mask |= 1 << card.code
+        if card.trump:
+            self.trump_suit = card.suit
+
+    def extend(self, cards: Iterable[Card]) -> None:
+        """Put cards into a hand"""
+        for card in cards:
+            self.add(card)
+
+    def __iadd__(self, cards: Iterable[Card]) -> Hand:
+        self.extend(cards)
+        return self
+
+    def remove(self, card: Card) -> None:
+        """Remove a card from a hand, raise ValueError if there is no such card"""
+        bit = 1 << card.code
+        if not self.mask & bit:
+            raise ValueError(f'{card!s} not in hand')
+        self.mask ^= bit
+
+    def clear(self) -> None:
+        """Remove all cards from a hand"""
+        self.mask = 0
+        self.trump_suit = None
+
+    def find(self, card: Card | str) -> Card | None:
+        """Find a specified card in a hand"""
+        code = Card.CODES.get(card) if isinstance(card, str) else card.code
+        if code is None or not self.mask >> code & 1:
+            return None
+        return self._cards[code]
+
+    def of_mask(self, mask: int) -> list[Card]:
+        """Cards of a mask of codes sorted by codes"""
+        return self._select(self.mask & mask)
+
+    def of_suit(self, suit: str) -> list[Card]:
+        """Cards of a suit sorted by ranks"""
+        return self._select(self.mask & self.SUIT_MASKS[suit])
+
+    def of_ranks(self, ranks: Iterable[str]) -> list[Card]:
+        """Cards of any of specified ranks (e.g. ranks of cards on a table)"""
+        return self._select(self.mask & self.ranks_mask(ranks))
+
+    def beating(self, card: Card) -> list[Card]:
+        """Cards, which are greater than a specified card (can beat it): cards
+        of the same suit, which are sorted by ranks, then trump cards."""
+        suit_mask = self.SUIT_MASKS[card.suit]
+        # cards of the same suit and a greater rank
+        mask = self.mask & suit_mask & ~((2 << card.code) - 1)
+        if not card.trump and self.trump_suit is not None:
+            mask |= self.mask & self.SUIT_MASKS[self.trump_suit]
+        return self._select(mask)
+
+    def lowest_beating(self, card: Card) -> Card | None:
+        """The lowest card of the same suit which beats a specified card, or
+        the lowest trump card if there is no such card"""
+        suit_mask = self.SUIT_MASKS[card.suit]
+        beating = self._card(self.mask & suit_mask & ~((2 << card.code) - 1))
+        if beating is None and not card.trump:
+            beating = self.lowest_trump()
+        return beating
+
+    def lowest_trump(self) -> Card | None:
+        """The lowest trump card"""
+        if self.trump_suit is None:
+            return None
+        return self._card(self.mask & self.SUIT_MASKS[self.trump_suit])
+
+    def lowest(self, trumps: bool = False, mask: int = -1) -> Card | None:
+        """The lowest card (of the lowest rank among all suits) excluding trump
+        cards, if not specified otherwise. Cards can be limited by a mask of
+        codes (see ranks_mask)."""
+        mask &= self.mask
+        if not trumps and self.trump_suit is not None:
+            mask &= ~self.SUIT_MASKS[self.trump_suit]
+
+        if mask:
+            for rank_mask in self.RANK_MASKS.values():
+                if mask & rank_mask:
+                    return self._card(mask & rank_mask)
+        return None
+
+    @classmethod
+    def ranks_mask(cls, ranks: Iterable[str]) -> int:
+        """A mask of codes of all cards of specified ranks"""
+        mask = 0
+        for rank in ranks:
+            mask |= cls.RANK_MASKS[rank]
+        return mask
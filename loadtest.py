@@ -0,0 +1,339 @@
+"""Load test: how many concurrent tables (games of interactive players) a
+single process serves.
+
+Every table is a game of remote players (see RemotePlayer), which is played
+in a thread of a server stand-in, as the game asks players synchronously.
+Prompts of players (a name, an attack, a defense, a transfer, a throw) are
+sent to scripted clients, every client is an asyncio task. Clients are
+connected either in-process (asyncio queues) or over loopback TCP (a JSON
+line per prompt, a text line per reply).
+
+A client knows only player's cards (sent with a prompt) and replies like a
+careless human: a random card of a hand or 'PASS', thus some replies are
+rejected and a player is asked again (as an interactive player would be).
+Some clients can drop their connections in the middle of a game: a table
+of a dropped client fails (its game is not finished) and is counted.
+
+For every number of tables the test reports throughput (games and prompts
+per second), latency of a prompt round trip (from a game asking a player
+to a reply) and memory per table (Python objects of a game, its players
+and clients traced by tracemalloc, thread stacks are not included).
+
+Usage example:
+    python loadtest.py --tables 1 10 100 --players 2 --transport tcp
+"""
+
+
+from __future__ import annotations
+import argparse
+import asyncio
+import contextlib
+import json
+import math
+import os
+import random
+import time
+import tracemalloc
+from concurrent.futures import ThreadPoolExecutor
+from typing import Sequence
+
+from game import FoolCardGame
+from player import Player
+
+
+# replies of a client, which drops a connection: a name and a couple of moves
+_DROP_AFTER = 3
+
+class QueueConnection:
+    """An in-process connection of a player and a client"""
+
+    def __init__(self) -> None:
+        self._prompts: asyncio.Queue[dict | None] = asyncio.Queue()
+        self._replies: asyncio.Queue[str | None] = asyncio.Queue()
+
+    # a server side
+
+    async def ask(self, message: dict) -> str:
+        """A reply of a client, ConnectionError if a client disconnected"""
+        await self._prompts.put(message)
+        reply = await self._replies.get()
+        if reply is None:
+            raise ConnectionError('A client disconnected!')
+        return reply
+
+    async def close(self) -> None:
+        await self._prompts.put(None)
+
+    # a client side
+
+    async def receive(self) -> dict | None:
+        """The next prompt, None if a game is over"""
+        return await self._prompts.get()
+
+    async def reply(self, text: str) -> None:
+        await self._replies.put(text)
+
+    async def disconnect(self) -> None:
+        await self._replies.put(None)
+
+
+class StreamConnection:
+    """A server side of a TCP connection of a player"""
+
+    def __init__(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        self._reader = reader
+        self._writer = writer
+        self.closed = asyncio.Event()
+
+    async def ask(self, message: dict) -> str:
+        """A reply of a client, ConnectionError if a client disconnected"""
+        self._writer.write(json.dumps(message).encode() + b'\n')
+        await self._writer.drain()
+        line = await self._reader.readline()
+        if not line:
+            raise ConnectionError('A client disconnected!')
+        return line.decode()
+
+    async def close(self) -> None:
+        self._writer.close()
+        await self._writer.wait_closed()
+        self.closed.set()
+
+
+class StreamClient:
+    """A client side of a TCP connection"""
+
+    def __init__(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        self._reader = reader
+        self._writer = writer
+
+    async def receive(self) -> dict | None:
+        line = await self._reader.readline()
+        if not line:
+            self._writer.close()
+            return None
+        return json.loads(line)
+
+    async def reply(self, text: str) -> None:
+        self._writer.write(text.encode() + b'\n')
+        await self._writer.drain()
+
+    async def disconnect(self) -> None:
+        self._writer.close()
+        await self._writer.wait_closed()
+
+
+class RemotePlayer(Player):
+    """An interactive player, whose prompts are sent to a client over a
+    connection, which belongs to an event loop (a player is asked in a
+    thread of a game)."""
+
+    __slots__ = ('_connection', '_loop', 'latencies')
+
+    def __init__(self, connection: QueueConnection | StreamConnection,
+                 loop: asyncio.AbstractEventLoop, latencies: list[float]) -> None:
+        """
+        :param latencies: round trips of prompts in seconds are appended to it.
+        """
+        self._connection = connection
+        self._loop = loop
+        self.latencies = latencies
+
+        # see Player.__init__
+        while True:
+            name = self._request({'prompt': 'Please enter your name: ', 'hand': None}).strip()
+            if self.RE_NAME.fullmatch(name):
+                break
+        super().__init__(name)
+        self.greet_player()
+
+    def _request(self, message: dict) -> str:
+        start = time.perf_counter()
+        reply = asyncio.run_coroutine_threadsafe(self._connection.ask(message),
+                                                 self._loop).result()
+        self.latencies.append(time.perf_counter() - start)
+        return reply
+
+    def _ask(self, prompt: str) -> str | None:
+        hand = [f'{card.rank}{card.suit[0]}' for card in self.hand]
+        return self._request({'prompt': prompt, 'hand': hand}).strip().upper()
+
+
+async def run_client(connection: QueueConnection | StreamClient, name: str,
+                     rng: random.Random, pass_rate: float = 0.3,
+                     drop_after: int | None = None) -> int:
+    """Reply to prompts until a game is over and return number of replies.
+
+    :param drop_after: disconnect after a number of replies instead.
+    """
+    replies = 0
+    while (message := await connection.receive()) is not None:
+        if replies == drop_after:
+            await connection.disconnect()
+            break
+        hand = message['hand']
+        if hand is None:
+            reply = name
+        elif not hand or rng.random() < pass_rate:
+            reply = 'PASS'
+        else:
+            reply = rng.choice(hand)
+        await connection.reply(reply)
+        replies += 1
+    return replies
+
+
+def _percentile(values: list[float], q: float) -> float:
+    """The smallest value, which is not less than a q share of sorted values"""
+    return values[max(math.ceil(q * len(values)), 1) - 1] if values else 0.0
+
+
+async def _play_table(connections: list, executor: ThreadPoolExecutor, latencies: list[float],
+                      seed: int) -> bool:
+    """Play a game at a table, False if a client disconnected"""
+    loop = asyncio.get_running_loop()
+
+    def play() -> None:
+        players = [RemotePlayer(connection, loop, latencies) for connection in connections]
+        FoolCardGame(players=players, seed=seed).play()
+
+    try:
+        await loop.run_in_executor(executor, play)
+        return True
+    except ConnectionError:
+        return False
+    finally:
+        for connection in connections:
+            await connection.close()
+
+
+async def _serve(tables: int, players: int, transport: str, seed: int, latencies: list[float],
+                 drops: int = 0) -> int:
+    """Play games at all tables and return number of games played to the end"""
+    rng = random.Random(seed)
+    clients_num = tables * players
+
+    def client_rng() -> random.Random:
+        return random.Random(rng.getrandbits(32))
+
+    def drop_after(i: int) -> int | None:
+        return _DROP_AFTER if i < drops else None
+
+    with ThreadPoolExecutor(tables) as executor:
+        if transport == 'memory':
+            connections = [QueueConnection() for _ in range(clients_num)]
+            played = await asyncio.gather(
+                *(_play_table(connections[i * players:(i + 1) * players], executor, latencies,
+                              seed + i) for i in range(tables)),
+                *(run_client(connection, f'client_{i}', client_rng(), drop_after=drop_after(i))
+                  for i, connection in enumerate(connections)))
+            return sum(played[:tables])
+
+        # players are seated at tables in order of connection
+        waiting: asyncio.Queue[StreamConnection] = asyncio.Queue()
+
+        async def handle(reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+            connection = StreamConnection(reader, writer)
+            await waiting.put(connection)
+            await connection.closed.wait()
+
+        async def connect(i: int) -> None:
+            reader, writer = await asyncio.open_connection('127.0.0.1', port)
+            await run_client(StreamClient(reader, writer), f'client_{i}', client_rng(),
+                             drop_after=drop_after(i))
+
+        async def seat() -> int:
+            table_tasks = []
+            for i in range(tables):
+                connections = [await waiting.get() for _ in range(players)]
+                table_tasks.append(asyncio.create_task(
+                    _play_table(connections, executor, latencies, seed + i)))
+            return sum(await asyncio.gather(*table_tasks))
+
+        server = await asyncio.start_server(handle, '127.0.0.1', 0)
+        port = server.sockets[0].getsockname()[1]
+        async with server:
+            played, *_ = await asyncio.gather(seat(), *(connect(i) for i in range(clients_num)))
+        return played
+
+
+def run_load(tables: int, players: int = 2, transport: str = 'memory', seed: int = 0,
+             trace_memory: bool = True, drops: int = 0) -> dict:
+    """Play a game at every table concurrently.
+
+    :param transport: 'memory' (in-process) or 'tcp' (loopback).
+    :param trace_memory: measure memory per table (tracemalloc slows down
+    a test, throughput is lower).
+    :param drops: number of clients, which drop their connections in the
+    middle of a game.
+    :return: number of tables, games played to the end, failed tables
+    (dropped clients) and prompts, time in seconds, games and prompts per
+    second, p50 and p99 latency of prompts in seconds and memory per table in
+    bytes (None if not traced).
+    """
+    if transport not in ('memory', 'tcp'):
+        raise ValueError(f'Unknown transport {transport}!')
+    latencies: list[float] = []
+
+    if trace_memory:
+        tracemalloc.start()
+    try:
+        before = tracemalloc.get_traced_memory()[0] if trace_memory else 0
+        start = time.perf_counter()
+        with open(os.devnull, 'w') as devnull, contextlib.redirect_stdout(devnull):
+            games = asyncio.run(_serve(tables, players, transport, seed, latencies, drops))
+        elapsed = time.perf_counter() - start
+        peak = tracemalloc.get_traced_memory()[1] if trace_memory else 0
+    finally:
+        if trace_memory:
+            tracemalloc.stop()
+
+    latencies.sort()
+    return {
+        'tables': tables,
+        'games': games,
+        'failures': tables - games,
+        'prompts': len(latencies),
+        'seconds': elapsed,
+        'games_per_second': games / elapsed,
+        'prompts_per_second': len(latencies) / elapsed,
+        'p50': _percentile(latencies, 0.5),
+        'p99': _percentile(latencies, 0.99),
+        'memory_per_table': (peak - before) / tables if trace_memory else None,
+    }
+
+
+def ramp(levels: Sequence[int], players: int = 2, transport: str = 'memory', seed: int = 0,
+         trace_memory: bool = True, drops: int = 0) -> list[dict]:
+    """Run a load test for every number of concurrent tables (see run_load)"""
+    return [run_load(tables, players, transport, seed, trace_memory, drops)
+            for tables in levels]
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description='Load test concurrent tables of remote players.')
+    parser.add_argument('--tables', type=int, nargs='+', default=[1, 10, 100],
+                        help='numbers of concurrent tables')
+    parser.add_argument('--players', type=int, default=2)
+    parser.add_argument('--transport', choices=('memory', 'tcp'), default='memory')
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--no-memory', action='store_true',
+                        help='do not trace memory (it slows down a test)')
+    parser.add_argument('--drops', type=int, default=0,
+                        help='number of clients, which drop connections in the middle of a game')
+    args = parser.parse_args()
+
+    print(f'{"tables":>7} {"failed":>7} {"prompts":>9} {"games/s":>9} {"prompts/s":>10} '
+          f'{"p50 ms":>8} {"p99 ms":>8} {"KB/table":>9}')
+    for report in ramp(args.tables, args.players, args.transport, args.seed,
+                       not args.no_memory, args.drops):
+        memory = report['memory_per_table']
+        print(f'{report["tables"]:>7} {report["failures"]:>7} {report["prompts"]:>9} '
+              f'{report["games_per_second"]:>9.1f} '
+              f'{report["prompts_per_second"]:>10.0f} {report["p50"] * 1000:>8.2f} '
+              f'{report["p99"] * 1000:>8.2f} '
+              f'{"-" if memory is None else f"{memory / 1024:.1f}":>9}')
+
+
+if __name__ == '__main__':
+    main()
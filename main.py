@@ -1,9 +1,42 @@
-"""Entry point"""
+"""Entry point: a game of human players and (optionally) search bots.
 
+Usage example:
+    python main.py --bots 1 --time 300 --increment 5 --games 3 --transfer
+"""
 
-from game import FoolCardGame
+
+import argparse
+import random
+
+from config import CONFIG
+from player import Player
+from search import SearchBot
+from session import Session
 
 
 if __name__ == '__main__':
-    game = FoolCardGame()
-    game.play()
+    parser = argparse.ArgumentParser(description='Play a fool card game.')
+    parser.add_argument('--bots', type=int, default=0,
+                        help='number of bots among PLAYERS_NUM players')
+    parser.add_argument('--time', type=float, default=None,
+                        help='time limit for all moves of a player in seconds')
+    parser.add_argument('--increment', type=float, default=0, help='time added after each move')
+    parser.add_argument('--games', type=int, default=1, help='number of games of the same players')
+    parser.add_argument('--transfer', action='store_true',
+                        help='the transfer variant: a defender can pass an attack on')
+    args = parser.parse_args()
+
+    players = None
+    if args.bots:
+        # bots think in the background while humans enter their moves
+        players = [Player() for _ in range(max(CONFIG['PLAYERS_NUM'] - args.bots, 0))]
+        players += [SearchBot(f'bot_{i}') for i in range(args.bots)]
+        random.shuffle(players)
+
+    time_control = None if args.time is None else (args.time, args.increment)
+    # players are asked for their names once
+    session = Session(players, time_control=time_control, transfer=args.transfer)
+    for _ in session.play_many(args.games):
+        pass
+    if args.games > 1:
+        print(f'Games lost: {session.fools}')
@@ -5,6 +5,8 @@ from config import CONFIG
 
 
 class CardGameMixin:
+    __slots__ = ()
+
     SUITS = ('Spades', 'Clubs', 'Diamonds', 'Hearts')
     SUITS_UNI = {
         'Spades': '♠',
@@ -16,11 +18,13 @@ class CardGameMixin:
 
 class CardGameMixin36(CardGameMixin):
     """Mixin for card games based on 36-card deck"""
+    __slots__ = ()
     RANKS = ('6', '7', '8', '9', '10', 'J', 'Q', 'K', 'A')
 
 
 class CardGameMixin52(CardGameMixin):
     """Mixin for card games based on 52-card deck"""
+    __slots__ = ()
     RANKS = ('2', '3', '4', '5', '6', '7', '8', '9', '10', 'J', 'Q', 'K', 'A')
 
 
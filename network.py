@@ -0,0 +1,269 @@
+"""Define a bot, which chooses moves with a small neural network: a
+multilayer perceptron on NumPy with a policy head (scores of cards and
+'PASS') and a value head (an expected outcome of a game for a player).
+
+A decision of a bot is encoded into a fixed vector of features of public
+information and bot's cards (see encode). A network evaluates decisions in
+batches, BatchEvaluator collects decisions of bots of many concurrent games
+(see play_concurrently) and evaluates them in a single matrix multiplication.
+
+Networks are trained elsewhere, weights are loaded from a local .npz file
+(see Network.save for a format). NumPy is required by this module only.
+
+Usage example:
+    evaluator = BatchEvaluator(Network.load('weights.npz'))
+    games = [FoolCardGame(players=[NetworkBot('network', evaluator), HeuristicBot('heuristic')],
+                          seed=seed) for seed in range(100)]
+    fools = play_concurrently(games, evaluator)
+"""
+
+
+from __future__ import annotations
+import contextlib
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from typing import TYPE_CHECKING, Iterator, Sequence
+
+import numpy as np
+
+from card import Card
+from drawable import Table
+from mixins import CardGameMixin
+from player import Player
+
+if TYPE_CHECKING:
+    from game import FoolCardGame
+
+
+DECK_SIZE = len(CardGameMixin.SUITS) * len(CardGameMixin.RANKS)
+# sizes of hands are encoded for this number of players (the rest are ignored)
+MAX_PLAYERS = 6
+DECISIONS = ('attack', 'defend', 'transfer', 'throw')
+
+# own hand, a table, trash and a card to beat (bitsets of codes), a trump
+# suit, sizes of hands (starting from the player), a deck size and a decision
+FEATURES = 4 * DECK_SIZE + len(CardGameMixin.SUITS) + MAX_PLAYERS + 1 + len(DECISIONS)
+# scores of cards, a score of 'PASS' and a value
+OUTPUTS = DECK_SIZE + 2
+PASS = DECK_SIZE
+
+_BITS = np.arange(DECK_SIZE, dtype=np.int64)
+
+
+def encode(game: FoolCardGame, player: Player, decision: str,
+           card: Card | None = None) -> np.ndarray:
+    """Features of a decision of a player (a card is a card to beat in the
+    defend and transfer decisions)"""
+    features = np.zeros(FEATURES, dtype=np.float32)
+    for i, mask in enumerate((player.hand.mask, game.table.mask, game.table.trash_mask)):
+        features[i * DECK_SIZE:(i + 1) * DECK_SIZE] = (mask >> _BITS) & 1
+    if card is not None:
+        features[3 * DECK_SIZE + card.code] = 1
+
+    offset = 4 * DECK_SIZE
+    features[offset + CardGameMixin.SUITS.index(game.TRUMP)] = 1
+    offset += len(CardGameMixin.SUITS)
+
+    players = game.players
+    seat = players.index(player) if player in players else 0
+    for i, other in enumerate((players[seat:] + players[:seat])[:MAX_PLAYERS]):
+        features[offset + i] = len(other) / DECK_SIZE
+    offset += MAX_PLAYERS
+
+    features[offset] = len(game.deck) / DECK_SIZE
+    features[offset + 1 + DECISIONS.index(decision)] = 1
+    return features
+
+
+class Network:
+    """A multilayer perceptron: hidden layers with ReLU, the last layer gives
+    scores of cards and 'PASS' (see OUTPUTS) and a value (tanh, from -1 for
+    a fool to 1)."""
+
+    __slots__ = ('weights', 'biases')
+
+    def __init__(self, weights: Sequence[np.ndarray], biases: Sequence[np.ndarray]) -> None:
+        """
+        :param weights: matrices of layers (inputs x outputs).
+        :param biases: vectors of layers.
+        """
+        if not weights or len(weights) != len(biases):
+            raise ValueError('Every layer should have weights and biases!')
+        inputs = FEATURES
+        for matrix, bias in zip(weights, biases):
+            if matrix.ndim != 2 or matrix.shape[0] != inputs or bias.shape != matrix.shape[1:]:
+                raise ValueError(f'Wrong shapes of a layer: {matrix.shape}, {bias.shape}!')
+            inputs = matrix.shape[1]
+        if inputs != OUTPUTS:
+            raise ValueError(f'The last layer should have {OUTPUTS} outputs!')
+
+        self.weights = [np.asarray(matrix, dtype=np.float32) for matrix in weights]
+        self.biases = [np.asarray(bias, dtype=np.float32) for bias in biases]
+
+    @classmethod
+    def random(cls, hidden: Sequence[int] = (128,), seed: int | None = None) -> Network:
+        """A network with random weights (e.g. to start training)"""
+        rng = np.random.default_rng(seed)
+        sizes = [FEATURES, *hidden, OUTPUTS]
+        weights = [rng.normal(0, np.sqrt(2 / inputs), (inputs, outputs))
+                   for inputs, outputs in zip(sizes, sizes[1:])]
+        return cls(weights, [np.zeros(outputs) for outputs in sizes[1:]])
+
+    @classmethod
+    def load(cls, path: str) -> Network:
+        with np.load(path, allow_pickle=False) as arrays:
+            layers = len(arrays.files) // 2
+            return cls([arrays[f'w{i}'] for i in range(layers)],
+                       [arrays[f'b{i}'] for i in range(layers)])
+
+    def save(self, path: str) -> None:
+        """Save weights to an .npz file: arrays w0, b0, w1, b1, etc."""
+        arrays = {}
+        for i, (matrix, bias) in enumerate(zip(self.weights, self.biases)):
+            arrays[f'w{i}'], arrays[f'b{i}'] = matrix, bias
+        np.savez(path, **arrays)
+
+    def forward(self, features: np.ndarray) -> tuple[np.ndarray, np.ndarray]:
+        """Scores (decisions x OUTPUTS - 1) and values of a batch of decisions"""
+        outputs = features
+        for matrix, bias in zip(self.weights[:-1], self.biases[:-1]):
+            outputs = np.maximum(outputs @ matrix + bias, 0)
+        outputs = outputs @ self.weights[-1] + self.biases[-1]
+        return outputs[:, :-1], np.tanh(outputs[:, -1])
+
+    def evaluate(self, features: np.ndarray) -> tuple[np.ndarray, float]:
+        """Scores and a value of a single decision"""
+        scores, values = self.forward(features[np.newaxis])
+        return scores[0], float(values[0])
+
+
+class BatchEvaluator:
+    """Evaluate decisions of concurrent games (threads) in batches. A batch
+    is evaluated as soon as every playing game (see client) waits for a
+    decision, max_batch decisions are collected or max_wait seconds passed."""
+
+    __slots__ = ('network', 'max_batch', 'max_wait', 'batches', 'evaluated', '_condition',
+                 '_pending', '_clients')
+
+    def __init__(self, network: Network, max_batch: int = 256, max_wait: float = 0.01) -> None:
+        if max_batch < 1 or max_wait < 0:
+            raise ValueError('Batch size must be positive and wait time must not be negative!')
+        self.network = network
+        self.max_batch = max_batch
+        self.max_wait = max_wait
+        # number of batches and decisions evaluated
+        self.batches = self.evaluated = 0
+
+        self._condition = threading.Condition()
+        # features of decisions and their results (None until evaluated)
+        self._pending: list[list] = []
+        self._clients = 0
+
+    @contextlib.contextmanager
+    def client(self) -> Iterator[None]:
+        """A game played in a current thread (other games do not wait for
+        its decisions as soon as it is over)"""
+        with self._condition:
+            self._clients += 1
+        try:
+            yield
+        finally:
+            with self._condition:
+                self._clients -= 1
+                if self._pending and self._full():
+                    self._flush()
+
+    def _full(self) -> bool:
+        return len(self._pending) >= min(self.max_batch, self._clients or self.max_batch)
+
+    def _flush(self) -> None:
+        pending, self._pending = self._pending, []
+        scores, values = self.network.forward(np.stack([item[0] for item in pending]))
+        for item, item_scores, value in zip(pending, scores, values):
+            item[1] = (item_scores, float(value))
+        self.batches += 1
+        self.evaluated += len(pending)
+        self._condition.notify_all()
+
+    def evaluate(self, features: np.ndarray) -> tuple[np.ndarray, float]:
+        """Scores and a value of a single decision (see Network.evaluate)"""
+        item = [features, None]
+        with self._condition:
+            self._pending.append(item)
+            if self._full():
+                self._flush()
+            elif not self._condition.wait_for(lambda: item[1] is not None, self.max_wait):
+                self._flush()
+        return item[1]
+
+
+class NetworkBot(Player):
+    """A bot, which chooses an option with the highest score of a network
+    (a card or 'PASS'). A bot throws cards with higher scores than 'PASS'."""
+
+    __slots__ = ('network', '_game')
+
+    def __init__(self, name: str, network: Network | BatchEvaluator) -> None:
+        """
+        :param network: a network or a batch evaluator shared by bots.
+        """
+        super().__init__(name)
+        self.network = network
+        self._game: FoolCardGame | None = None
+
+    def join(self, game: FoolCardGame) -> None:
+        self._game = game
+
+    def _scores(self, decision: str, card: Card | None = None) -> np.ndarray:
+        return self.network.evaluate(encode(self._game, self, decision, card))[0]
+
+    def _choose(self, decision: str, options: list[Card], can_pass: bool = True,
+                card: Card | None = None) -> Card | None:
+        """The best option of a decision (None is 'PASS')"""
+        if not options:
+            return None
+        scores = self._scores(decision, card)
+        best = max(options, key=lambda option: scores[option.code])
+        if can_pass and scores[PASS] >= scores[best.code]:
+            return None
+        self.hand.remove(best)
+        return best
+
+    def attack(self, table: Table, defender: Player) -> Card | None:
+        if not self:
+            return None
+        # only the first attack in a round cannot be a 'PASS'
+        options = self.hand.of_ranks(table.card_ranks) if table else list(self.hand)
+        return self._choose('attack', options, can_pass=bool(table))
+
+    def defend(self, attack_card: Card) -> Card | None:
+        return self._choose('defend', self.hand.beating(attack_card), card=attack_card)
+
+    def transfer(self, attack_card: Card, defender: Player) -> Card | None:
+        return self._choose('transfer', self.hand.of_ranks((attack_card.rank,)),
+                            card=attack_card)
+
+    def throw_cards(self, table: Table, max_cards_num: int) -> list[Card]:
+        options = self.hand.of_ranks(table.card_ranks)
+        if not options:
+            return []
+        scores = self._scores('throw')
+        options = [card for card in options if scores[card.code] > scores[PASS]]
+        options.sort(key=lambda card: scores[card.code], reverse=True)
+        cards = options[:max_cards_num]
+        for card in cards:
+            self.hand.remove(card)
+        return cards
+
+
+def play_concurrently(games: Sequence[FoolCardGame], evaluator: BatchEvaluator,
+                      threads: int | None = None) -> list[Player | None]:
+    """Play games in threads (decisions of network bots are evaluated in
+    batches) and return fools"""
+    def play(game: FoolCardGame) -> Player | None:
+        with evaluator.client():
+            game.play()
+        return game.fool
+
+    with ThreadPoolExecutor(threads or len(games) or 1) as executor:
+        return list(executor.map(play, games))
@@ -1,8 +1,14 @@
 from __future__ import annotations
 import re
+from typing import TYPE_CHECKING, Iterable
 
 from card import Card
+from clock import Clock, read_line
 from drawable import Deck, Table
+from hand import Hand
+
+if TYPE_CHECKING:
+    from game import FoolCardGame
 
 
 # TODO: check and fix all doc-strings
@@ -12,31 +18,69 @@ from drawable import Deck, Table
 class Player:
     RE_NAME = re.compile(r'\w{3,20}')
 
-    def __init__(self) -> None:
-        # ask a player to send his name until a suitable name is provided
-        # TODO: no duplicate names
-        while True:
-            username = input('Please enter your name: ').strip()
-            # handle username
-            if self.RE_NAME.fullmatch(username):
-                self.name = username
-                break
+    __slots__ = ('name', '_hand', 'clock')
+
+    def __init__(self, name: str | None = None) -> None:
+        """
+        :param name: a name of a player. If not specified, a player is asked
+        to enter it (interactive players), otherwise it is used as is (bots).
+        """
+        # time control of a player (see FoolCardGame), moves are not timed by default
+        self.clock: Clock | None = None
+        if name is not None:
+            self.name = name
+        else:
+            # ask a player to send his name until a suitable name is provided
+            # TODO: no duplicate names
+            while True:
+                username = input('Please enter your name: ').strip()
+                # handle username
+                if self.RE_NAME.fullmatch(username):
+                    self.name = username
+                    break
 
-        self.greet_player()
+            self.greet_player()
         # player's cards
-        # TODO: store cards in a more organized way (dict)
-        self.hand = []
+        self.hand = Hand()
+
+    def join(self, game: FoolCardGame) -> None:
+        """Called when a player takes a seat in a game, before cards are dealt.
+        Bots can subscribe to game events here (see FoolCardGame.events)."""
+
+    def _ask(self, prompt: str) -> str | None:
+        """Ask a player to enter a move, None if player's clock ran out"""
+        if self.clock is None:
+            return input(prompt).strip().upper()
+
+        self.clock.start()
+        try:
+            # input is looked up at a call time (it can be replaced in tests)
+            user_input = read_line(prompt, self.clock.left(), lambda text: input(text))
+        finally:
+            self.clock.stop()
+
+        if user_input is None:
+            print(f'\n{self.name} is out of time.')
+            return None
+        return user_input.strip().upper()
 
     # TODO: think if transfer this method to the class Game
     def greet_player(self) -> None:
         """Greet player"""
         print(f'Hi, {self.name}, have a nice game and good luck!\n')
 
+    @property
+    def hand(self) -> Hand:
+        """Player's cards sorted by suits and ranks"""
+        return self._hand
+
+    @hand.setter
+    def hand(self, cards: Iterable[Card]) -> None:
+        self._hand = cards if isinstance(cards, Hand) else Hand(cards)
+
     def find_card(self, card: Card | str) -> Card | None:
         """Try to find a specified card in a player's hand"""
-        for c in self.hand:
-            if c == card:
-                return c
+        return self.hand.find(card)
 
     def __len__(self):
         """Display a number of cards in a player's hand"""
@@ -59,7 +103,6 @@ class Player:
     def take_cards(self, from_: Deck | Table, /, num: int) -> None:
         """Take specified number of cards from a deck or all cards from table"""
         self.hand += from_.draw(num)
-        # TODO: sort cards in a player's hand
 
     def attack(self, table: Table, defender: Player) -> Card | None:
         """Ask a player to choose a card to attack another player (defender).
@@ -87,8 +130,14 @@ class Player:
         while self:
             # ask player to choose a card
             # TODO: add addressing to player for each message! Make them more personal!
-            user_input = input(f'{self.name}, choose a card'
-                               f' to attack {defender.name}: ').strip().upper()
+            user_input = self._ask(f'{self.name}, choose a card to attack {defender.name}: ')
+
+            # out of time: 'PASS' or the lowest card in the first attack
+            if user_input is None:
+                attack_card = None if table else self.hand.lowest() or self.hand.lowest(trumps=True)
+                if attack_card is not None:
+                    self.hand.remove(attack_card)
+                break
 
             # player does not want to or have no suitable card to attack
             if user_input == 'PASS':
@@ -138,9 +187,10 @@ class Player:
         # TODO: change True for self for consistency (with attack and throw)
         while True:
             # ask player to choose a card
-            user_input = input(f'{self.name}, choose a card to defend: ').strip().upper()
+            user_input = self._ask(f'{self.name}, choose a card to defend: ')
 
-            if user_input == 'PASS':
+            # out of time: 'PASS'
+            if user_input is None or user_input == 'PASS':
                 print(f'{self.name} does not want to or have no suitable cards to defend.')
                 break
 
@@ -158,6 +208,39 @@ class Player:
 
         return defend_card
 
+    def transfer(self, attack_card: Card, defender: Player) -> Card | None:
+        """Ask a defender to transfer an attack to the next player (defender)
+        with a card of the same rank as the attack card (the transfer variant
+        of a game). A game asks only when a transfer is possible, the player
+        defends (see defend) unless transfers the attack.
+
+        Player should send a card in a format 'RS' (R - rank and S - suit) or
+        'PASS' to defend."""
+
+        transfer_card = None
+
+        while True:
+            user_input = self._ask(f'{self.name}, choose a card to transfer the attack '
+                                   f'to {defender.name} or send \'PASS\' to defend: ')
+
+            # out of time: 'PASS'
+            if user_input is None or user_input == 'PASS':
+                break
+
+            potential_card = self.find_card(user_input)
+            if potential_card:
+                if potential_card.rank == attack_card.rank:
+                    self.hand.remove(potential_card)
+                    transfer_card = potential_card
+                    break
+                else:
+                    print(f'Card {potential_card!s} is not of the same rank as '
+                          f'the attack card {attack_card!s}. Try again.\n')
+            else:
+                print('Specified card not found. Try again.\n')
+
+        return transfer_card
+
     def throw_cards(self, table: Table, max_cards_num: int) -> list[Card]:
         """Ask a player to throw cards to defender who lost the round. Only
         cards of the same ranks as cards on a table can be thrown.
@@ -181,26 +264,34 @@ class Player:
             # start each input from scratch
             cards.clear()
             # player should specify all cards at once
-            user_input = input(f'Please enter at most {max_cards_num} cards to '
-                               f'throw (separated by spaces): ').strip().upper()
+            user_input = self._ask(f'Please enter at most {max_cards_num} cards to '
+                                   f'throw (separated by spaces): ')
 
+            # out of time: 'PASS'
+            if user_input is None:
+                break
             if user_input == 'PASS':
                 print(f'{self.name} does not want to or have no suitable cards to throw.')
                 break
             else:
-                # remove duplicates if exist
-                user_input = set(user_input.split())
+                # parse all cards at once
+                try:
+                    # remove duplicates if exist
+                    user_cards = set(Card.convert_many(user_input, self.hand.trump_suit or ''))
+                except ValueError:
+                    print('Specified card not found. Try again.')
+                    continue
 
-                if len(user_input) > max_cards_num:
+                if len(user_cards) > max_cards_num:
                     print(f'Number of cards thrown cannot exceed {max_cards_num}. Try again.')
                 # empty input
-                elif not user_input:
+                elif not user_cards:
                     print('Send \'PASS\' if you do not to or have '
                           'not suitable cards to throw. Try again.')
                     continue
                 # proper number of cards
                 else:
-                    for card in user_input:
+                    for card in user_cards:
                         player_card = self.find_card(card)
 
                         if player_card:
@@ -211,7 +302,7 @@ class Player:
                                       f'on a table. Try again.\n')
                                 break
                         else:
-                            print(f'Specified card {player_card!s} not found. Try again.')
+                            print(f'Specified card {card!s} not found. Try again.')
                             break
                     # valid user input (all cards found in player's hand)
                     else:
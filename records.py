@@ -0,0 +1,71 @@
+"""Write and read records of games: one result of a game (see
+duplicate.play_game) per line in JSON format. A result can include actions
+of players (see ActionRecorder)."""
+
+
+from __future__ import annotations
+import json
+from pathlib import Path
+from typing import Iterator
+
+from events import Event, EventType
+
+
+# types of actions by their indices in records
+ACTIONS = (EventType.ATTACK, EventType.DEFEND, EventType.PASS, EventType.TRANSFER,
+           EventType.THROW, EventType.PICKUP)
+_ACTION_INDICES = {type_: index for index, type_ in enumerate(ACTIONS)}
+
+
+class ActionRecorder:
+    """Collect actions of players in a game from its events (see
+    FoolCardGame.events): a row per card played (a round, a name of a
+    player, an index of an action type in ACTIONS, a code of a card). A
+    'PASS' and a pickup are a single row with no card (-1)."""
+
+    def __init__(self) -> None:
+        self.rows: list[tuple[int, str, int, int]] = []
+
+    def update(self, events: list[Event]) -> None:
+        for event in events:
+            action = _ACTION_INDICES.get(event.type)
+            if action is None:
+                continue
+            if event.type is EventType.PASS or event.type is EventType.PICKUP:
+                self.rows.append((event.round, event.player.name, action, -1))
+            else:
+                for card in event.cards:
+                    self.rows.append((event.round, event.player.name, action, card.code))
+
+    def actions(self, seated: list[str]) -> list[list[int]]:
+        """Rows with seats instead of names (names of players by seats)"""
+        seats = {name: seat for seat, name in enumerate(seated)}
+        return [[round_, seats[name], action, code] for round_, name, action, code in self.rows]
+
+
+class RecordWriter:
+    """Append results of games to a records file"""
+
+    def __init__(self, path: str | Path) -> None:
+        self.path = Path(path)
+        self._file = open(self.path, 'a')
+
+    def write(self, result: dict) -> None:
+        self._file.write(json.dumps(result) + '\n')
+
+    def close(self) -> None:
+        self._file.close()
+
+    def __enter__(self) -> RecordWriter:
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+
+def read_records(path: str | Path) -> Iterator[dict]:
+    """Read results of games one by one"""
+    with open(path) as file:
+        for line in file:
+            if line.strip():
+                yield json.loads(line)
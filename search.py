@@ -0,0 +1,310 @@
+"""Define a bot, which searches for moves with Monte Carlo simulations and
+ponders (keeps searching) in a background thread while other players think.
+
+A bot tracks cards (see CardTracker) and moves of a current round. A
+simulation deals unseen cards randomly (consistently with what the bot
+knows), replays the round in the engine (see engine.State), plays moves of
+other players randomly up to a bot's decision, tries one of its moves and
+plays the game out randomly. Statistics of moves are kept by decisions
+(public information and bot's cards), thus simulations made while pondering
+are reused when a game reaches one of those decisions. The first attack of
+a game can be taken from an opening book (see book.OpeningBook) instead.
+"""
+
+
+from __future__ import annotations
+import copy
+import random
+import threading
+import time
+from typing import TYPE_CHECKING
+
+from card import Card
+from drawable import Table
+from engine import OVER, PASS, THROW, TRANSFER, State
+from events import Event, EventType
+from hand import mask_of
+from player import Player
+from tracker import CardTracker
+
+if TYPE_CHECKING:
+    from book import OpeningBook
+    from game import FoolCardGame
+
+
+# attempts to deal unseen cards consistently with a round before a bot gives
+# up searching and makes a default move
+POSITION_ATTEMPTS = 10
+
+
+class SearchBot(Player):
+    """A bot, which chooses moves with the lowest fool rate in simulations."""
+
+    __slots__ = ('think_time', 'simulations', 'ponder', 'book', '_rng', '_game', '_tracker', '_round',
+                 '_names', '_moves', '_played', '_stats', '_pending', '_thread', '_stop')
+
+    def __init__(self, name: str, think_time: float = 0.1, simulations: int = 1000,
+                 ponder: bool = True, seed: int | None = None,
+                 book: OpeningBook | None = None) -> None:
+        """
+        :param think_time: max time of a search for a move in seconds (less
+        if bot's clock has less time left).
+        :param simulations: max number of simulations for a move (pondering
+        included).
+        :param ponder: search in a background thread while other players think.
+        :param seed: a seed for random simulations.
+        :param book: an opening book, which is consulted for the first attack
+        of a game before searching.
+        """
+        super().__init__(name)
+        self.think_time = think_time
+        self.simulations = simulations
+        self.ponder = ponder
+        self.book = book
+        self._rng = random.Random(seed)
+        self._game: FoolCardGame | None = None
+        self._tracker: CardTracker | None = None
+        self._thread: threading.Thread | None = None
+        self._stop = threading.Event()
+
+    def join(self, game: FoolCardGame) -> None:
+        # a bot can play several games (see FoolCardGame.reset)
+        self._stop_pondering()
+        self._game = game
+        self._tracker = CardTracker(self.name, [player.name for player in game.players])
+
+        # a current round: names of players in order, moves (type of a move,
+        # a seat, a move in the engine) and cards put on a table by seats
+        self._round = 0
+        self._names: list[str] = []
+        self._moves: list[tuple[EventType, int, int]] = []
+        self._played: list[int] = []
+        # moves statistics (losses, simulations) by decisions
+        self._stats: dict[tuple, dict[int, list[int]]] = {}
+        # a defend move decided when the game asked for a transfer
+        self._pending: int | None = None
+
+        game.events.unsubscribe(self._observe)
+        game.events.subscribe(self._observe)
+
+    # following a game
+
+    def _observe(self, events: list[Event]) -> None:
+        # the game changes, a pondered position is outdated
+        self._stop_pondering()
+        self._tracker.update(events)
+
+        for event in events:
+            if event.type is EventType.PICKUP or event.type is EventType.CLEAR:
+                # the round is over, players will be reordered
+                self._names = []
+            if event.type not in (EventType.ATTACK, EventType.DEFEND, EventType.PASS,
+                                  EventType.TRANSFER, EventType.THROW):
+                continue
+
+            if event.round != self._round:
+                # players are not reordered during a round
+                self._round = event.round
+                self._names = [player.name for player in self._game.players]
+                self._moves.clear()
+                self._played = [0] * len(self._names)
+                self._stats.clear()
+
+            seat = self._names.index(event.player.name)
+            mask = mask_of(card.code for card in event.cards)
+            self._played[seat] |= mask
+            if event.type is EventType.THROW:
+                move = mask
+            elif event.type is EventType.PASS:
+                move = PASS
+            elif event.type is EventType.TRANSFER:
+                move = TRANSFER + mask.bit_length() - 1
+            else:
+                move = mask.bit_length() - 1
+            self._moves.append((event.type, seat, move))
+
+        # ponder only in the middle of a round
+        if self.ponder and self and self._names:
+            self._start_pondering()
+
+    def _snapshot(self) -> tuple:
+        """Information for simulations, which does not change with a game"""
+        game = self._game
+        if self._names and self._round == game.round:
+            names, moves, played = self._names, tuple(self._moves), tuple(self._played)
+        else:
+            # nobody moved in a round yet
+            names = [player.name for player in game.players]
+            moves, played = (), (0,) * len(names)
+        return (copy.deepcopy(self._tracker), names, moves, played, self.hand.mask,
+                game.TRUMP, game.CARDS_TO_HAVE, game.MAX_ATTACKS, game.TRANSFER, game.round)
+
+    def _position(self, snapshot: tuple, rng: random.Random, deciding: bool) -> State | None:
+        """A random state of a game consistent with a snapshot, None if a round
+        cannot be replayed with dealt cards"""
+        (tracker, names, moves, played, hand, trump, cards_to_have, max_attacks, transfer,
+         round_) = snapshot
+        opponents, deck = tracker.sample(rng)
+
+        # hands in the beginning of a round
+        hands = [(hand if name == self.name else opponents.get(name, 0)) | played[seat]
+                 for seat, name in enumerate(names)]
+        state = State(hands, bytes(deck), trump, cards_to_have, max_attacks,
+                      trash=tracker.trash, round_=round_ - 1, transfer=transfer)
+
+        for type_, seat, move in moves:
+            # players who did not throw cards are not visible
+            while state.phase == THROW and (type_ is not EventType.THROW or state.to_move != seat):
+                state.apply(0)
+            if state.phase == OVER or state.to_move != seat:
+                return None
+            state.apply(move)
+
+        if deciding:
+            me = names.index(self.name)
+            while state.phase == THROW and state.to_move != me:
+                state.apply(0)
+        return state
+
+    def _simulate(self, snapshot: tuple, rng: random.Random, deciding: bool = False) -> None:
+        """Run a single simulation and update statistics of a decision reached"""
+        state = self._position(snapshot, rng, deciding)
+        if state is None:
+            return
+        me = snapshot[1].index(self.name)
+
+        # other players move randomly up to the bot's decision
+        while state.phase != OVER and state.to_move != me:
+            state.apply(rng.choice(state.legal_moves()))
+        if state.phase == OVER:
+            return
+
+        stats = self._stats.setdefault(self._key(state, me), {})
+        # the least simulated move
+        move = min(state.legal_moves(), key=lambda m: stats.get(m, (0, 0))[1])
+        state.apply(move)
+        while state.phase != OVER:
+            state.apply(rng.choice(state.legal_moves()))
+
+        losses, simulations = stats.setdefault(move, [0, 0])
+        stats[move] = [losses + (state.fool == me), simulations + 1]
+
+    @staticmethod
+    def _key(state: State, me: int) -> tuple:
+        """A decision: public information of a round and bot's cards"""
+        return (state.round, state.phase, tuple(state.order), state.attacker, state.table,
+                state.attack_num, state.hands[me])
+
+    # pondering
+
+    def _ponder(self, snapshot: tuple, rng: random.Random) -> None:
+        for _ in range(self.simulations):
+            if self._stop.is_set():
+                break
+            self._simulate(snapshot, rng)
+
+    def _start_pondering(self) -> None:
+        self._stop.clear()
+        self._thread = threading.Thread(
+            target=self._ponder, args=(self._snapshot(), random.Random(self._rng.getrandbits(32))),
+            daemon=True)
+        self._thread.start()
+
+    def _stop_pondering(self) -> None:
+        if self._thread is not None:
+            self._stop.set()
+            self._thread.join()
+            self._thread = None
+
+    # decisions
+
+    def _decide(self, default: int = PASS) -> int:
+        """Search for a move of the bot (see engine for moves).
+
+        :param default: a move if a round cannot be replayed with dealt cards
+        (see Player for moves of a player out of time).
+        """
+        self._stop_pondering()
+        if self.clock is not None:
+            self.clock.start()
+
+        try:
+            snapshot = self._snapshot()
+            for _ in range(POSITION_ATTEMPTS):
+                state = self._position(snapshot, self._rng, deciding=True)
+                if state is not None:
+                    break
+            else:
+                return default
+            moves = state.legal_moves()
+            if len(moves) == 1:
+                return moves[0]
+
+            think_time = self.think_time
+            if self.clock is not None:
+                # leave time for the rest of moves
+                think_time = min(think_time, self.clock.left() / 10)
+            deadline = time.monotonic() + think_time
+
+            stats = self._stats.setdefault(self._key(state, snapshot[1].index(self.name)), {})
+            while sum(simulations for _, simulations in stats.values()) < self.simulations \
+                    and time.monotonic() < deadline:
+                self._simulate(snapshot, self._rng, deciding=True)
+
+            # the lowest fool rate (moves without simulations are the worst)
+            def fool_rate(move: int) -> float:
+                losses, simulations = stats.get(move, (1, 1))
+                return (losses + 1) / (simulations + 2)
+
+            return min(moves, key=fool_rate)
+        finally:
+            if self.clock is not None:
+                self.clock.stop()
+
+    def attack(self, table: Table, defender: Player) -> Card | None:
+        if not self:
+            return None
+        if self.book is not None:
+            card = self.book.attack(self._game, self)
+            if card is not None:
+                self.hand.remove(card)
+                return card
+        # out of time: 'PASS' or the lowest card in the first attack
+        default = PASS
+        if not table:
+            default = (self.hand.lowest() or self.hand.lowest(trumps=True)).code
+        move = self._decide(default)
+        if move == PASS:
+            return None
+        card, = self.hand.of_mask(1 << move)
+        self.hand.remove(card)
+        return card
+
+    def defend(self, attack_card: Card) -> Card | None:
+        if self._pending is not None:
+            move, self._pending = self._pending, None
+        else:
+            move = self._decide()
+        if move == PASS:
+            return None
+        card, = self.hand.of_mask(1 << move)
+        self.hand.remove(card)
+        return card
+
+    def transfer(self, attack_card: Card, defender: Player) -> Card | None:
+        # a single decision of the engine: transfer, defend or 'PASS'
+        move = self._decide()
+        if move < TRANSFER:
+            self._pending = move
+            return None
+        card, = self.hand.of_mask(1 << (move - TRANSFER))
+        self.hand.remove(card)
+        return card
+
+    def throw_cards(self, table: Table, max_cards_num: int) -> list[Card]:
+        if not self:
+            return []
+        cards = self.hand.of_mask(self._decide(default=0))
+        for card in cards:
+            self.hand.remove(card)
+        return cards
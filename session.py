@@ -0,0 +1,54 @@
+"""Play a series of games of the same players (e.g. a match or a simulation).
+
+A session creates a single game: players join (human players are asked for
+their names) and instructions are printed once. Every next game resets the
+previous one (see FoolCardGame.reset), thus players, a deck and a table are
+reused and a new game costs a shuffle.
+"""
+
+
+from __future__ import annotations
+from typing import Iterator, Sequence
+
+from game import FoolCardGame
+from player import Player
+
+
+class Session:
+    def __init__(self, players: list[Player] | None = None, **options) -> None:
+        """
+        :param players: players of all games (see FoolCardGame).
+        :param options: other arguments of FoolCardGame, which are the same
+        for all games (cards_to_have, max_attacks, observers, time_control,
+        transfer).
+        """
+        self._players = players
+        self._options = options
+        self.game: FoolCardGame | None = None
+        # number of games played and lost by players
+        self.games = 0
+        self.fools: dict[str, int] = {}
+
+    def play(self, seed: int | None = None, trump: str | None = None,
+             deck_order: Sequence[str] | None = None,
+             seats: Sequence[int] | None = None) -> Player | None:
+        """Play the next game and return a fool (see FoolCardGame.reset for
+        parameters)"""
+        if self.game is None:
+            self.game = FoolCardGame(players=self._players, seed=seed, trump=trump,
+                                     deck_order=deck_order, seats=seats, **self._options)
+        else:
+            self.game.reset(seed, trump, deck_order, seats, shuffle=self._players is None)
+        self.game.play()
+
+        self.games += 1
+        fool = self.game.fool
+        if fool is not None:
+            self.fools[fool.name] = self.fools.get(fool.name, 0) + 1
+        return fool
+
+    def play_many(self, games: int, seed: int | None = None) -> Iterator[Player | None]:
+        """Play games with consecutive seeds (random if seed is not specified)
+        and yield fools"""
+        for i in range(games):
+            yield self.play(None if seed is None else seed + i)
@@ -0,0 +1,254 @@
+"""Collect statistics of many games with constant memory.
+
+A GameRecorder observes events of a single game and summarizes it, a
+StatsAggregator consumes summaries of any number of games (as they are
+played or read from a records file) and produces a report.
+
+Usage example:
+    python stats.py records.jsonl
+"""
+
+
+from __future__ import annotations
+import argparse
+import math
+
+from events import Event, EventType
+from records import read_records
+
+
+class RunningStats:
+    """Online count, mean, variance, min and max (Welford's algorithm)"""
+
+    __slots__ = ('count', 'mean', '_m2', 'min', 'max')
+
+    def __init__(self) -> None:
+        self.count = 0
+        self.mean = 0.0
+        self._m2 = 0.0
+        self.min = math.inf
+        self.max = -math.inf
+
+    def add(self, value: float) -> None:
+        self.count += 1
+        delta = value - self.mean
+        self.mean += delta / self.count
+        self._m2 += delta * (value - self.mean)
+        self.min = min(self.min, value)
+        self.max = max(self.max, value)
+
+    @property
+    def variance(self) -> float:
+        """Sample variance"""
+        return self._m2 / (self.count - 1) if self.count > 1 else 0.0
+
+    @property
+    def stdev(self) -> float:
+        return math.sqrt(self.variance)
+
+
+class Histogram:
+    """Counts of integer values, values above a limit are counted in the last
+    bin. Memory is bounded by the limit, quantiles are exact for values not
+    exceeding it (game metrics, e.g. number of rounds, are small integers)."""
+
+    __slots__ = ('counts', 'total')
+
+    def __init__(self, limit: int = 1000) -> None:
+        self.counts = [0] * (limit + 1)
+        self.total = 0
+
+    def add(self, value: int) -> None:
+        self.counts[min(max(value, 0), len(self.counts) - 1)] += 1
+        self.total += 1
+
+    def quantile(self, q: float) -> int | None:
+        """The smallest value, which is not less than a q share of values"""
+        if not self.total:
+            return None
+        rank = max(math.ceil(q * self.total), 1)
+        cumulative = 0
+        for value, count in enumerate(self.counts):
+            cumulative += count
+            if cumulative >= rank:
+                return value
+
+    def __iter__(self):
+        """Values and their counts (only values which occurred)"""
+        return ((value, count) for value, count in enumerate(self.counts) if count)
+
+
+class GameRecorder:
+    """Summarize a single game from its events (see FoolCardGame.events).
+
+    The throw phase fills the attack limit of a round, if a defender got as
+    many attack cards as the limit allows: min(max_attacks, cards in
+    defender's hand in the beginning of a round)."""
+
+    def __init__(self, max_attacks: int = 6) -> None:
+        self.MAX_ATTACKS = max_attacks
+        self.rounds = 0
+        self.fool: str | None = None
+        self.first_attacker: str | None = None
+        # numbers of cards picked up by defenders
+        self.pickups: list[int] = []
+        # rounds with the throw phase and those of them which filled the limit
+        self.throw_phases = 0
+        self.full_throws = 0
+
+        self._sizes: dict[str, int] = {}
+        # attack cards and cards defended in a current round
+        self._attacks = 0
+        self._defended = 0
+
+    def update(self, events: list[Event]) -> None:
+        for event in events:
+            type_ = event.type
+            name = None if event.player is None else event.player.name
+            cards_num = len(event.cards)
+
+            if event.round != self.rounds:
+                self.rounds = event.round
+                self._attacks = self._defended = 0
+
+            if type_ is EventType.DEAL:
+                self._sizes[name] = self._sizes.get(name, 0) + cards_num
+            # a transfer card is an attack card for the next defender
+            elif type_ in (EventType.ATTACK, EventType.TRANSFER, EventType.THROW):
+                if self.first_attacker is None:
+                    self.first_attacker = name
+                self._sizes[name] -= cards_num
+                self._attacks += cards_num
+            elif type_ is EventType.DEFEND:
+                self._sizes[name] -= cards_num
+                self._defended += cards_num
+            elif type_ is EventType.PICKUP:
+                # defender's cards in the beginning of a round
+                limit = min(self.MAX_ATTACKS, self._sizes[name] + self._defended)
+                self._sizes[name] += cards_num
+                self.pickups.append(cards_num)
+                self.throw_phases += 1
+                self.full_throws += self._attacks == limit
+            elif type_ is EventType.GAME_OVER:
+                self.fool = name
+
+    def summary(self) -> dict:
+        return {
+            'rounds': self.rounds,
+            'fool': self.fool,
+            'first_attacker': self.first_attacker,
+            'pickups': self.pickups,
+            'throw_phases': self.throw_phases,
+            'full_throws': self.full_throws,
+        }
+
+
+class StatsAggregator:
+    """Aggregate results of games (see duplicate.play_game) with constant memory"""
+
+    def __init__(self) -> None:
+        self.games = 0
+        self.draws = 0
+        self.rounds = RunningStats()
+        self.rounds_histogram = Histogram()
+        self.pickups = RunningStats()
+        self.pickups_histogram = Histogram(100)
+        self.throw_phases = 0
+        self.full_throws = 0
+        # games where the first attacker is known, and it is a fool
+        self.first_attacker_games = 0
+        self.first_attacker_fools = 0
+        # games and fools by number of players, then by seat
+        self.seat_games: dict[int, int] = {}
+        self.seat_fools: dict[int, list[int]] = {}
+
+    def add(self, result: dict) -> None:
+        """Take into account a result of a single game"""
+        self.games += 1
+        self.rounds.add(result['rounds'])
+        self.rounds_histogram.add(result['rounds'])
+
+        for cards_num in result.get('pickups', ()):
+            self.pickups.add(cards_num)
+            self.pickups_histogram.add(cards_num)
+        self.throw_phases += result.get('throw_phases', 0)
+        self.full_throws += result.get('full_throws', 0)
+
+        fool_seat = result['fool_seat']
+        if fool_seat is None:
+            self.draws += 1
+
+        if result.get('first_attacker_seat') is not None:
+            self.first_attacker_games += 1
+            self.first_attacker_fools += fool_seat == result['first_attacker_seat']
+
+        players_num = len(result['seats'])
+        self.seat_games[players_num] = self.seat_games.get(players_num, 0) + 1
+        fools = self.seat_fools.setdefault(players_num, [0] * players_num)
+        if fool_seat is not None:
+            fools[fool_seat] += 1
+
+    def summary(self) -> dict:
+        def share(part: int, total: int) -> float | None:
+            return part / total if total else None
+
+        return {
+            'games': self.games,
+            'draws': share(self.draws, self.games),
+            'rounds': {
+                'mean': self.rounds.mean, 'stdev': self.rounds.stdev,
+                'min': self.rounds.min, 'max': self.rounds.max,
+                **{f'p{q}': self.rounds_histogram.quantile(q / 100) for q in (50, 90, 99)},
+            },
+            'pickups': {
+                'mean': self.pickups.mean, 'stdev': self.pickups.stdev,
+                **{f'p{q}': self.pickups_histogram.quantile(q / 100) for q in (50, 90, 99)},
+            },
+            'full_throws': share(self.full_throws, self.throw_phases),
+            'first_attacker_fool_rate': share(self.first_attacker_fools,
+                                              self.first_attacker_games),
+            'seat_fool_rates': {
+                players_num: [share(fools, self.seat_games[players_num]) for fools in seat_fools]
+                for players_num, seat_fools in self.seat_fools.items()
+            },
+        }
+
+    def report(self) -> str:
+        """A human-readable report"""
+        summary = self.summary()
+        rounds, pickups = summary['rounds'], summary['pickups']
+
+        def fmt(value) -> str:
+            return '-' if value is None else f'{value:.3f}'
+
+        lines = [
+            f'games: {summary["games"]}, draws: {fmt(summary["draws"])}',
+            f'rounds: mean {rounds["mean"]:.2f}, stdev {rounds["stdev"]:.2f}, '
+            f'min {rounds["min"]}, max {rounds["max"]}, '
+            f'p50 {rounds["p50"]}, p90 {rounds["p90"]}, p99 {rounds["p99"]}',
+            f'cards picked up by defenders: mean {pickups["mean"]:.2f}, '
+            f'stdev {pickups["stdev"]:.2f}, p50 {pickups["p50"]}, p90 {pickups["p90"]}, '
+            f'p99 {pickups["p99"]}',
+            f'throw phases filling the attack limit: {fmt(summary["full_throws"])}',
+            f'fool rate of the first attacker: {fmt(summary["first_attacker_fool_rate"])}',
+        ]
+        for players_num, rates in sorted(summary['seat_fool_rates'].items()):
+            lines.append(f'fool rates by seat ({players_num} players): '
+                         f'{", ".join(fmt(rate) for rate in rates)}')
+        return '\n'.join(lines)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description='Report statistics of recorded games.')
+    parser.add_argument('records', nargs='+', help='records files (see records.py)')
+    args = parser.parse_args()
+
+    aggregator = StatsAggregator()
+    for path in args.records:
+        for result in read_records(path):
+            aggregator.add(result)
+    print(aggregator.report())
+
+
+if __name__ == '__main__':
+    main()
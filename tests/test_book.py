@@ -0,0 +1,106 @@
+import contextlib
+import os
+
+import pytest
+
+from book import OpeningBook, build, canonical, evaluate_deal
+from card import Card
+from events import EventType
+from game import FoolCardGame
+from hand import mask_of
+from player import Player
+from search import SearchBot
+
+
+def mask(cards, trump):
+    return mask_of(card.code for card in Card.convert_many(cards, trump))
+
+
+class TestCanonical:
+    @pytest.mark.parametrize('first, second, same', [
+        # other suits are interchangeable
+        (('6S 7S AD', 'Hearts'), ('6C 7C AD', 'Hearts'), True),
+        (('6S 7S AD', 'Hearts'), ('6D 7D AS', 'Hearts'), True),
+        # positions are relative to a trump suit
+        (('6S 7S AD', 'Hearts'), ('6S 7S AH', 'Diamonds'), True),
+        (('6S 7S AD', 'Hearts'), ('6S 7S AD', 'Diamonds'), False),
+        (('6S 7S AD', 'Hearts'), ('6S 8S AD', 'Hearts'), False),
+    ])
+    def test_key(self, first, second, same):
+        assert (canonical(mask(*first), first[1])[0]
+                == canonical(mask(*second), second[1])[0]) == same, 'Wrong canonical position!'
+
+
+class TestOpeningBook:
+    def test_lookup(self, tmp_path):
+        """An attack of a position is translated into suits of a hand"""
+        hand = mask('6S 7S AD', 'Hearts')
+        key, suits = canonical(hand, 'Hearts')
+        path = tmp_path / 'book.bin'
+        # the ace of the first non-trump suit
+        ace = len(Card.RANKS) + Card.RANK_CODES['A']
+        OpeningBook.write(path, {key - 1: 0, key: ace, key + 1: 0}, players=2)
+
+        with OpeningBook(path) as book:
+            assert len(book) == 3, 'Wrong number of positions!'
+            assert book.lookup(hand, 'Hearts') == Card.CODES['AD'], 'Wrong attack!'
+            # the same position with other suits
+            assert book.lookup(mask('6C 7C AS', 'Diamonds'), 'Diamonds') == Card.CODES['AS'], \
+                'Wrong attack of an equivalent position!'
+            assert book.lookup(mask('6H 7C AS', 'Hearts'), 'Hearts') is None, \
+                'A position is not in the book!'
+
+    @pytest.mark.parametrize('size', [0, 5, 30, -1])
+    def test_corrupt_file(self, tmp_path, size):
+        """Empty, truncated files and files of wrong formats are rejected"""
+        path = tmp_path / 'book.bin'
+        OpeningBook.write(path, {1: 0, 2: 0, 3: 0}, players=2)
+        data = path.read_bytes()
+        path.write_bytes(b'not a book' * 10 if size == -1 else data[:size])
+        with pytest.raises(ValueError):
+            OpeningBook(path)
+
+    def test_build(self, tmp_path):
+        path = tmp_path / 'book.bin'
+        positions = build(path, deals=5, simulations=3, seed=1, workers=1, transfer=True)
+        assert 0 < positions <= 5, 'Wrong number of positions!'
+        with OpeningBook(path) as book:
+            assert (len(book), book.players, book.transfer) == (positions, 2, True), \
+                'Wrong header of the book!'
+
+    @pytest.mark.parametrize('players_num', [2, 4])
+    def test_evaluate_deal(self, players_num):
+        """Every card of the first attacker is played out on every simulation"""
+        with open(os.devnull, 'w') as devnull, contextlib.redirect_stdout(devnull):
+            game = FoolCardGame(players=[Player(f'player_{seat}') for seat in range(players_num)],
+                                seed=1)
+        key, stats = evaluate_deal(1, players_num, simulations=4)
+
+        assert key == canonical(game.players[0].hand.mask, game.TRUMP)[0], 'Wrong position!'
+        assert len(stats) == len(game.players[0]), 'Every card should be tried!'
+        assert all(playouts == 4 for _, playouts in stats.values()), 'Wrong number of playouts!'
+
+    def test_search_bot(self, tmp_path):
+        """A search bot takes the first attack from a book"""
+        players = [SearchBot(f'search_{i}', think_time=0.01, simulations=10, seed=i)
+                   for i in range(2)]
+        events = []
+        with open(os.devnull, 'w') as devnull, contextlib.redirect_stdout(devnull):
+            game = FoolCardGame(players=players, seed=1, observers=[events.extend])
+            attacker = game.players[0]
+            # the highest card, which a search rarely chooses
+            expected = max(attacker.hand,
+                           key=lambda card: (card.trump, Card.RANK_CODES[card.rank]))
+            key, suits = canonical(attacker.hand.mask, game.TRUMP)
+            move = suits.index(expected.suit) * len(Card.RANKS) + Card.RANK_CODES[expected.rank]
+            path = tmp_path / 'book.bin'
+            OpeningBook.write(path, {key: move}, players=2)
+
+            with OpeningBook(path) as book:
+                for player in players:
+                    player.book = book
+                game.play()
+
+        attack = next(event for event in events if event.type is EventType.ATTACK)
+        assert (attack.player, attack.cards) == (attacker, (expected,)), \
+            'The first attack should be taken from the book!'
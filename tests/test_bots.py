@@ -0,0 +1,103 @@
+import pytest
+
+from bots import HeuristicBot, RandomBot, parse_policies
+from card import Card
+from drawable import Table
+from duplicate import compare
+
+
+def make_bot(hand: str, trump: str = 'Hearts', **params) -> HeuristicBot:
+    bot = HeuristicBot('BOT', **params)
+    bot.hand = Card.convert_many(hand, trump)
+    return bot
+
+
+def make_table(cards: str, trump: str = 'Hearts') -> Table:
+    table = Table()
+    [table.add_card(card) for card in Card.convert_many(cards, trump)]
+    return table
+
+
+class TestHeuristicBot:
+    @pytest.mark.parametrize('hand, table, params, expected', [
+        # the first attack: the lowest non-trump card, a trump card if there is no other
+        ('6H 7S 7C AD', '', {}, '7S'),
+        ('6H AH', '', {}, '6H'),
+        # continue an attack
+        ('6H 7S 7C AD', '7D 8D', {}, '7S'),
+        ('6H 7S 7C AD', '6D 8D', {}, None),
+        ('6H 7S 7C AD', '6D 8D', {'attack_trumps': True}, '6H'),
+        ('6H 7S 7C AD', 'AS KS', {'max_attack_rank': 'K'}, None),
+    ])
+    def test_attack(self, hand, table, params, expected):
+        bot = make_bot(hand, **params)
+        cards_num = len(bot.hand)
+        attack_card = bot.attack(make_table(table), None)
+        assert attack_card == (Card.convert(expected, 'Hearts') if expected else None), \
+            'Wrong attack card!'
+        assert len(bot.hand) == cards_num - (attack_card is not None), 'Wrong number of cards left!'
+
+    @pytest.mark.parametrize('hand, attack_card, params, expected', [
+        ('6H 7S 9S AD', '8S', {}, '9S'),
+        ('6H 7S 9S AD', 'KD', {}, 'AD'),
+        ('6H 7S 9S AD', '8C', {}, '6H'),
+        ('6H 7S 9S AD', '8C', {'defend_trumps': False}, None),
+        ('6H 7S 9S AD', '7H', {}, None),
+    ])
+    def test_defend(self, hand, attack_card, params, expected):
+        bot = make_bot(hand, **params)
+        defend_card = bot.defend(Card.convert(attack_card, 'Hearts'))
+        assert defend_card == (Card.convert(expected, 'Hearts') if expected else None), \
+            'Wrong defend card!'
+
+    @pytest.mark.parametrize('hand, attack_card, expected', [
+        ('6H 7S 7C AD', '7D', '7S'),
+        # trump cards are kept to defend
+        ('7H 9S AD', '7D', None),
+    ])
+    def test_transfer(self, hand, attack_card, expected):
+        bot = make_bot(hand)
+        transfer_card = bot.transfer(Card.convert(attack_card, 'Hearts'), None)
+        assert transfer_card == (Card.convert(expected, 'Hearts') if expected else None), \
+            'Wrong transfer card!'
+
+    @pytest.mark.parametrize('throw_policy, max_cards_num, expected', [
+        ('all', 5, '6S 6H 9C 9H'),
+        ('all', 2, '6S 6H'),
+        ('non_trump', 5, '6S 9C'),
+        ('none', 5, ''),
+    ])
+    def test_throw_cards(self, throw_policy, max_cards_num, expected):
+        bot = make_bot('6S 6H 9C 9H AD', throw_policy=throw_policy)
+        cards = bot.throw_cards(make_table('6D 9D'), max_cards_num)
+        assert sorted(map(str, cards)) == sorted(map(str, Card.convert_many(expected, 'Hearts'))), \
+            'Wrong cards were thrown!'
+
+    @pytest.mark.parametrize('params', [{'throw_policy': 'some'}, {'max_attack_rank': '1'}])
+    def test___init___fail(self, params):
+        with pytest.raises(ValueError):
+            HeuristicBot('BOT', **params)
+
+    def test_grid(self):
+        grid = HeuristicBot.grid(throw_policy=('all', 'none'), attack_trumps=(True,))
+        assert sorted(grid) == ['heuristic[throw_policy=all,attack_trumps=True]',
+                                'heuristic[throw_policy=none,attack_trumps=True]']
+        bot = grid['heuristic[throw_policy=none,attack_trumps=True]']('BOT')
+        assert bot.throw_policy == 'none' and bot.attack_trumps and bot.defend_trumps, \
+            'Wrong parameters of a bot!'
+
+    def test_strength(self):
+        """A heuristic bot loses much less often than a random one"""
+        report = compare({'heuristic': HeuristicBot, 'random': RandomBot}, deals=30, seed=1)
+        mean, low, high = report['differences']['heuristic', 'random']
+        assert high < 0, 'Heuristic bot should play better than a random one!'
+
+
+class TestParsePolicies:
+    def test_aliases(self):
+        assert parse_policies(['a=random', 'b=random', 'heuristic']) == \
+               {'a': RandomBot, 'b': RandomBot, 'heuristic': HeuristicBot}, 'Wrong policies!'
+
+    def test_unknown(self):
+        with pytest.raises(ValueError):
+            parse_policies(['a=unknown'])
@@ -7,8 +7,9 @@ class TestCard:
     def test___init__(self):
         """Correct args -> correct Card instance"""
         card = Card('A', 'Spades', True)
-        assert card.__dict__ == {'rank': 'A', 'suit': 'Spades', 'trump': True}, \
-            'Wrong card creation!'
+        assert (card.rank, card.suit, card.trump, card.code) == \
+               ('A', 'Spades', True, Card.CODES['AS']), 'Wrong card creation!'
+        assert not hasattr(card, '__dict__'), 'Card should not have __dict__!'
 
     def test___init_fail(self):
         """Incorrect args, either rank or suit -> ValueError"""
@@ -27,6 +28,39 @@ class TestCard:
         # s: string representation of a card
         assert Card.convert(s, trump) == card, 'Wrong card conversion!'
 
+    @pytest.mark.parametrize('s', ['', 'A', '1S', 'AX', 'SA', '10'])
+    def test_convert_fail(self, s):
+        """Not a card -> ValueError"""
+        with pytest.raises(ValueError):
+            Card.convert(s, 'Spades')
+
+    def test_convert_many(self):
+        cards = Card.convert_many(' 10C  AS\t6H ', 'hearts')
+        assert cards == [Card('10', 'Clubs', False), Card('A', 'Spades', False),
+                         Card('6', 'Hearts', True)], 'Wrong cards conversion!'
+        assert [card.trump for card in cards] == [False, False, True], 'Wrong trump cards!'
+
+    def test_convert_many_fail(self):
+        with pytest.raises(ValueError) as exc_info:
+            Card.convert_many('10C 1S AS', 'Hearts')
+        assert '1S is not a card' in str(exc_info), 'Wrong card reported!'
+
+    def test_lookup(self):
+        """Cards are created once per trump suit"""
+        assert Card.convert('AS', 'Spades') is Card.lookup('Spades')['AS'], \
+            'Cards should not be created on every conversion!'
+        assert len(Card.lookup('Clubs')) == len(Card.RANKS) * len(Card.SUITS), \
+            'Lookup should contain an entire deck!'
+
+    def test_code(self):
+        """Codes of cards are ordered by suits, then by ranks"""
+        cards = sorted(Card.lookup('Spades').values(), key=lambda card: card.code)
+        assert [card.code for card in cards] == list(range(len(cards)))
+        assert [(card.suit, card.rank) for card in cards] == sorted(
+            ((card.suit, card.rank) for card in cards),
+            key=lambda sr: (Card.SUITS.index(sr[0]), Card.RANKS.index(sr[1]))), \
+            'Wrong order of codes!'
+
     def test_equal_suit(self):
         """For 2 cards with equal suits method should return True"""
         c1 = Card('7', 'Spades', True)
@@ -48,6 +82,11 @@ class TestCard:
         c = Card('A', 'Spades', True)
         assert c == card, f'{c!s} and {card!s} should be identical!'
 
+    @pytest.mark.parametrize('other', ['KS', 'XX', [], None, 1])
+    def test___eq___different(self, other):
+        """A card is not equal to other cards and objects of other types"""
+        assert Card('A', 'Spades', True) != other, f'A card should not be equal to {other!r}!'
+
     @pytest.mark.parametrize('smaller, greater', [
         (Card('7', 'Spades', True), Card('A', 'Spades', True)),
         (Card('7', 'Hearts', False), Card('A', 'Hearts', False)),
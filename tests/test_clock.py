@@ -0,0 +1,89 @@
+import contextlib
+import os
+import threading
+import time
+from unittest import mock
+
+import pytest
+
+import clock
+from bots import HeuristicBot
+from card import Card
+from clock import Clock
+from drawable import Table
+from game import FoolCardGame
+from player import Player
+
+
+class TestClock:
+    def test_stop(self):
+        """Time spent on a move is subtracted, an increment is added"""
+        player_clock = Clock(10, increment=2)
+        player_clock.start()
+        time.sleep(0.05)
+        assert player_clock.left() < 10, 'A running clock should count time!'
+        elapsed = player_clock.stop()
+        assert player_clock.remaining == pytest.approx(12 - elapsed), 'Wrong time left!'
+
+    def test_expired(self):
+        player_clock = Clock(0.01)
+        player_clock.start()
+        time.sleep(0.02)
+        assert player_clock.expired, 'A clock should expire!'
+        player_clock.stop()
+        assert player_clock.remaining == 0, 'Time left should not be negative!'
+
+    @pytest.mark.parametrize('limit, increment', [(-1, 0), (1, -1)])
+    def test_wrong_time(self, limit, increment):
+        with pytest.raises(ValueError):
+            Clock(limit, increment)
+
+    def test_game(self):
+        """A game gives players clocks with a specified time control"""
+        game = FoolCardGame(players=[HeuristicBot('first'), HeuristicBot('second')], seed=1,
+                            time_control=(60, 1))
+        assert all(player.clock.remaining == 60 and player.clock.increment == 1
+                   for player in game.players), 'Players should get clocks!'
+
+
+class TestTimeout:
+    @pytest.fixture
+    def blocked_input(self):
+        """Input, which is entered only after a test (a line 'PASS')"""
+        release = threading.Event()
+
+        def slow_input(prompt):
+            release.wait()
+            return 'PASS'
+
+        with mock.patch('player.input', side_effect=slow_input):
+            yield
+            release.set()
+            clock._reader.join()
+        # the late line is left for the next prompt
+        assert clock._lines.get_nowait() == 'PASS', 'A late line should go to the next prompt!'
+
+    @pytest.mark.parametrize('table, expected', [((), '6H'), (('7S',), None)])
+    def test_attack(self, blocked_input, table, expected):
+        """An attacker who is out of time passes or attacks with the lowest card"""
+        trump = 'Spades'
+        player = Player('PLAYER')
+        player.hand = [Card.convert(card, trump) for card in ('7S', '6H', 'AD')]
+        player.clock = Clock(0.05)
+        _table = Table(trump)
+        [_table.add_card(Card.convert(card, trump)) for card in table]
+
+        with open(os.devnull, 'w') as devnull, contextlib.redirect_stdout(devnull):
+            attack_card = player.attack(_table, Player('DEFENDER'))
+
+        assert attack_card == expected if expected else attack_card is None, 'Wrong default move!'
+        assert player.clock.expired, 'The clock should run out!'
+
+    def test_defend(self, blocked_input):
+        player = Player('PLAYER')
+        player.hand = [Card.convert('7H', 'Spades')]
+        player.clock = Clock(0.05)
+
+        with open(os.devnull, 'w') as devnull, contextlib.redirect_stdout(devnull):
+            assert player.defend(Card.convert('6H', 'Spades')) is None, 'Defender should pass!'
+        assert len(player.hand) == 1, 'No cards should be removed from defender\'s hand!'
@@ -34,6 +34,7 @@ class TestTable:
         table.add_card(card)
         assert table.card_ranks == {card.rank} and table.cards == [card], \
             'A card was put on the table improperly!'
+        assert table.mask == 1 << card.code, 'Wrong bitset of cards on the table!'
 
     def test__cleanup(self, table_and_card):
         table, _ = table_and_card
@@ -0,0 +1,90 @@
+import random
+
+import pytest
+
+from bots import RandomBot
+from drawable import Deck
+from duplicate import Deal, compare, confidence_interval, play_deal, play_game
+from events import EventType
+from game import FoolCardGame
+from records import ACTIONS
+
+
+class TestDeal:
+    def test_random(self):
+        """A random deal is a complete deck, the same for the same seed"""
+        deal = Deal.random(random.Random(1))
+        assert len(Deck(deal.trump, deal.order)) == len(Deck(deal.trump)), 'Incomplete deck!'
+        assert repr(deal) == repr(Deal.random(random.Random(1))), 'Deals are not reproducible!'
+
+    def test_game(self):
+        """Players get cards from the top of a specified deck in their seats"""
+        deal = Deal.random(random.Random(1))
+        players = [RandomBot('first'), RandomBot('second')]
+        game = FoolCardGame(players=players, trump=deal.trump,
+                            deck_order=deal.order, seats=(1, 0))
+
+        hands = {player.name: {str(card) for card in player.hand} for player in game.players}
+        top = [str(card) for card in Deck(deal.trump, deal.order)[:12]]
+        assert game.TRUMP == deal.trump, 'Wrong trump suit!'
+        assert hands == {'second': set(top[:6]), 'first': set(top[6:])}, 'Wrong cards dealt!'
+
+    @pytest.mark.parametrize('seats', [(0, 0), (0, 1, 2), (1,)])
+    def test_game_wrong_seats(self, seats):
+        with pytest.raises(ValueError):
+            FoolCardGame(players=[RandomBot('first'), RandomBot('second')], seats=seats)
+
+    @pytest.mark.parametrize('order', [['AS'] * 36, ['AS', '6S']])
+    def test_deck_wrong_order(self, order):
+        with pytest.raises(ValueError):
+            Deck('Spades', order)
+
+
+def test_play_game():
+    """A result describes seating of policies and a fool"""
+    result = play_game([RandomBot, RandomBot], ['a', 'b'], seed=1)
+    assert result['seats'] == ['a', 'b'], 'Wrong seating!'
+    assert result['fool'] in ('a', 'b', None), 'Wrong fool!'
+    assert result['rounds'] > 0, 'Game was not played!'
+
+
+def test_play_game_actions():
+    """Actions start with the first attack, a pickup is an action of a defender"""
+    result = play_game([RandomBot, RandomBot], ['a', 'b'], seed=1, actions=True)
+    actions = result['actions']
+    assert actions[0][:3] == [1, result['first_attacker_seat'], ACTIONS.index(EventType.ATTACK)], \
+        'The first action should be the first attack!'
+    pickups = [action for action in actions if action[2] == ACTIONS.index(EventType.PICKUP)]
+    assert len(pickups) == len(result['pickups']), 'Wrong number of pickups!'
+    assert 'actions' not in play_game([RandomBot, RandomBot], ['a', 'b'], seed=1), \
+        'Actions should be included on demand!'
+
+
+def test_play_deal():
+    """Each permutation of policies among seats is played"""
+    results = play_deal([RandomBot] * 3, ['a', 'b', 'c'], Deal.random(random.Random(1)))
+    assert sorted(tuple(result['seats']) for result in results) == sorted(
+        [('a', 'b', 'c'), ('a', 'c', 'b'), ('b', 'a', 'c'),
+         ('b', 'c', 'a'), ('c', 'a', 'b'), ('c', 'b', 'a')]), 'Wrong seatings!'
+
+
+@pytest.mark.parametrize('seed', range(5))
+def test_play_deal_reproducible(seed):
+    """Random bots get seeds from a deal, thus a deal is replayed identically"""
+    deal = Deal.random(random.Random(seed))
+    assert play_deal([RandomBot] * 2, ['a', 'b'], deal) == \
+           play_deal([RandomBot] * 2, ['a', 'b'], deal), 'Deal results are not reproducible!'
+
+
+def test_confidence_interval():
+    mean, low, high = confidence_interval([0, 1] * 50)
+    assert mean == 0.5 and low == pytest.approx(0.5 - 1.96 * 0.5025 / 10, abs=1e-3) \
+        and high == pytest.approx(1 - low), 'Wrong confidence interval!'
+
+
+def test_compare():
+    report = compare({'a': RandomBot, 'b': RandomBot}, deals=10, seed=1)
+    mean_a, mean_b = report['fool_rates']['a'][0], report['fool_rates']['b'][0]
+    assert report['games'] == 20, 'Wrong number of games!'
+    assert report['differences']['a', 'b'][0] == pytest.approx(mean_a - mean_b), \
+        'Wrong paired difference!'
@@ -0,0 +1,161 @@
+import contextlib
+import copy
+import os
+import random
+
+import pytest
+
+from card import Card
+from engine import ATTACK, DEFEND, OVER, PASS, THROW, TRANSFER, State, perft
+from game import FoolCardGame
+from player import Player
+
+
+def deal(players_num, seed, transfer=False):
+    with open(os.devnull, 'w') as devnull, contextlib.redirect_stdout(devnull):
+        return FoolCardGame(players=[Player(f'player_{seat}') for seat in range(players_num)],
+                            seed=seed, transfer=transfer)
+
+
+class LockstepPlayer(Player):
+    """A player, who makes random legal moves of an engine state and checks
+    that a game asks the same player as the engine does"""
+
+    def __init__(self, name, seat, context):
+        super().__init__(name)
+        self.seat = seat
+        self.context = context
+        # a defend move chosen when the game asked for a transfer
+        self.pending = None
+
+    def _move(self, phase, options):
+        state, rng = self.context['state'], self.context['rng']
+        assert state.phase == phase, f'Engine phase {state.phase} instead of {phase}!'
+        assert state.to_move == self.seat, f'Engine asks {state.to_move} instead of {self.seat}!'
+        moves = state.legal_moves()
+        assert sorted(moves) == sorted(options), 'Engine moves differ from game options!'
+        move = rng.choice(moves)
+        state.apply(move)
+        return move
+
+    def attack(self, table, defender):
+        if not self:
+            return None
+        options = [card.code for card in self.hand if not table or card.rank in table.card_ranks]
+        move = self._move(ATTACK, options + [PASS] * bool(table))
+        return None if move == PASS else self._take(move)
+
+    def defend(self, attack_card):
+        if self.pending is not None:
+            move, self.pending = self.pending, None
+        else:
+            options = [card.code for card in self.hand.beating(attack_card)]
+            move = self._move(DEFEND, options + [PASS])
+        return None if move == PASS else self._take(move)
+
+    def transfer(self, attack_card, defender):
+        """The engine has a single decision of a defender: transfer, defend or pass"""
+        options = [card.code for card in self.hand.beating(attack_card)] + [PASS]
+        options += [TRANSFER + card.code for card in self.hand.of_ranks((attack_card.rank,))]
+        move = self._move(DEFEND, options)
+        if move >= TRANSFER:
+            return self._take(move - TRANSFER)
+        self.pending = move
+        return None
+
+    def throw_cards(self, table, max_cards_num):
+        if not self:
+            return []
+        matching = self.hand.mask & table.ranks_mask
+        # all submasks of matching cards up to the limit
+        options, subset = [0], matching
+        while subset:
+            if subset.bit_count() <= max_cards_num:
+                options.append(subset)
+            subset = (subset - 1) & matching
+        move = self._move(THROW, options)
+        return [self._take(code) for code in range(move.bit_length()) if move >> code & 1]
+
+    def _take(self, code):
+        """Remove a card from a hand by its code"""
+        card = next(card for card in self.hand if card.code == code)
+        self.hand.remove(card)
+        return card
+
+
+class TestState:
+    def test_small_position(self):
+        """An attack with the only card: defend (nobody is a fool) or pass (a fool)"""
+        state = State([1 << Card.CODES['6H'], 1 << Card.CODES['7H']], b'', 'Spades')
+        assert state.legal_moves() == [Card.CODES['6H']]
+        state.apply(Card.CODES['6H'])
+        assert state.legal_moves() == [Card.CODES['7H'], PASS]
+
+        state.apply(Card.CODES['7H'])
+        assert (state.phase, state.fool) == (OVER, None), 'Nobody should be a fool!'
+        state.undo()
+        state.apply(PASS)
+        assert (state.phase, state.fool) == (OVER, 1), 'The defender should be a fool!'
+        assert [perft(state, depth) for depth in range(1, 4)] == [1, 1, 1]
+
+    def test_transfer_position(self):
+        """A defender transfers an attack back to the attacker, who has to beat both cards"""
+        codes = Card.CODES
+        state = State([1 << codes['6H'] | 1 << codes['7S'] | 1 << codes['8S'],
+                       1 << codes['6D'] | 1 << codes['AH']], b'', 'Spades', transfer=True)
+        state.apply(codes['6H'])
+        assert sorted(state.legal_moves()) == sorted([codes['AH'], PASS, TRANSFER + codes['6D']])
+
+        state.apply(TRANSFER + codes['6D'])
+        assert (state.phase, state.defender, state.unbeaten) == \
+            (DEFEND, 0, (codes['6H'], codes['6D'])), 'The attacker should defend!'
+        # no transfer back: the next defender has too few cards
+        assert sorted(state.legal_moves()) == sorted([codes['7S'], codes['8S'], PASS])
+        state.apply(codes['7S'])
+        assert (state.phase, state.unbeaten) == (DEFEND, (codes['6D'],)), 'A card is unbeaten!'
+        assert state.legal_moves() == [codes['8S'], PASS]
+        state.apply(codes['8S'])
+        assert (state.phase, state.fool) == (OVER, 1), 'A player with a card left should be a fool!'
+
+    @pytest.mark.parametrize('players_num, seed, transfer, counts', [
+        (2, 1, False, [6, 25, 41, 199, 441, 892, 3854, 9584]),
+        (2, 2, False, [6, 21, 23, 134, 389, 574, 2962, 9050]),
+        (3, 1, False, [6, 10, 12, 25, 100, 325, 596, 1796]),
+        (3, 2, False, [6, 23, 36, 82, 294, 663, 1603, 3487]),
+        (2, 1, True, [6, 29, 50, 210, 573, 1292, 4787, 14053]),
+        (2, 2, True, [6, 23, 31, 152, 500, 973, 3920, 12889]),
+        (3, 1, True, [6, 15, 36, 96, 259, 772, 2121, 6250]),
+        (3, 2, True, [6, 24, 41, 87, 302, 781, 2024, 4996]),
+    ])
+    def test_perft(self, players_num, seed, transfer, counts):
+        state = State.from_game(deal(players_num, seed, transfer))
+        assert [perft(state, depth) for depth in range(1, len(counts) + 1)] == counts, \
+            'Wrong number of move sequences!'
+
+    @pytest.mark.parametrize('transfer', [False, True])
+    def test_undo(self, transfer):
+        state = State.from_game(deal(2, 1, transfer))
+        before = [copy.copy(getattr(state, attr)) for attr in State.__slots__]
+        perft(state, 6)
+        assert [getattr(state, attr) for attr in State.__slots__] == before, \
+            'State should be restored after perft!'
+
+    @pytest.mark.parametrize('transfer', [False, True])
+    @pytest.mark.parametrize('players_num', [2, 3, 4])
+    @pytest.mark.parametrize('seed', range(10))
+    def test_game_lockstep(self, players_num, seed, transfer):
+        """The engine asks the same players with the same options as a game"""
+        context = {'rng': random.Random(seed)}
+        players = [LockstepPlayer(f'player_{seat}', seat, context) for seat in range(players_num)]
+
+        with open(os.devnull, 'w') as devnull, contextlib.redirect_stdout(devnull):
+            game = FoolCardGame(players=players, seed=seed, transfer=transfer)
+            for seat, player in enumerate(game.players):
+                player.seat = seat
+            context['state'] = state = State.from_game(game)
+            game.play()
+
+        assert state.phase == OVER, 'The engine game should be over!'
+        assert state.round == game.round, 'Wrong number of rounds!'
+        fool = None if game.fool is None else game.fool.seat
+        assert state.fool == fool, 'Wrong fool!'
@@ -0,0 +1,101 @@
+from unittest import mock
+
+import pytest
+
+from bots import HeuristicBot
+from config import CONFIG
+from events import Event, EventStream, EventType
+from game import FoolCardGame
+from tracker import CardTracker
+
+
+@pytest.fixture(scope='function', params=[False, True], ids=['classic', 'transfer'])
+def game(request):
+    return FoolCardGame(players=[HeuristicBot('first'), HeuristicBot('second'),
+                                 HeuristicBot('third')], seed=1, transfer=request.param)
+
+
+class TestEventStream:
+    @pytest.mark.parametrize('batch_size, batches', [(1, [1, 1, 1]), (2, [2, 1]), (5, [3])])
+    def test_batches(self, batch_size, batches):
+        """Events are delivered in batches, the rest ones - when a game is over"""
+        observer = mock.Mock()
+        stream = EventStream()
+        stream.subscribe(observer, batch_size)
+
+        for event_type in (EventType.ATTACK, EventType.DEFEND, EventType.GAME_OVER):
+            stream.emit(Event(event_type, 1))
+        assert [len(call.args[0]) for call in observer.call_args_list] == batches, \
+            'Wrong batches of events!'
+
+    def test_unsubscribe(self):
+        observer = mock.Mock()
+        stream = EventStream()
+        stream.subscribe(observer)
+        stream.unsubscribe(observer)
+
+        assert not stream, 'Stream should have no observers!'
+        stream.emit(Event(EventType.ATTACK, 1))
+        observer.assert_not_called()
+
+    def test_game(self):
+        """A game emits events from the deal to the end"""
+        events = []
+        game = FoolCardGame(players=[HeuristicBot('first'), HeuristicBot('second')],
+                            seed=1, observers=[events.extend])
+        game.play()
+
+        assert [event.type for event in events[:2]] == [EventType.DEAL] * 2, 'No deal events!'
+        assert events[-1] == Event(EventType.GAME_OVER, game.round, game.fool), \
+            'The last event should be game over!'
+        # every card was either beaten or is in hands of a fool
+        cleared = sum(len(event.cards) for event in events if event.type is EventType.CLEAR)
+        fool_cards = 0 if game.fool is None else len(game.fool)
+        assert cleared + fool_cards == CONFIG['DECK_SIZE'], 'Some cards are lost!'
+
+    @pytest.mark.parametrize('transfer', [False, True])
+    @pytest.mark.parametrize('seed', range(10))
+    def test_pass(self, seed, transfer):
+        """Only players who have cards send 'PASS'"""
+        sizes = {}
+
+        def observer(events):
+            for event in events:
+                name = None if event.player is None else event.player.name
+                if event.type in (EventType.DEAL, EventType.PICKUP):
+                    sizes[name] = sizes.get(name, 0) + len(event.cards)
+                elif event.type in (EventType.ATTACK, EventType.DEFEND, EventType.TRANSFER,
+                                    EventType.THROW):
+                    sizes[name] -= len(event.cards)
+                elif event.type is EventType.PASS:
+                    assert sizes[name] > 0, f'{name} has no cards, but sent PASS!'
+
+        FoolCardGame(players=[HeuristicBot('first'), HeuristicBot('second'),
+                              HeuristicBot('third')], seed=seed, observers=[observer],
+                     transfer=transfer).play()
+
+
+def test_tracker(game):
+    """A card tracker fed with events knows own hand and sizes of opponents'
+    hands, their cards are always possible, and known exactly when a deck is
+    empty and a single opponent has cards"""
+    me, *opponents = game.players
+    tracker = CardTracker(me.name, [player.name for player in game.players])
+    game.events.subscribe(tracker.update)
+
+    # the deal happened before subscription, take it into account manually
+    tracker.on_draw(me.name, len(me), me.hand)
+    for player in opponents:
+        tracker.on_draw(player.name, len(player))
+
+    while len(game.players) > 1:
+        game._play_round()
+        assert tracker.hand == me.hand.mask, 'Wrong own hand!'
+        for player in opponents:
+            assert tracker.sizes[player.name] == len(player), 'Wrong size of a hand!'
+            assert tracker.possible(player.name) & player.hand.mask == \
+                   player.hand.mask, 'Cards of an opponent are not possible!'
+        if not game.deck and sum(bool(player) for player in opponents) == 1:
+            for player in opponents:
+                assert tracker.possible(player.name) == player.hand.mask, \
+                    'Cards of the last opponent should be known exactly!'
@@ -0,0 +1,86 @@
+import pytest
+
+from bots import HeuristicBot, RandomBot
+from duplicate import compare
+from export import ColumnarWriter, export_records, iter_shards, load, load_metadata
+from records import RecordWriter
+
+
+@pytest.fixture(scope='module')
+def results():
+    results = []
+    compare({'random': RandomBot, 'heuristic': HeuristicBot}, 5, seed=1,
+            on_result=results.append, actions=True)
+    return results
+
+
+class TestColumnarWriter:
+    @pytest.mark.parametrize('format', ['npy', 'csv'])
+    def test_load(self, tmp_path, results, format):
+        """Rows of games and actions are loaded as they were written"""
+        with ColumnarWriter(tmp_path, format, chunk_rows=100) as writer:
+            [writer.write(result) for result in results]
+
+        games = load(tmp_path, 'games')
+        assert list(games['game']) == list(range(len(results))), 'Wrong games!'
+        assert list(games['rounds']) == [result['rounds'] for result in results], 'Wrong rounds!'
+        assert list(games['fool_seat']) == [-1 if result['fool_seat'] is None
+                                            else result['fool_seat'] for result in results], \
+            'Wrong fools!'
+
+        actions = load(tmp_path, 'actions')
+        rows = [(game, *action) for game, result in enumerate(results)
+                for action in result['actions']]
+        assert list(zip(actions['game'], actions['round'], actions['seat'], actions['action'],
+                        actions['card'])) == rows, 'Wrong actions!'
+        assert all(outcome == (seat == games['fool_seat'][game]) for game, seat, outcome
+                   in zip(actions['game'], actions['seat'], actions['outcome'])), \
+            'Wrong outcomes!'
+
+        shards = load_metadata(tmp_path)['shards']
+        assert shards['actions'] == len(list(iter_shards(tmp_path, 'actions'))) > 1, \
+            'Actions should be written in chunks!'
+
+    def test_continue(self, tmp_path, results):
+        """An export is continued with new games"""
+        for result in results:
+            with ColumnarWriter(tmp_path, 'csv') as writer:
+                writer.write(result)
+
+        metadata = load_metadata(tmp_path)
+        assert metadata['games'] == metadata['shards']['games'] == len(results), \
+            'Games should be appended!'
+        assert metadata['policies'] == ['random', 'heuristic'], 'Wrong policies!'
+        assert list(load(tmp_path, 'games')['game']) == list(range(len(results))), \
+            'Wrong numbers of games!'
+        with pytest.raises(ValueError):
+            ColumnarWriter(tmp_path, 'npy')
+
+    def test_records(self, tmp_path, results):
+        """Records are exported as results of games"""
+        with RecordWriter(tmp_path / 'records.jsonl') as writer:
+            [writer.write(result) for result in results]
+        assert export_records(tmp_path / 'records.jsonl', tmp_path / 'records') == len(results)
+
+        with ColumnarWriter(tmp_path / 'results') as writer:
+            [writer.write(result) for result in results]
+        for table in ('games', 'actions'):
+            expected = load(tmp_path / 'results', table)
+            assert {column: list(values)
+                    for column, values in load(tmp_path / 'records', table).items()} == \
+                   {column: list(values) for column, values in expected.items()}, \
+                f'Wrong {table} of records!'
+
+    def test_numpy(self, tmp_path, results):
+        """.npy shards are read by NumPy"""
+        np = pytest.importorskip('numpy')
+        with ColumnarWriter(tmp_path) as writer:
+            [writer.write(result) for result in results]
+
+        rounds = np.load(tmp_path / 'games-00000' / 'rounds.npy')
+        assert rounds.tolist() == [result['rounds'] for result in results], 'Wrong rounds!'
+
+    @pytest.mark.parametrize('params', [{'format': 'parquet'}, {'chunk_rows': 0}])
+    def test_wrong_parameters(self, tmp_path, params):
+        with pytest.raises(ValueError):
+            ColumnarWriter(tmp_path, **params)
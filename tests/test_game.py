@@ -0,0 +1,69 @@
+import contextlib
+import gc
+import os
+import tracemalloc
+
+import pytest
+
+from bots import HeuristicBot, RandomBot
+from config import CONFIG
+from drawable import Deck, Table
+from events import EventType
+from game import FoolCardGame
+from hand import Hand
+from player import Player
+
+
+class TestFoolCardGame:
+    @pytest.mark.parametrize('obj', [
+        Deck('Spades'), Table(), Hand(), Player('PLAYER'), HeuristicBot('BOT'),
+        FoolCardGame(players=[HeuristicBot('first'), HeuristicBot('second')], seed=1),
+    ])
+    def test_slots(self, obj):
+        assert not hasattr(obj, '__dict__'), f'{obj.__class__.__name__} should not have __dict__!'
+
+    def test_memory(self):
+        """An in-progress game (2 players after 2 rounds) takes less than 1 KB"""
+        games_num = 200
+
+        def start_game(seed):
+            game = FoolCardGame(players=[HeuristicBot('first'), HeuristicBot('second')], seed=seed)
+            for _ in range(2):
+                game._play_round()
+            return game
+
+        with open(os.devnull, 'w') as devnull, contextlib.redirect_stdout(devnull):
+            # shared objects (e.g. Card objects) are created by the first game
+            start_game(0)
+            gc.collect()
+            tracemalloc.start()
+            try:
+                before = tracemalloc.get_traced_memory()[0]
+                games = [start_game(seed) for seed in range(games_num)]
+                gc.collect()
+                after = tracemalloc.get_traced_memory()[0]
+            finally:
+                tracemalloc.stop()
+
+        assert all(len(game.players) == 2 for game in games), 'Games should be in progress!'
+        assert (after - before) / games_num < 1024, 'A game takes too much memory!'
+
+    @pytest.mark.parametrize('transfer', [False, True])
+    def test_transfer(self, transfer):
+        """Attacks are transferred only in the transfer variant, a transfer
+        card is beaten or picked up by the next defender"""
+        transfers = 0
+        for seed in range(20):
+            events = []
+            with open(os.devnull, 'w') as devnull, contextlib.redirect_stdout(devnull):
+                game = FoolCardGame(players=[RandomBot(f'random_{i}', seed=seed * 3 + i)
+                                             for i in range(3)],
+                                    seed=seed, observers=[events.extend], transfer=transfer)
+                game.play()
+
+            transfers += sum(event.type is EventType.TRANSFER for event in events)
+            cleared = sum(len(event.cards) for event in events if event.type is EventType.CLEAR)
+            fool_cards = 0 if game.fool is None else len(game.fool)
+            assert cleared + fool_cards == CONFIG['DECK_SIZE'], 'Some cards are lost!'
+
+        assert bool(transfers) == transfer, 'Wrong transfers for the rules!'
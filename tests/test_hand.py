@@ -0,0 +1,65 @@
+import pytest
+
+from card import Card
+from hand import Hand
+
+
+def cards(s: str, trump: str = 'Hearts') -> list[Card]:
+    return Card.convert_many(s, trump)
+
+
+class TestHand:
+    def test___iter__(self):
+        """Cards are grouped by suits (trump suit is the last one) and sorted by ranks"""
+        hand = Hand(cards('AH 6D 10S 7H 6S KD'))
+        assert list(hand) == cards('6S 10S 6D KD 7H AH'), 'Wrong order of cards!'
+        assert len(hand) == 6, 'Wrong number of cards!'
+
+    def test_add_remove(self):
+        hand = Hand()
+        hand += cards('AS 7H')
+        hand.remove(Card('A', 'Spades', False))
+        assert list(hand) == cards('7H') and hand.trump_suit == 'Hearts', \
+            'Cards were added or removed improperly!'
+        with pytest.raises(ValueError):
+            hand.remove(Card('A', 'Spades', False))
+
+    @pytest.mark.parametrize('card, expected', [
+        ('AS', Card('A', 'Spades', False)), (Card('A', 'Spades', False), Card('A', 'Spades', False)),
+        ('7H', Card('7', 'Hearts', True)), ('6S', None), ('not a card', None),
+    ])
+    def test_find(self, card, expected):
+        found = Hand(cards('AS 7H')).find(card)
+        assert found == expected if expected is not None else found is None, 'Wrong card was found!'
+        if found is not None:
+            assert found.trump == expected.trump, 'Trump suit of a card was lost!'
+
+    def test_of_suit_of_ranks(self):
+        hand = Hand(cards('AH 6D 10S 7H 6S KD'))
+        assert hand.of_suit('Diamonds') == cards('6D KD'), 'Wrong cards of a suit!'
+        assert hand.of_ranks({'6', 'A'}) == cards('6S 6D AH'), 'Wrong cards of ranks!'
+        assert hand.of_ranks(set()) == [], 'No ranks -> no cards!'
+
+    @pytest.mark.parametrize('hand, card, beating', [
+        ('AH 6D 10S 7H 6S KD', '9S', '10S 7H AH'),
+        ('AH 6D 10S 7H 6S KD', '6H', '7H AH'),
+        ('AH 6D 10S 7H 6S KD', 'AH', ''),
+        ('6D 10S 6S KD', '9C', ''),
+    ])
+    def test_beating(self, hand, card, beating):
+        hand, card = Hand(cards(hand)), Card.convert(card, 'Hearts')
+        assert hand.beating(card) == cards(beating), 'Wrong beating cards!'
+        assert hand.lowest_beating(card) == (cards(beating) or [None])[0], \
+            'Wrong lowest beating card!'
+        assert all(c > card for c in hand.beating(card)), 'Cards cannot beat the card!'
+
+    @pytest.mark.parametrize('hand, lowest, lowest_trump', [
+        ('AH 6H 10S KD', Card('10', 'Spades', False), Card('6', 'Hearts', True)),
+        ('AH 6H', None, Card('6', 'Hearts', True)),
+        ('10S 7C', Card('7', 'Clubs', False), None),
+    ])
+    def test_lowest(self, hand, lowest, lowest_trump):
+        hand = Hand(cards(hand))
+        assert hand.lowest() == lowest if lowest else hand.lowest() is None, 'Wrong lowest card!'
+        assert hand.lowest_trump() == lowest_trump if lowest_trump else hand.lowest_trump() is None, \
+            'Wrong lowest trump card!'
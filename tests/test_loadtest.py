@@ -0,0 +1,53 @@
+import asyncio
+import random
+
+import pytest
+
+from loadtest import QueueConnection, ramp, run_client, run_load
+
+
+class TestLoadTest:
+    @pytest.mark.parametrize('transport', ['memory', 'tcp'])
+    @pytest.mark.parametrize('players_num', [2, 3])
+    def test_run_load(self, transport, players_num):
+        """Games of all tables are played to the end through prompts"""
+        report = run_load(4, players_num, transport, seed=1)
+        assert (report['games'], report['failures']) == (4, 0), 'Wrong number of games!'
+        # at least names and first attacks of all players
+        assert report['prompts'] > 4 * players_num, 'Too few prompts!'
+        assert 0 < report['p50'] <= report['p99'], 'Wrong latency percentiles!'
+        assert report['memory_per_table'] > 0, 'Memory is not measured!'
+
+    @pytest.mark.parametrize('transport', ['memory', 'tcp'])
+    def test_drop(self, transport):
+        """A client, which disconnects in the middle of a game, fails its
+        table, other tables are played to the end"""
+        report = run_load(3, 2, transport, seed=1, trace_memory=False, drops=1)
+        assert (report['games'], report['failures']) == (2, 1), 'A dropped table is not counted!'
+
+    def test_ramp(self):
+        reports = ramp([1, 2], trace_memory=False)
+        assert [report['tables'] for report in reports] == [1, 2], 'Wrong concurrency levels!'
+        assert all(report['memory_per_table'] is None for report in reports), \
+            'Memory should not be measured!'
+
+    def test_wrong_transport(self):
+        with pytest.raises(ValueError):
+            run_load(1, transport='udp')
+
+    def test_client(self):
+        """A client sends its name, cards of its hand or 'PASS'"""
+        async def play():
+            connection = QueueConnection()
+            client = asyncio.create_task(run_client(connection, 'client', random.Random(1)))
+            replies = [await connection.ask({'prompt': 'name', 'hand': None})]
+            replies += [await connection.ask({'prompt': 'attack', 'hand': ['6H', 'AS']})
+                        for _ in range(10)]
+            replies.append(await connection.ask({'prompt': 'throw', 'hand': []}))
+            await connection.close()
+            return replies, await client
+
+        replies, replies_num = asyncio.run(play())
+        assert replies[0] == 'client' and replies[-1] == 'PASS', 'Wrong replies!'
+        assert set(replies[1:-1]) <= {'6H', 'AS', 'PASS'}, 'A card is not from a hand!'
+        assert replies_num == len(replies), 'Wrong number of replies!'
@@ -0,0 +1,87 @@
+import contextlib
+import os
+
+import pytest
+
+np = pytest.importorskip('numpy')
+
+from bots import HeuristicBot
+from card import Card
+from config import CONFIG
+from game import FoolCardGame
+from network import (FEATURES, OUTPUTS, BatchEvaluator, Network, NetworkBot, encode,
+                     play_concurrently)
+
+
+def make_games(network, seeds, **options):
+    with open(os.devnull, 'w') as devnull, contextlib.redirect_stdout(devnull):
+        return [FoolCardGame(players=[NetworkBot('network', network), HeuristicBot('heuristic')],
+                             seed=seed, **options) for seed in seeds]
+
+
+class TestNetwork:
+    def test_encode(self):
+        game, = make_games(Network.random(seed=1), [1])
+        bot = next(player for player in game.players if player.name == 'network')
+        card = Card.convert('6H', game.TRUMP)
+        features = encode(game, bot, 'defend', card)
+
+        assert features.shape == (FEATURES,), 'Wrong number of features!'
+        deck_size = CONFIG['DECK_SIZE']
+        assert sum(features[:deck_size]) == len(bot), 'Own hand is not encoded!'
+        assert features[3 * deck_size + card.code] == 1, 'A card to beat is not encoded!'
+
+    def test_save_load(self, tmp_path):
+        network = Network.random(hidden=(16, 8), seed=1)
+        path = tmp_path / 'weights.npz'
+        network.save(path)
+        loaded = Network.load(path)
+
+        features = np.random.default_rng(1).random((3, FEATURES), dtype=np.float32)
+        for expected, actual in zip(network.forward(features), loaded.forward(features)):
+            assert np.allclose(expected, actual), 'Loaded network gives other outputs!'
+
+    @pytest.mark.parametrize('shapes', [
+        [(FEATURES + 1, OUTPUTS)],
+        [(FEATURES, 16), (16, OUTPUTS - 1)],
+    ])
+    def test_wrong_shapes(self, shapes):
+        with pytest.raises(ValueError):
+            Network([np.zeros(shape) for shape in shapes],
+                    [np.zeros(shape[1]) for shape in shapes])
+
+    @pytest.mark.parametrize('transfer', [False, True])
+    def test_game(self, transfer):
+        """A network bot plays games to the end"""
+        games = make_games(Network.random(seed=1), range(5), transfer=transfer)
+        with open(os.devnull, 'w') as devnull, contextlib.redirect_stdout(devnull):
+            for game in games:
+                game.play()
+        assert all(len(game.players) < 2 for game in games), 'Games should be over!'
+
+
+class TestBatchEvaluator:
+    def test_batches(self):
+        """Decisions of concurrent games are evaluated in batches, moves are
+        the same as in games played one by one"""
+        network = Network.random(seed=1)
+        seeds = range(16)
+
+        games = make_games(network, seeds)
+        with open(os.devnull, 'w') as devnull, contextlib.redirect_stdout(devnull):
+            for game in games:
+                game.play()
+        expected = [None if game.fool is None else game.fool.name for game in games]
+
+        evaluator = BatchEvaluator(network, max_batch=8)
+        games = make_games(evaluator, seeds)
+        with open(os.devnull, 'w') as devnull, contextlib.redirect_stdout(devnull):
+            fools = play_concurrently(games, evaluator)
+
+        assert [None if fool is None else fool.name for fool in fools] == expected, \
+            'Batched evaluation changed moves!'
+        assert evaluator.evaluated / evaluator.batches > 1, 'Decisions were not batched!'
+
+    def test_wrong_parameters(self):
+        with pytest.raises(ValueError):
+            BatchEvaluator(Network.random(seed=1), max_batch=0)
@@ -175,6 +175,27 @@ class TestPlayer:
             assert len(defender.hand) == initial_cards_num, \
                 'No cards should be removed from defender\'s hand!'
 
+    @pytest.mark.parametrize('user_input, attack_card, hand, expected_card', [
+        (('PASS',), '6S', ['6H', 'AS'], None),
+        (('6H',), '6S', ['6H', 'AS'], '6H'),
+        # a card of another rank, a card not in a hand
+        (('AS', '6D', 'PASS'), '6S', ['6H', 'AS'], None),
+    ])
+    def test_transfer(self, user_input, attack_card, hand, expected_card):
+        """A defender transfers an attack with a card of the same rank or sends 'PASS'"""
+        trump = 'Spades'
+        with mock.patch('player.input', return_value='DEFENDER'):
+            defender = Player()
+            defender.hand = [Card.convert(card, trump) for card in hand]
+
+        with mock.patch('player.input', side_effect=user_input):
+            transfer_card = defender.transfer(Card.convert(attack_card, trump), Player('NEXT'))
+
+        assert transfer_card == (Card.convert(expected_card, trump) if expected_card else None), \
+            'Chosen a wrong card to transfer!'
+        assert len(defender.hand) == len(hand) - (transfer_card is not None), \
+            'Wrong number of cards in defender\'s hand!'
+
     @pytest.mark.parametrize('user_input, table, hand, max_cards_num, expected_cards', [
         (('PASS',), ('6H', '9H', '6S'), ['7S', 'AH'], 2, []),
         (('PASS',), ('6H', '9H', '6S'), ['7S', 'AH'], 2, []),
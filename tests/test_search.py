@@ -0,0 +1,100 @@
+import contextlib
+import os
+import time
+
+import pytest
+
+from bots import HeuristicBot
+from config import CONFIG
+from events import EventType
+from game import FoolCardGame
+from search import SearchBot
+
+
+def play(players, seed, **options):
+    events = []
+    with open(os.devnull, 'w') as devnull, contextlib.redirect_stdout(devnull):
+        game = FoolCardGame(players=players, seed=seed, observers=[events.extend], **options)
+        game.play()
+    return game, events
+
+
+class SlowBot(HeuristicBot):
+    """A bot, which thinks as long as a human, and checks that a search bot
+    ponders meanwhile"""
+
+    def __init__(self, name, bot):
+        super().__init__(name)
+        self.bot = bot
+        self.pondered = []
+
+    def defend(self, attack_card):
+        time.sleep(0.05)
+        # the bot does not search for own moves (think_time=0), thus all
+        # simulations are made while pondering (a bot with no cards is done)
+        if self.bot:
+            self.pondered.append(any(self.bot._stats.values()))
+        return super().defend(attack_card)
+
+
+class TestSearchBot:
+    @pytest.mark.parametrize('transfer', [False, True])
+    @pytest.mark.parametrize('players_num', [2, 3])
+    @pytest.mark.parametrize('seed', range(3))
+    def test_game(self, players_num, seed, transfer):
+        """A search bot plays a game to the end"""
+        players = [SearchBot('search', think_time=0.01, simulations=20, seed=seed)]
+        players += [HeuristicBot(f'heuristic_{i}') for i in range(players_num - 1)]
+        game, events = play(players, seed, transfer=transfer)
+
+        assert events[-1].type is EventType.GAME_OVER, 'Game is not over!'
+        cleared = sum(len(event.cards) for event in events if event.type is EventType.CLEAR)
+        fool_cards = 0 if game.fool is None else len(game.fool)
+        assert cleared + fool_cards == CONFIG['DECK_SIZE'], 'Some cards are lost!'
+        assert players[0]._thread is None, 'Pondering should stop after a game!'
+
+    def test_ponder(self):
+        """A search bot simulates while another player thinks, simulations are
+        reused in its own decisions"""
+        bot = SearchBot('search', think_time=0, simulations=100, seed=1)
+        slow = SlowBot('slow', bot)
+        play([bot, slow], seed=1)
+        assert slow.pondered and all(slow.pondered), 'The bot did not ponder!'
+
+    def test_no_ponder(self):
+        bot = SearchBot('search', think_time=0, simulations=100, ponder=False, seed=1)
+        slow = SlowBot('slow', bot)
+        play([bot, slow], seed=1)
+        assert not any(slow.pondered), 'The bot should not ponder!'
+
+    def test_clock(self):
+        """A search bot does not think longer than its clock allows"""
+        bot = SearchBot('search', think_time=10, simulations=10 ** 6, ponder=False, seed=1)
+        start = time.monotonic()
+        play([bot, HeuristicBot('heuristic')], seed=1, time_control=(0.5, 0))
+        assert time.monotonic() - start < 2, 'The bot thinks too long!'
+        assert not bot.clock.expired, 'The clock should not run out!'
+
+    @pytest.mark.parametrize('transfer', [False, True])
+    def test_no_position(self, monkeypatch, transfer):
+        """A bot, which cannot replay a round, makes default moves: the lowest
+        card in the first attack or 'PASS'"""
+        monkeypatch.setattr(SearchBot, '_position', lambda *args, **kwargs: None)
+        bot = SearchBot('search', think_time=0.01, simulations=20, seed=1)
+        game, events = play([bot, HeuristicBot('heuristic')], seed=1, transfer=transfer)
+
+        assert events[-1].type is EventType.GAME_OVER, 'Game is not over!'
+        moves = {event.type for event in events if event.player is bot}
+        assert EventType.ATTACK in moves, 'The bot should attack!'
+        assert not moves & {EventType.DEFEND, EventType.TRANSFER, EventType.THROW}, \
+            'The bot should only attack and pass!'
+
+    def test_reproducible(self):
+        """Without pondering a seeded bot makes the same moves"""
+        def moves():
+            bot = SearchBot('search', think_time=10, simulations=20, ponder=False, seed=1)
+            events = play([bot, HeuristicBot('heuristic')], seed=2)[1]
+            return [(event.type, getattr(event.player, 'name', None), event.cards)
+                    for event in events]
+
+        assert moves() == moves(), 'Moves are not reproducible!'
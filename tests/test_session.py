@@ -0,0 +1,73 @@
+import contextlib
+import io
+
+import pytest
+
+from bots import HeuristicBot, RandomBot
+from game import FoolCardGame
+from search import SearchBot
+from session import Session
+
+
+def moves(events):
+    """Moves of a game by names of players"""
+    return [(event.type, getattr(event.player, 'name', None), event.cards) for event in events]
+
+
+class TestSession:
+    def test_reset(self):
+        """A reset game is dealt and played as a new game with the same seed"""
+        def new_game(seed):
+            events = []
+            game = FoolCardGame(players=[HeuristicBot('first'), HeuristicBot('second')],
+                                seed=seed, observers=[events.extend])
+            game.play()
+            return events, game.round
+
+        events = []
+        game = FoolCardGame(players=[HeuristicBot('first'), HeuristicBot('second')],
+                            seed=0, observers=[events.extend])
+        game.play()
+        for seed in range(1, 4):
+            events.clear()
+            game.reset(seed)
+            game.play()
+            expected, rounds = new_game(seed)
+            assert moves(events) == moves(expected), 'A reset game differs from a new one!'
+            assert game.round == rounds, 'Wrong number of rounds!'
+
+    def test_reuse(self):
+        """Players, a deck and a table are reused, instructions are printed once"""
+        players = [RandomBot('first', seed=1), RandomBot('second', seed=2)]
+        session = Session(players)
+        output = io.StringIO()
+
+        with contextlib.redirect_stdout(output):
+            fools = [session.play(seed=0)]
+            game, deck, table = session.game, session.game.deck, session.game.table
+            fools += session.play_many(5, seed=1)
+
+        assert session.game is game and game.deck is deck and game.table is table, \
+            'Game objects should be reused!'
+        assert set(game.players + game.watchers) == set(players), 'Players should be reused!'
+        assert output.getvalue().count('GAME INSTRUCTIONS') == 1, \
+            'Instructions should be printed once!'
+        assert session.games == 6, 'Wrong number of games!'
+        assert sum(session.fools.values()) == sum(fool is not None for fool in fools), \
+            'Wrong number of fools!'
+
+    @pytest.mark.parametrize('seats', [(1, 0), None])
+    def test_seats(self, seats):
+        session = Session([HeuristicBot('first'), HeuristicBot('second')])
+        with contextlib.redirect_stdout(io.StringIO()):
+            for seed in range(3):
+                session.play(seed, seats=seats)
+        assert session.games == 3, 'Wrong number of games!'
+
+    def test_search_bot(self):
+        """A search bot follows every game of a session once"""
+        bot = SearchBot('search', think_time=0, simulations=10, seed=1)
+        session = Session([bot, HeuristicBot('heuristic')])
+        with contextlib.redirect_stdout(io.StringIO()):
+            list(session.play_many(3, seed=1))
+        assert len(session.game.events._observers) == 1, 'A bot should observe a game once!'
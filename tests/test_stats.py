@@ -0,0 +1,84 @@
+import random
+import statistics
+
+import pytest
+
+from bots import HeuristicBot, RandomBot
+from duplicate import compare, play_game
+from records import RecordWriter, read_records
+from stats import Histogram, RunningStats, StatsAggregator
+
+
+def test_running_stats():
+    rng = random.Random(1)
+    values = [rng.gauss(10, 3) for _ in range(100)]
+    running = RunningStats()
+    [running.add(value) for value in values]
+
+    assert running.count == 100 and running.mean == pytest.approx(statistics.fmean(values))
+    assert running.stdev == pytest.approx(statistics.stdev(values)), 'Wrong standard deviation!'
+    assert (running.min, running.max) == (min(values), max(values))
+
+
+@pytest.mark.parametrize('q, expected', [(0, 1), (0.5, 5), (0.9, 9), (1, 10)])
+def test_histogram_quantile(q, expected):
+    histogram = Histogram(limit=20)
+    [histogram.add(value) for value in range(1, 11)]
+    assert histogram.quantile(q) == expected, 'Wrong quantile!'
+
+
+def test_histogram_limit():
+    """Values above a limit are counted in the last bin"""
+    histogram = Histogram(limit=5)
+    [histogram.add(value) for value in (1, 7, 100)]
+    assert list(histogram) == [(1, 1), (5, 2)] and histogram.total == 3
+
+
+def test_play_game_summary():
+    """Game summary is consistent with a result of a game"""
+    result = play_game([HeuristicBot, RandomBot], ['h', 'r'], seed=1)
+    assert result['first_attacker_seat'] in (0, 1), 'Wrong first attacker!'
+    assert len(result['pickups']) == result['throw_phases'] <= result['rounds'], \
+        'Each throw phase ends with a pickup!'
+    assert 0 <= result['full_throws'] <= result['throw_phases']
+    assert all(cards_num > 0 for cards_num in result['pickups']), 'Empty pickups!'
+
+
+class TestStatsAggregator:
+    RESULTS = [
+        {'seats': ['a', 'b'], 'fool_seat': 0, 'first_attacker_seat': 0, 'rounds': 10,
+         'pickups': [1, 3], 'throw_phases': 2, 'full_throws': 1},
+        {'seats': ['b', 'a'], 'fool_seat': 0, 'first_attacker_seat': 1, 'rounds': 20,
+         'pickups': [2], 'throw_phases': 1, 'full_throws': 0},
+        {'seats': ['a', 'b', 'c'], 'fool_seat': None, 'first_attacker_seat': 2, 'rounds': 30,
+         'pickups': [], 'throw_phases': 0, 'full_throws': 0},
+    ]
+
+    def test_summary(self):
+        aggregator = StatsAggregator()
+        [aggregator.add(result) for result in self.RESULTS]
+        summary = aggregator.summary()
+
+        assert summary['games'] == 3 and summary['draws'] == pytest.approx(1 / 3)
+        assert summary['rounds']['mean'] == 20 and summary['rounds']['p50'] == 20
+        assert summary['pickups']['mean'] == 2 and summary['full_throws'] == pytest.approx(1 / 3)
+        assert summary['first_attacker_fool_rate'] == pytest.approx(1 / 3)
+        assert summary['seat_fool_rates'] == {2: [1.0, 0.0], 3: [0.0, 0.0, 0.0]}
+        assert 'fool rates by seat (3 players)' in aggregator.report()
+
+    def test_records(self, tmp_path):
+        """Statistics from a records file are the same as from results"""
+        path = tmp_path / 'records.jsonl'
+        with RecordWriter(path) as writer:
+            [writer.write(result) for result in self.RESULTS]
+
+        from_results, from_records = StatsAggregator(), StatsAggregator()
+        [from_results.add(result) for result in self.RESULTS]
+        [from_records.add(result) for result in read_records(path)]
+        assert from_records.summary() == from_results.summary()
+
+
+def test_compare_on_result():
+    aggregator = StatsAggregator()
+    compare({'a': HeuristicBot, 'b': RandomBot}, deals=5, seed=1, on_result=aggregator.add)
+    assert aggregator.games == 10, 'Not all games were aggregated!'
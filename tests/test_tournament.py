@@ -0,0 +1,64 @@
+import pytest
+
+from bots import HeuristicBot, RandomBot
+from tournament import EloRatings, Tournament, play_match
+
+
+class TestEloRatings:
+    @pytest.mark.parametrize('seats, fool', [
+        (['a', 'b'], 'a'), (['a', 'b', 'c'], 'b'), (['a', 'b', 'c'], None),
+    ])
+    def test_update(self, seats, fool):
+        """Ratings are only redistributed among players: a fool loses rating,
+        others (if there is a fool) gain it"""
+        elo = EloRatings()
+        elo.update(seats, fool)
+
+        assert sum(elo[name] for name in seats) == pytest.approx(elo.INITIAL * len(seats)), \
+            'Sum of ratings should not change!'
+        if fool is not None:
+            assert all(elo[name] > elo[fool] for name in seats if name != fool), \
+                'A fool should have the lowest rating!'
+
+
+class TestTournament:
+    def test_play_match(self):
+        """Each policy plays a deal from every seat"""
+        results = play_match([RandomBot] * 3, ['a', 'b', 'c'], seed=1)
+        assert [result['seats'] for result in results] == \
+               [['a', 'b', 'c'], ['b', 'c', 'a'], ['c', 'a', 'b']], 'Wrong seats rotation!'
+
+    def test_round_robin(self):
+        tournament = Tournament({name: RandomBot for name in 'abc'}, deals=2, workers=1)
+        tournament.round_robin((2, 3))
+        # 3 pairs (2 games each) and 1 group of 3 (3 games) per deal
+        assert tournament.games == dict.fromkeys('abc', 2 * (2 * 2 + 3)), \
+            'Wrong number of games played!'
+
+    def test_checkpoint(self, tmp_path):
+        """A tournament resumed from a checkpoint does not replay matches"""
+        checkpoint = tmp_path / 'tournament.json'
+        policies = {name: RandomBot for name in 'ab'}
+
+        tournament = Tournament(policies, deals=2, workers=1, checkpoint=checkpoint)
+        tournament.swiss(rounds=1)
+        resumed = Tournament(policies, deals=2, workers=1, checkpoint=checkpoint)
+        resumed.swiss(rounds=1)
+
+        assert resumed.games == tournament.games == dict.fromkeys('ab', 4)
+        assert resumed.elo.ratings == tournament.elo.ratings
+
+    def test_workers(self):
+        """Ratings do not depend on an order, in which matches finish"""
+        def ratings(workers):
+            tournament = Tournament({name: HeuristicBot for name in 'abc'}, deals=4,
+                                    workers=workers)
+            tournament.round_robin((2,))
+            return tournament.elo.ratings
+
+        assert ratings(1) == ratings(3), 'Ratings depend on a number of workers!'
+
+    def test_register(self):
+        tournament = Tournament({'a': RandomBot})
+        with pytest.raises(ValueError):
+            tournament.register('a', RandomBot)
@@ -0,0 +1,66 @@
+import random
+
+import pytest
+
+from card import Card
+from hand import mask_of
+from tracker import CardTracker
+
+
+@pytest.fixture(scope='function')
+def tracker():
+    """A tracker of 'me' after a deal and an attack of 'bob', which 'me'
+    could not beat ('me' took cards from a table), then 'me' attacked 'ann'
+    who defended, and beaten cards went to trash"""
+    tracker = CardTracker('me', ['me', 'ann', 'bob'])
+    lookup = Card.lookup('Hearts')
+    tracker.on_draw('me', 3, [lookup[card] for card in ('6S', '7S', 'AH')])
+    tracker.on_draw('ann', 3)
+    tracker.on_draw('bob', 3)
+    # bob attacks, me picks up
+    tracker.on_play('bob', lookup['KC'])
+    tracker.on_pickup('me', [lookup['KC']])
+    # me attacks ann, ann defends, bob throws a card, ann picks up
+    tracker.on_play('me', lookup['6S'])
+    tracker.on_play('ann', lookup['8S'])
+    tracker.on_clear([lookup['6S'], lookup['8S']])
+    tracker.on_play('me', lookup['KC'])
+    tracker.on_play('bob', lookup['KD'])
+    tracker.on_pickup('ann', [lookup['KC'], lookup['KD']])
+    return tracker
+
+
+class TestCardTracker:
+    def test_state(self, tracker):
+        lookup = Card.lookup('Hearts')
+        assert tracker.hand == mask_of([lookup['7S'].code, lookup['AH'].code]), 'Wrong own hand!'
+        assert tracker.sizes == {'me': 2, 'ann': 4, 'bob': 1}, 'Wrong sizes of hands!'
+        assert tracker.known['ann'] == mask_of([lookup['KC'].code, lookup['KD'].code]), \
+            'Cards taken from a table should be known!'
+        assert tracker.trash == mask_of([lookup['6S'].code, lookup['8S'].code]), 'Wrong trash!'
+        assert tracker.hidden('ann') == 2 and tracker.hidden('bob') == 1, 'Wrong hidden cards!'
+        # unseen cards are either in a deck or hidden in hands
+        assert tracker.unseen.bit_count() == tracker.deck_size + 2 + 1, 'Lost cards!'
+
+    def test_possible(self, tracker):
+        assert tracker.possible('ann') == tracker.known['ann'] | tracker.unseen
+        assert not tracker.possible('bob') & (tracker.hand | tracker.trash | tracker.known['ann']), \
+            'Seen cards cannot be in a hand of an opponent!'
+
+    def test_sample(self, tracker):
+        """Sampled hands and deck are disjoint, consist of unseen cards and
+        known cards, and have correct sizes"""
+        rng = random.Random(1)
+        for _ in range(100):
+            hands, deck = tracker.sample(rng)
+            assert {player: hand.bit_count() for player, hand in hands.items()} == \
+                   {'ann': 4, 'bob': 1}, 'Wrong sizes of hands!'
+            assert hands['ann'] & tracker.known['ann'] == tracker.known['ann'], \
+                'Known cards are missing!'
+            assert len(deck) == tracker.deck_size, 'Wrong size of a deck!'
+
+            mask = mask_of(deck)
+            assert not hands['ann'] & hands['bob'] and not (hands['ann'] | hands['bob']) & mask, \
+                'Cards are dealt twice!'
+            assert (hands['ann'] | hands['bob'] | mask) == tracker.unseen | tracker.known['ann'], \
+                'Wrong cards are dealt!'
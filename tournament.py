@@ -0,0 +1,257 @@
+"""Tournament entry point: play many games between bots and rate them.
+
+Matches are scheduled either as a round-robin (every group of policies for
+every number of players) or as a Swiss tournament (groups of policies with
+close ratings). Every match is played on duplicate deals: each deal (seed)
+is played once for every rotation of seats, so every policy gets the same
+cards from every seat. Ratings are updated with results in order of
+matches (Elo updates depend on order, thus ratings do not depend on a
+number of workers), and progress is saved to a checkpoint file, which
+allows resuming long tournaments.
+
+Usage example:
+    python tournament.py a=random b=random c=random --players 2 3 --deals 100
+"""
+
+
+from __future__ import annotations
+import argparse
+import contextlib
+import itertools as it
+import json
+import os
+import random
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+from typing import Callable, Iterable
+
+from bots import POLICIES, parse_policies
+from duplicate import Deal, play_deal
+from player import Player
+
+
+def play_match(factories: list[Callable[[str], Player]], names: list[str],
+               seed: int) -> list[dict]:
+    """Play a deal once for every rotation of seats (duplicate deal)."""
+    deal = Deal.random(random.Random(seed))
+    return play_deal(factories, names, deal, permutations=False)
+
+
+class EloRatings:
+    """Incremental Elo ratings for multiplayer games.
+
+    A game of n players is treated as n * (n - 1) / 2 pairwise games: every
+    player wins against a fool, other pairs (and all pairs if there is no
+    fool) are draws."""
+
+    def __init__(self, k: float = 16, initial: float = 1500) -> None:
+        self.K = k
+        self.INITIAL = initial
+        self.ratings: dict[str, float] = {}
+
+    def __getitem__(self, name: str) -> float:
+        return self.ratings.get(name, self.INITIAL)
+
+    def expected(self, a: str, b: str) -> float:
+        """Expected score of 'a' in a game against 'b'"""
+        return 1 / (1 + 10 ** ((self[b] - self[a]) / 400))
+
+    def update(self, seats: list[str], fool: str | None) -> None:
+        """Update ratings with a result of a single game"""
+        k = self.K / (len(seats) - 1)
+        deltas = dict.fromkeys(seats, 0.0)
+
+        for a, b in it.combinations(seats, 2):
+            score = 0.5 if fool not in (a, b) else float(b == fool)
+            delta = k * (score - self.expected(a, b))
+            deltas[a] += delta
+            deltas[b] -= delta
+
+        for name, delta in deltas.items():
+            self.ratings[name] = self[name] + delta
+
+
+class Tournament:
+    def __init__(self, policies: dict[str, Callable[[str], Player]] | None = None,
+                 deals: int = 10, seed: int = 0, workers: int | None = None,
+                 checkpoint: str | Path | None = None) -> None:
+        """
+        :param policies: policies (factories of players, which accept a name
+        of a player) by their names. Can be extended with register().
+        :param deals: number of duplicate deals played in each match.
+        :param seed: a seed to generate deals. Every match of a tournament is
+        played on the same deals.
+        :param workers: number of processes to play games in parallel (1 -
+        games are played in this process).
+        :param checkpoint: a file to save progress of a tournament to. If it
+        exists, a tournament resumes from it.
+        """
+        self.policies = dict(policies or {})
+        self.workers = workers
+        self.checkpoint = None if checkpoint is None else Path(checkpoint)
+
+        rng = random.Random(seed)
+        self.seeds = [rng.getrandbits(32) for _ in range(deals)]
+
+        self.elo = EloRatings()
+        self.games: dict[str, int] = {}
+        self.fools: dict[str, int] = {}
+        # keys of finished matches
+        self.done: set[str] = set()
+        # groups of policies of each swiss round
+        self.schedule: dict[str, list[list[str]]] = {}
+
+        if self.checkpoint is not None and self.checkpoint.exists():
+            self._load()
+
+    def register(self, name: str, factory: Callable[[str], Player]) -> None:
+        """Add a policy to the tournament"""
+        if name in self.policies:
+            raise ValueError(f'Policy {name} is already registered')
+        self.policies[name] = factory
+
+    @staticmethod
+    def _key(tag: str, names: Iterable[str], seed: int) -> str:
+        return f'{tag}:{"/".join(names)}#{seed}'
+
+    def _load(self) -> None:
+        with open(self.checkpoint) as file:
+            state = json.load(file)
+        self.elo.ratings = state['ratings']
+        self.games = state['games']
+        self.fools = state['fools']
+        self.done = set(state['done'])
+        self.schedule = state['schedule']
+
+    def save(self) -> None:
+        """Save progress of a tournament to the checkpoint file (atomically)"""
+        if self.checkpoint is None:
+            return
+        state = {
+            'ratings': self.elo.ratings,
+            'games': self.games,
+            'fools': self.fools,
+            'done': sorted(self.done),
+            'schedule': self.schedule,
+        }
+        tmp = self.checkpoint.with_suffix(self.checkpoint.suffix + '.tmp')
+        with open(tmp, 'w') as file:
+            json.dump(state, file)
+        os.replace(tmp, self.checkpoint)
+
+    def _record(self, result: dict) -> None:
+        """Take into account a result of a single game"""
+        self.elo.update(result['seats'], result['fool'])
+        for name in result['seats']:
+            self.games[name] = self.games.get(name, 0) + 1
+        if result['fool'] is not None:
+            self.fools[result['fool']] = self.fools.get(result['fool'], 0) + 1
+
+    def _play(self, groups: Iterable[tuple[str, ...]], tag: str,
+              checkpoint_every: int = 10) -> None:
+        """Play all deals for each group of policies, which were not played
+        yet, and update ratings with results of matches in order."""
+        jobs = [(group, seed) for group in groups for seed in self.seeds
+                if self._key(tag, group, seed) not in self.done]
+        args = ([[self.policies[name] for name in group] for group, _ in jobs],
+                [list(group) for group, _ in jobs], [seed for _, seed in jobs])
+
+        with contextlib.ExitStack() as stack:
+            if self.workers == 1:
+                matches = map(play_match, *args)
+            else:
+                executor = stack.enter_context(ProcessPoolExecutor(self.workers))
+                matches = executor.map(play_match, *args)
+
+            for finished, ((group, seed), results) in enumerate(zip(jobs, matches), 1):
+                for result in results:
+                    self._record(result)
+                self.done.add(self._key(tag, group, seed))
+
+                if finished % checkpoint_every == 0:
+                    self.save()
+
+        self.save()
+
+    def round_robin(self, players_nums: Iterable[int] = (2,)) -> None:
+        """Every group of policies plays a match for each number of players"""
+        groups = [group for players_num in players_nums
+                  for group in it.combinations(sorted(self.policies), players_num)]
+        self._play(groups, 'round-robin')
+
+    def swiss(self, rounds: int, players_num: int = 2) -> None:
+        """In each round policies with close ratings play against each other.
+
+        Policies are sorted by rating and split into groups of players_num,
+        a group of policies, which has already played, is avoided if possible.
+        Policies left out of groups (if any) skip a round."""
+        played = {tuple(group) for groups in self.schedule.values() for group in groups}
+
+        for round_ in range(1, rounds + 1):
+            tag = f'swiss{round_}'
+            # groups of a round are kept to resume it after an interruption
+            if tag not in self.schedule:
+                self.schedule[tag] = self._swiss_groups(players_num, played)
+            groups = [tuple(group) for group in self.schedule[tag]]
+            played.update(groups)
+            self._play(groups, tag)
+
+    def _swiss_groups(self, players_num: int, played: set[tuple[str, ...]]) -> list[list[str]]:
+        """Split policies sorted by rating into groups for a swiss round"""
+        standings = sorted(self.policies, key=lambda name: -self.elo[name])
+        groups = []
+
+        while len(standings) >= players_num:
+            # the best policy plays with the closest ones it hasn't played yet
+            leader, rest = standings[0], standings[1:]
+            candidates = list(it.combinations(rest, players_num - 1))
+            others = next((c for c in candidates
+                           if tuple(sorted((leader, *c))) not in played), candidates[0])
+
+            groups.append(sorted((leader, *others)))
+            standings = [name for name in rest if name not in others]
+
+        return groups
+
+    def standings(self) -> list[tuple[str, float, int, int]]:
+        """Policies sorted by rating: (name, rating, games, fools)"""
+        return sorted(((name, self.elo[name], self.games.get(name, 0),
+                        self.fools.get(name, 0)) for name in self.policies),
+                      key=lambda row: -row[1])
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description='Play a tournament between bots.')
+    parser.add_argument('policies', nargs='+', metavar='[ALIAS=]POLICY',
+                        help=f'policies to play, one of: {", ".join(sorted(POLICIES))}. '
+                             f'An alias allows a policy to play against itself')
+    parser.add_argument('--format', choices=('round-robin', 'swiss'),
+                        default='round-robin')
+    parser.add_argument('--players', nargs='+', type=int, default=[2],
+                        help='numbers of players in a game')
+    parser.add_argument('--rounds', type=int, default=5, help='rounds of a swiss tournament')
+    parser.add_argument('--deals', type=int, default=10, help='deals per match')
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--workers', type=int, default=None)
+    parser.add_argument('--checkpoint', default=None)
+    args = parser.parse_args()
+
+    try:
+        policies = parse_policies(args.policies)
+    except ValueError as error:
+        parser.error(str(error))
+
+    tournament = Tournament(policies, deals=args.deals, seed=args.seed, workers=args.workers,
+                            checkpoint=args.checkpoint)
+    if args.format == 'round-robin':
+        tournament.round_robin(args.players)
+    else:
+        tournament.swiss(args.rounds, args.players[0])
+
+    print(f'{"policy":<20}{"rating":>8}{"games":>8}{"fools":>8}')
+    for name, rating, games, fools in tournament.standings():
+        print(f'{name:<20}{rating:>8.1f}{games:>8}{fools:>8}')
+
+
+if __name__ == '__main__':
+    main()
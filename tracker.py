@@ -0,0 +1,136 @@
+"""Track public information about cards: which cards can be in hands of
+opponents of a player, and sample hidden hands consistent with it."""
+
+
+from __future__ import annotations
+import random
+from typing import Iterable
+
+from card import Card
+from events import Event, EventType
+from hand import codes_of, mask_of
+from mixins import CardGameMixin
+
+
+class CardTracker(CardGameMixin):
+    """Incremental belief state of a player about cards of other players.
+
+    All sets of cards are bitsets of card codes (see Card.CODES). A card is
+    either seen (in the player's hand, on a table, in trash), known to be in
+    an opponent's hand (an opponent took it from a table), or unseen (in a
+    deck or in an unknown part of an opponent's hand).
+
+    Passes are not taken into account: a player can pass voluntarily, thus
+    a pass does not mean that a player has no suitable cards."""
+
+    def __init__(self, me: str, players: Iterable[str]) -> None:
+        """
+        :param me: a name of a player who tracks cards.
+        :param players: names of all players (including the player).
+        """
+        self.me = me
+        self.players = list(players)
+        self.deck_size = len(self.SUITS) * len(self.RANKS)
+
+        self.hand = 0
+        self.table = 0
+        self.trash = 0
+        self.unseen = (1 << self.deck_size) - 1
+        # cards known to be in opponents' hands and sizes of all hands
+        self.known = dict.fromkeys(self.players, 0)
+        self.sizes = dict.fromkeys(self.players, 0)
+        # cache of codes of unseen cards for sampling
+        self._unseen_codes: list[int] | None = None
+
+    def _see(self, mask: int) -> None:
+        self.unseen &= ~mask
+        self._unseen_codes = None
+
+    def on_draw(self, player: str, num: int, cards: Iterable[Card] = ()) -> None:
+        """A player took num cards from a deck (cards are known only if the
+        player is the one who tracks cards)"""
+        self.deck_size -= num
+        self.sizes[player] += num
+        if player == self.me:
+            mask = mask_of(card.code for card in cards)
+            self.hand |= mask
+            self._see(mask)
+
+    def on_play(self, player: str, card: Card) -> None:
+        """A player put a card on a table (attack, defend or throw)"""
+        bit = 1 << card.code
+        self.sizes[player] -= 1
+        self.table |= bit
+        if player == self.me:
+            self.hand &= ~bit
+        else:
+            self.known[player] &= ~bit
+            self._see(bit)
+
+    def on_pickup(self, player: str, cards: Iterable[Card]) -> None:
+        """A player took all cards from a table"""
+        mask = mask_of(card.code for card in cards)
+        self.sizes[player] += mask.bit_count()
+        self.table &= ~mask
+        if player == self.me:
+            self.hand |= mask
+        else:
+            self.known[player] |= mask
+
+    def on_clear(self, cards: Iterable[Card]) -> None:
+        """Beaten cards were moved from a table to trash"""
+        mask = mask_of(card.code for card in cards)
+        self.table &= ~mask
+        self.trash |= mask
+
+    def update(self, events: list[Event]) -> None:
+        """Observe game events (see FoolCardGame.events)"""
+        for event in events:
+            type_ = event.type
+            if type_ is EventType.DEAL:
+                self.on_draw(event.player.name, len(event.cards), event.cards)
+            elif type_ in (EventType.ATTACK, EventType.DEFEND, EventType.TRANSFER,
+                           EventType.THROW):
+                for card in event.cards:
+                    self.on_play(event.player.name, card)
+            elif type_ is EventType.PICKUP:
+                self.on_pickup(event.player.name, event.cards)
+            elif type_ is EventType.CLEAR:
+                self.on_clear(event.cards)
+
+    def possible(self, player: str) -> int:
+        """Cards, which can be in an opponent's hand"""
+        if self.sizes[player] > self.known[player].bit_count():
+            return self.known[player] | self.unseen
+        return self.known[player]
+
+    def hidden(self, player: str) -> int:
+        """Number of cards in an opponent's hand, which are not known"""
+        return self.sizes[player] - self.known[player].bit_count()
+
+    def sample(self, rng: random.Random | None = None) -> tuple[dict[str, int], list[int]]:
+        """Draw a random deal of unseen cards consistent with known information.
+
+        Every unseen card goes either into an unknown part of an opponent's
+        hand or into a deck, thus a deal is a random permutation of unseen
+        cards split by the numbers of hidden cards (no rejection sampling).
+
+        :return: bitsets of cards of opponents and codes of cards in a deck
+        (its order is random as well).
+        """
+        rng = rng or random
+        if self._unseen_codes is None:
+            self._unseen_codes = codes_of(self.unseen)
+        codes = self._unseen_codes.copy()
+        rng.shuffle(codes)
+
+        hands = {}
+        start = 0
+        for player in self.players:
+            if player == self.me:
+                continue
+            end = start + self.hidden(player)
+            hands[player] = self.known[player] | mask_of(codes[start:end])
+            start = end
+
+        return hands, codes[start:]